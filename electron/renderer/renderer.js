@@ -1054,32 +1054,28 @@
     }
   };
 
-  const renderAnalysis = (state) => {
-    const container = elements.analysisContent;
-    if (!container) {
-      return;
-    }
-    const report = state && state.last_report;
-    if (report) {
-      const metrics = report.metrics || {};
-      const actionItems = Array.isArray(report.action_items) && report.action_items.length
-        ? report.action_items.map((item) => `<li>${escapeHtml(item)}</li>`).join('')
-        : '<li>등록된 조치 항목이 없습니다.</li>';
-      const followUp = Array.isArray(report.follow_up) && report.follow_up.length
-        ? report.follow_up.map((item) => `<li>${escapeHtml(item)}</li>`).join('')
-        : '<li>추가 후속 조치가 없습니다.</li>';
-      container.innerHTML = `
+  // Report being analysed right now, followed over Server-Sent Events.
+  let analysisStream = null;
+
+  const reportSectionsHtml = (report, pending = '') => {
+    const actionItems = Array.isArray(report.action_items) && report.action_items.length
+      ? report.action_items.map((item) => `<li>${escapeHtml(item)}</li>`).join('')
+      : `<li>${escapeHtml(pending || '등록된 조치 항목이 없습니다.')}</li>`;
+    const followUp = Array.isArray(report.follow_up) && report.follow_up.length
+      ? report.follow_up.map((item) => `<li>${escapeHtml(item)}</li>`).join('')
+      : `<li>${escapeHtml(pending || '추가 후속 조치가 없습니다.')}</li>`;
+    return `
         <section class="analysis-section">
           <h3>Summary</h3>
-          <p>${escapeHtml(report.summary || '요약 정보가 없습니다.')}</p>
+          <p>${escapeHtml(report.summary || pending || '요약 정보가 없습니다.')}</p>
         </section>
         <section class="analysis-section">
           <h3>Root Cause</h3>
-          <p>${escapeHtml(report.root_cause || '근본 원인 분석이 필요합니다.')}</p>
+          <p>${escapeHtml(report.root_cause || pending || '근본 원인 분석이 필요합니다.')}</p>
         </section>
         <section class="analysis-section">
           <h3>Impact</h3>
-          <p>${escapeHtml(report.impact || '영향 범위를 파악 중입니다.')}</p>
+          <p>${escapeHtml(report.impact || pending || '영향 범위를 파악 중입니다.')}</p>
         </section>
         <section class="analysis-section">
           <h3>Action Items</h3>
@@ -1088,7 +1084,92 @@
         <section class="analysis-section">
           <h3>Follow-up</h3>
           <ul>${followUp}</ul>
-        </section>
+        </section>`;
+  };
+
+  const renderStreamingAnalysis = (stream) => {
+    const container = elements.analysisContent;
+    if (!container || !stream.fields) {
+      return;
+    }
+    const fields = stream.fields;
+    container.innerHTML = `
+        <p class="analysis-streaming">${escapeHtml(stream.title || '인시던트')} · AI 분석 작성 중…</p>
+        ${reportSectionsHtml(
+          {
+            summary: fields.summary,
+            root_cause: fields.root_cause,
+            impact: fields.impact,
+            action_items: fields.action_plan,
+            follow_up: fields.follow_up,
+          },
+          '작성 중…'
+        )}
+      `;
+  };
+
+  const followAnalysisStream = (streams) => {
+    const active = Array.isArray(streams) && streams.length ? streams[streams.length - 1] : null;
+    if (!active || typeof EventSource === 'undefined') {
+      if (analysisStream) {
+        analysisStream.source.close();
+        analysisStream = null;
+      }
+      return;
+    }
+    if (analysisStream && analysisStream.id === active.report_id) {
+      return;
+    }
+    if (analysisStream) {
+      analysisStream.source.close();
+    }
+    const source = new EventSource(
+      `${backendUrl}/reports/${encodeURIComponent(active.report_id)}/analysis/stream`
+    );
+    const current = { id: active.report_id, title: active.title, source, fields: null };
+    analysisStream = current;
+    source.addEventListener('partial', (event) => {
+      try {
+        current.fields = JSON.parse(event.data);
+      } catch (_) {
+        return;
+      }
+      if (analysisStream === current) {
+        renderStreamingAnalysis(current);
+      }
+    });
+    source.addEventListener('complete', () => {
+      source.close();
+      if (analysisStream === current) {
+        analysisStream = null;
+      }
+      refreshState({ silent: true });
+    });
+    // Fall back to last_report; the next state poll reconnects if the
+    // analysis is still running, so retries follow the polling interval.
+    source.onerror = () => {
+      source.close();
+      if (analysisStream === current) {
+        analysisStream = null;
+      }
+    };
+  };
+
+  const renderAnalysis = (state) => {
+    const container = elements.analysisContent;
+    if (!container) {
+      return;
+    }
+    followAnalysisStream(state && state.analysis_streams);
+    if (analysisStream && analysisStream.fields) {
+      renderStreamingAnalysis(analysisStream);
+      return;
+    }
+    const report = state && state.last_report;
+    if (report) {
+      const metrics = report.metrics || {};
+      container.innerHTML = `
+        ${reportSectionsHtml(report)}
         <section class="analysis-section">
           <h3>Latest Metrics</h3>
           <p class="analysis-metrics">HTTP ${formatNumber(metrics.http)} / ${formatNumber(
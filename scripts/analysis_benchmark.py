@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""인시던트 분석(analysis.py) 성능 측정 스크립트.
+
+OpenAI에 접속하지 않는다. 도구 호출을 흉내 내는 스텁 채팅 모델과 임시 디렉터리의
+RAG 코퍼스를 사용하며, 실제 rag_data와 .env의 키는 건드리지 않는다.
+
+    python scripts/analysis_benchmark.py agent-cache --calls 200
+    python scripts/analysis_benchmark.py analysis-cache --incidents 100 --latency-ms 100
+    python scripts/analysis_benchmark.py deadline --latency-ms 1500 --deadline 0.5 --embedding-ms 2000
+    python scripts/analysis_benchmark.py stream --latency-ms 300 --token-ms 40
+    python scripts/analysis_benchmark.py e2e --incidents 20 --first-token lognormal:400,1500 --error-rate 0.05
+
+e2e만 실제 ChatOpenAI/OpenAIEmbeddings 클라이언트를 쓰며, 같은 프로세스에 띄운 OpenAI 호환 스텁 서버
+(src/backend/fake_openai_api.py)로 요청을 보낸다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Event, Thread
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import httpx
+import uvicorn
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# 벤치마크는 항상 오프라인으로 실행한다 (.env의 키보다 우선).
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["INCIDENT_RAG_EMBEDDINGS"] = "local"
+# 실수로 실제 클라이언트가 요청을 보내더라도 외부로 나가지 않게 한다.
+os.environ["OPENAI_BASE_URL"] = "http://127.0.0.1:9/v1"
+
+import src.backend.rag as rag_module  # noqa: E402
+from src.backend import analysis  # noqa: E402
+from src.backend.actions import ActionExecutionService  # noqa: E402
+from src.backend.analysis_cache import AnalysisCache  # noqa: E402
+from src.backend.analysis_stream import analysis_streams  # noqa: E402
+from src.backend.app import app  # noqa: E402
+from src.backend.fake_openai_api import Latency, StubSettings, build_fake_openai_app  # noqa: E402
+from src.backend.monitor import PrometheusMonitor  # noqa: E402
+from src.backend.services import AlertService, PrometheusService, SlackService  # noqa: E402
+from src.backend.state import STATE, STATE_LOCK, ActionExecution, MetricSample, make_sample  # noqa: E402
+from src.incident_console.config import set_openai_api_key  # noqa: E402
+from src.incident_console.models import AlertScenario  # noqa: E402
+from src.incident_console.scenarios import load_default_scenarios  # noqa: E402
+
+try:
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+except ImportError:  # pragma: no cover - optional dependency
+    BaseChatModel = None  # type: ignore[assignment,misc]
+
+_STUB_ANSWER = {
+    "summary": "스텁 모델이 생성한 요약입니다.",
+    "root_cause": "최근 배포 이후 오류율이 상승한 것으로 추정됩니다.",
+    "impact": "일부 요청이 실패했습니다.",
+    "action_plan": ["직전 배포를 롤백합니다 (사유: 배포 직후 오류 증가)."],
+    "follow_up": ["배포 파이프라인의 카나리 기준을 점검합니다."],
+}
+
+
+if BaseChatModel is not None:
+
+    class StubToolCallingModel(BaseChatModel):  # type: ignore[misc,valid-type]
+        """첫 턴에 RAG 도구를 호출하고, 도구 결과를 받으면 JSON 분석을 돌려주는 모델.
+
+        ``latency_ms``는 턴마다 첫 토큰까지의 지연, ``token_ms``는 스트리밍 시 4글자 조각마다의 지연이다.
+        """
+
+        latency_ms: float = 0.0
+        token_ms: float = 0.0
+        tool_outputs: List[str] = []
+
+        @property
+        def _llm_type(self) -> str:
+            return "stub-tool-calling"
+
+        def bind_tools(self, tools, **kwargs):  # noqa: D401 - LangChain API
+            return self
+
+        def _reply(self, messages) -> AIMessage:
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000.0)
+            last = messages[-1]
+            if isinstance(last, ToolMessage):
+                self.tool_outputs.append(str(last.content))
+                return AIMessage(content=json.dumps(_STUB_ANSWER, ensure_ascii=False))
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": analysis.RAG_TOOL_NAME,
+                        "args": {"__arg1": "최근 조치"},
+                        "id": f"call_{len(self.tool_outputs)}",
+                    }
+                ],
+            )
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            message = self._reply(messages)
+            if self.token_ms and message.content:
+                time.sleep(self.token_ms * len(message.content) / 4 / 1000.0)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+            message = self._reply(messages)
+            if message.tool_calls:
+                call = message.tool_calls[0]
+                yield ChatGenerationChunk(
+                    message=AIMessageChunk(
+                        content="",
+                        tool_call_chunks=[
+                            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": 0}
+                        ],
+                    )
+                )
+                return
+            for start in range(0, len(message.content), 4):
+                if self.token_ms:
+                    time.sleep(self.token_ms / 1000.0)
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=message.content[start : start + 4]))
+                if run_manager is not None:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+def _measure(fn: Callable[[int], None], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for step in range(iterations):
+        started = time.perf_counter()
+        fn(step)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    print(
+        f"  {label:<26} p50={_percentile(samples, 50):8.3f}ms "
+        f"p99={_percentile(samples, 99):8.3f}ms mean={statistics.fmean(samples):8.3f}ms"
+    )
+
+
+@contextmanager
+def _stub_environment(
+    latency_ms: float,
+    token_ms: float = 0.0,
+) -> Iterator[Tuple["StubToolCallingModel", List[AlertScenario]]]:
+    """임시 RAG 코퍼스와 스텁 모델로 analysis 모듈을 오프라인 상태로 만든다."""
+
+    scenarios = load_default_scenarios()
+    stub = StubToolCallingModel(latency_ms=latency_ms, token_ms=token_ms)
+    build_llm = analysis._build_llm
+    cache = analysis.analysis_cache
+
+    def stub_llm(api_key: str, model: str):
+        # 실제 ChatOpenAI 생성 비용(HTTP 클라이언트 준비)은 그대로 치르고, 호출만 스텁으로 보낸다.
+        build_llm(api_key, model)
+        return stub
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rag_module.rag_data_dir = Path(tmp)
+        rag_module.rag_service.bootstrap_scenarios(scenarios)
+        analysis._build_llm = stub_llm
+        # 호출마다 프롬프트와 원본 결과를 남기는 로그는 측정에서 제외한다.
+        analysis.logger.setLevel(logging.WARNING)
+        set_openai_api_key("sk-benchmark-stub")
+        try:
+            # 임포트와 첫 컴파일은 어느 측정에도 포함하지 않는다.
+            analysis.agent_cache.executor("sk-warm-up")
+            analysis.reset_agent_cache()
+            yield stub, scenarios
+        finally:
+            analysis._build_llm = build_llm
+            analysis.analysis_cache = cache
+            analysis.reset_agent_cache()
+            set_openai_api_key(None)
+
+
+def _has_langgraph() -> bool:
+    return BaseChatModel is not None and analysis.optional_import("langgraph.prebuilt", "create_react_agent") is not None
+
+
+def _serve(asgi_app) -> Tuple[uvicorn.Server, Thread, str]:
+    """임의의 빈 포트에 앱을 띄우고 (서버, 스레드, base URL)을 돌려준다."""
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(asgi_app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    thread = Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+# --------------------------------------------------------------------------- #
+# agent-cache: LLM 클라이언트/에이전트 그래프 재사용으로 줄어드는 호출당 오버헤드
+# --------------------------------------------------------------------------- #
+
+
+def bench_agent_cache(calls: int, latency_ms: float) -> None:
+    """캐시 없이 매번 만드는 경우와 캐시를 재사용하는 경우의 분석 호출 비용을 비교한다."""
+
+    if not _has_langgraph():
+        print("[agent-cache] LangChain/LangGraph가 설치되어 있지 않아 건너뜁니다.")
+        return
+
+    with _stub_environment(latency_ms) as (stub, scenarios):
+
+        def build_only(step: int) -> None:
+            analysis.reset_agent_cache()
+            analysis.agent_cache.executor("sk-benchmark-stub")
+
+        def cached_only(step: int) -> None:
+            analysis.agent_cache.executor("sk-benchmark-stub")
+
+        def analyse(step: int) -> None:
+            scenario = scenarios[step % len(scenarios)]
+            sample = make_sample(0.12, 0.05, 0.4, 0.8, node="edge-node-01")
+            result = analysis._call_openai(scenario, analysis._build_user_prompt(scenario, sample))
+            assert result and result["summary"] == _STUB_ANSWER["summary"], result
+
+        def analyse_uncached(step: int) -> None:
+            analysis.reset_agent_cache()
+            analyse(step)
+
+        print(f"[agent-cache] {calls} call(s), stub model latency {latency_ms:.1f}ms")
+        _report("build client+agent", _measure(build_only, calls))
+        _report("cached lookup", _measure(cached_only, calls))
+        uncached = _measure(analyse_uncached, calls)
+        analysis.reset_agent_cache()
+        stub.tool_outputs.clear()
+        before = analysis.agent_cache.stats()
+        cached = _measure(analyse, calls)
+        _report("analysis, rebuilt per call", uncached)
+        _report("analysis, cached agent", cached)
+        saved = statistics.median(uncached) - statistics.median(cached)
+        print(f"  saved per call: {saved:.2f}ms (p50)")
+
+        # 하나의 컴파일된 그래프가 호출마다 다른 시나리오를 도구에 넘겨야 한다.
+        stats = analysis.agent_cache.stats()
+        assert stats["agents"] == 1 and stats["misses"] - before["misses"] == 1, stats
+        for step, output in enumerate(stub.tool_outputs[: len(scenarios)]):
+            assert scenarios[step].title in output, (scenarios[step].code, output)
+        print(f"  cache stats: {json.dumps(stats)}")
+
+
+# --------------------------------------------------------------------------- #
+# analysis-cache: 임계치 근처에서 반복 감지되는 사고의 분석 재사용
+# --------------------------------------------------------------------------- #
+
+
+def _flapping_samples(incidents: int, seed: int = 7) -> List[Tuple[int, MetricSample]]:
+    """임계치를 조금씩 넘나드는 (시나리오 번호, 샘플) 순서열. 대부분 HTTP 급증이다."""
+
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(incidents):
+        http = 0.05 * (1 + rng.uniform(0.02, 0.45))
+        cpu = 0.8 * rng.uniform(0.55, 0.95)
+        if rng.random() < 0.2:
+            http, cpu = 0.05 * rng.uniform(0.5, 0.95), 0.8 * (1 + rng.uniform(0.02, 0.2))
+        samples.append((0 if http > 0.05 else 1, make_sample(http, 0.05, cpu, 0.8, node="edge-node-03")))
+    return samples
+
+
+def bench_analysis_cache(incidents: int, latency_ms: float, mutate_every: int) -> None:
+    """같은 감지 순서열을 캐시 없이/캐시로 분석해 모델 호출 수와 지연을 비교한다."""
+
+    if not _has_langgraph():
+        print("[analysis-cache] LangChain/LangGraph가 설치되어 있지 않아 건너뜁니다.")
+        return
+
+    samples = _flapping_samples(incidents)
+    with _stub_environment(latency_ms) as (stub, scenarios):
+        print(
+            f"[analysis-cache] {incidents} incident(s), stub model latency {latency_ms:.0f}ms/turn, "
+            f"approved action every {mutate_every or 'never'}"
+        )
+        for label, cache in (
+            ("no cache", AnalysisCache(ttl_seconds=0)),
+            ("analysis cache", AnalysisCache(ttl_seconds=900, max_entries=128, bucket_width=0.25)),
+        ):
+            analysis.analysis_cache = cache
+            stub.tool_outputs.clear()
+
+            def analyse(step: int) -> None:
+                if mutate_every and step and step % mutate_every == 0:
+                    # 승인된 조치가 코퍼스에 들어오면 세대가 바뀌어 다시 분석해야 한다.
+                    rag_module.rag_service.record_action_execution(
+                        ActionExecution(
+                            id=f"bench-{label}-{step}",
+                            report_id=f"report-{step}",
+                            scenario_code=scenarios[0].code,
+                            scenario_title=scenarios[0].title,
+                            created_at=samples[step][1].timestamp,
+                            actions=[f"Roll back build #{step}"],
+                            status="executed",
+                        )
+                    )
+                index, sample = samples[step]
+                result = analysis.generate_incident_analysis(scenarios[index], sample)
+                # 재사용한 분석이라도 보고서의 메트릭은 이번 샘플이어야 한다.
+                assert f"HTTP {sample.http:.4f}/" in result["report_text"], result["report_text"]
+                assert result["summary"] == _STUB_ANSWER["summary"], result
+
+            timings = _measure(analyse, incidents)
+            stats = cache.stats()
+            print(
+                f"  {label:<15} total={sum(timings) / 1000:6.2f}s model analyses={len(stub.tool_outputs):4d} "
+                f"hit_rate={stats['hit_rate']:.2f} p50={_percentile(timings, 50):8.2f}ms "
+                f"p99={_percentile(timings, 99):8.2f}ms"
+            )
+        assert stats["hits"] > 0, stats
+        print(f"  cache stats: {json.dumps(stats)}")
+
+
+# --------------------------------------------------------------------------- #
+# deadline: 모델이 느려도 첫 알림까지의 시간이 마감 시간으로 묶이는지 확인
+# --------------------------------------------------------------------------- #
+
+
+class _RecordingSlack:
+    """Slack 연동 대신 메시지와 도착 시각을 기록한다."""
+
+    def __init__(self) -> None:
+        self.messages: List[Tuple[float, str]] = []
+        self.delivered = Event()
+
+    def post_message(self, token: str, channel: str, message: str) -> Dict[str, object]:
+        self.messages.append((time.perf_counter(), message))
+        if len(self.messages) >= 2:
+            self.delivered.set()
+        return {"ok": True}
+
+
+def _slow_embeddings(embedding_ms: float):
+    """RAG 임베딩을 embedding_ms만큼 느린 OpenAI 호환 스텁 서버로 돌리고 벡터 인덱스를 다시 만든다."""
+
+    settings = StubSettings(embedding_latency=Latency.parse(f"fixed:{embedding_ms:g}"))
+    server, thread, stub_url = _serve(build_fake_openai_app(settings))
+    os.environ["OPENAI_BASE_URL"] = f"{stub_url}/v1"
+    os.environ["INCIDENT_RAG_EMBEDDINGS"] = "openai"
+    rag_module.rag_service.reset_embeddings()
+    # 인덱스가 없으면 질의를 임베딩하지 않으므로(어휘 검색만) 먼저 재구성을 끝낸다.
+    rag_module.rag_service.search("index warm-up", limit=1)
+    while not rag_module.rag_service.stats()["vectors"] or rag_module.rag_service.stats()["index_building"]:
+        time.sleep(0.05)
+    return server, thread
+
+
+def bench_deadline(latency_ms: float, deadline: float, embedding_ms: float) -> None:
+    """모니터의 사고 처리를 마감 시간 없이/있이 실행해 첫 알림과 보강 알림 시각을 잰다.
+
+    마지막 경우는 RAG 질의 임베딩도 느리게 만들어, 컨텍스트 구성까지 마감 시간 안에 묶이는지 확인한다.
+    """
+
+    if not _has_langgraph():
+        print("[deadline] LangChain/LangGraph가 설치되어 있지 않아 건너뜁니다.")
+        return
+
+    cases = [
+        ("no deadline", None, 0.0),
+        (f"deadline {deadline:.1f}s", deadline, 0.0),
+        (f"+ embeddings {embedding_ms / 1000:.1f}s", deadline, embedding_ms),
+    ]
+    stub_server = None
+    with _stub_environment(latency_ms) as (stub, scenarios):
+        with STATE_LOCK:
+            STATE.preferences.slack = True
+            STATE.slack.token = "xoxb-benchmark"
+        print(f"[deadline] stub model latency {latency_ms:.0f}ms/turn (2 turns per analysis)")
+        try:
+            for label, limit, slow_ms in cases:
+                if slow_ms:
+                    stub_server = _slow_embeddings(slow_ms)
+                # 분석 캐시가 두 번째 실행을 가로채지 않도록 매번 비운다.
+                analysis.analysis_cache = AnalysisCache(ttl_seconds=0)
+                slack = _RecordingSlack()
+                action_service = ActionExecutionService()
+                monitor = PrometheusMonitor(PrometheusService(), AlertService(), SlackService(slack), action_service)
+                sample = make_sample(0.09, 0.05, 0.4, 0.8, node="edge-node-01")
+                os.environ["INCIDENT_ANALYSIS_DEADLINE_SECONDS"] = str(limit or 0)
+
+                started = time.perf_counter()
+                code = monitor._handle_incident(sample, preferred_code=scenarios[0].code)
+                handled = time.perf_counter() - started
+                assert code == scenarios[0].code, code
+                first = slack.messages[0][0] - started
+                with STATE_LOCK:
+                    report = STATE.last_report
+                    execution = STATE.action_executions[-1]
+                if limit is None:
+                    assert len(slack.messages) == 1 and report.summary == _STUB_ANSWER["summary"], report
+                    print(f"  {label:<20} first notification {first:6.2f}s (AI report), monitor blocked {handled:6.2f}s")
+                    continue
+
+                assert report.summary != _STUB_ANSWER["summary"], "expected the fallback report first"
+                # 컨텍스트 임베딩이 느려도 첫 알림은 마감 시간에 묶여야 한다.
+                assert first < limit + 0.5, f"first notification after {first:.2f}s exceeds the deadline"
+                assert slack.delivered.wait(timeout=60), "enriched analysis never arrived"
+                enriched = slack.messages[1][0] - started
+                # 저장된 보고서와 승인 대기 중인 조치가 제자리에서 갱신되어야 한다.
+                assert report.summary == _STUB_ANSWER["summary"], report
+                assert slack.messages[1][1].startswith("[Enriched analysis]"), slack.messages[1][1]
+                assert execution.report_id == report.id and execution.actions[0] == report.action_items[0], execution
+                print(
+                    f"  {label:<20} first notification {first:6.2f}s (fallback), monitor blocked {handled:6.2f}s, "
+                    f"enriched analysis {enriched:6.2f}s"
+                )
+        finally:
+            os.environ.pop("INCIDENT_ANALYSIS_DEADLINE_SECONDS", None)
+            if stub_server is not None:
+                server, thread = stub_server
+                server.should_exit = True
+                thread.join(timeout=5)
+                os.environ["OPENAI_BASE_URL"] = "http://127.0.0.1:9/v1"
+                os.environ["INCIDENT_RAG_EMBEDDINGS"] = "local"
+                rag_module.rag_service.reset_embeddings()
+
+
+# --------------------------------------------------------------------------- #
+# stream: SSE로 받는 부분 분석의 첫 도착 시각과 전체 생성 시간 비교
+# --------------------------------------------------------------------------- #
+
+
+def bench_stream(latency_ms: float, token_ms: float) -> None:
+    """/reports/{id}/analysis/stream 구독자가 첫 부분 결과와 최종 결과를 받는 시각을 잰다."""
+
+    if not _has_langgraph():
+        print("[stream] LangChain/LangGraph가 설치되어 있지 않아 건너뜁니다.")
+        return
+
+    with _stub_environment(latency_ms, token_ms) as (stub, scenarios):
+        analysis.analysis_cache = AnalysisCache(ttl_seconds=0)
+        scenario = scenarios[0]
+        sample = make_sample(0.09, 0.05, 0.4, 0.8, node="edge-node-01")
+
+        started = time.perf_counter()
+        analysis.generate_incident_analysis(scenario, sample)
+        blocking = time.perf_counter() - started
+
+        report_id = "benchmark-stream"
+        stream = analysis_streams.open(report_id, title=scenario.title, scenario_code=scenario.code)
+        worker = Thread(
+            target=analysis.start_incident_analysis,
+            args=(scenario, sample),
+            kwargs={"deadline": None, "stream": stream},
+        )
+        events: List[Tuple[float, str, Dict[str, object]]] = []
+        # TestClient은 응답 전체를 모은 뒤 돌려주므로 실제 서버로 띄워 도착 시각을 잰다.
+        server, server_thread, base_url = _serve(app)
+        try:
+            started = time.perf_counter()
+            with httpx.stream("GET", f"{base_url}/reports/{report_id}/analysis/stream", timeout=60) as response:
+                assert response.status_code == 200, response.status_code
+                worker.start()
+                event = ""
+                for line in response.iter_lines():
+                    if line.startswith("event: "):
+                        event = line[len("event: ") :]
+                    elif line.startswith("data: "):
+                        events.append((time.perf_counter() - started, event, json.loads(line[len("data: ") :])))
+            worker.join()
+            # 스트림이 없는 보고서는 404 (저장된 보고서라면 한 번에 complete만 내려준다).
+            assert httpx.get(f"{base_url}/reports/unknown/analysis/stream").status_code == 404
+        finally:
+            server.should_exit = True
+            server_thread.join(timeout=5)
+
+        partials = [(at, data) for at, event, data in events if event == "partial"]
+        assert events and events[-1][1] == "complete" and events[-1][2]["source"] == "model", events[-1:]
+        final = events[-1][2]
+        assert partials, "no partial events were streamed"
+        for _, data in partials:
+            # 부분 결과는 최종 값의 앞부분이어야 한다.
+            summary = data.get("summary")
+            assert summary is None or _STUB_ANSWER["summary"].startswith(summary), summary
+        first = next(at for at, data in partials if data.get("summary"))
+        print(f"[stream] stub model {latency_ms:.0f}ms/turn, {token_ms:.0f}ms per 4-char token")
+        print(f"  blocking analysis           {blocking:6.2f}s")
+        print(f"  first partial summary (SSE) {first:6.2f}s")
+        print(f"  complete event (SSE)        {events[-1][0]:6.2f}s ({len(partials)} partial events)")
+        print(f"  final fields: {', '.join(key for key in final if key != 'report_text')}")
+
+
+# --------------------------------------------------------------------------- #
+# e2e: 실제 OpenAI 클라이언트 + 로컬 스텁 서버로 잰 사고 처리 지연
+# --------------------------------------------------------------------------- #
+
+
+def bench_e2e(incidents: int, settings: StubSettings, deadline: float) -> None:
+    """모니터의 사고 처리를 스텁 서버 상대로 반복해 첫 알림·AI 분석 도착 시각의 분포를 잰다."""
+
+    if analysis.optional_import("langchain_openai", "ChatOpenAI") is None or not _has_langgraph():
+        print("[e2e] langchain-openai/LangGraph가 설치되어 있지 않아 건너뜁니다.")
+        return
+
+    server, server_thread, stub_url = _serve(build_fake_openai_app(settings))
+    scenarios = load_default_scenarios()
+    cache = analysis.analysis_cache
+    overrides = {
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "INCIDENT_RAG_EMBEDDINGS": "openai",
+        "INCIDENT_ANALYSIS_DEADLINE_SECONDS": str(deadline or 0),
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    first_at: List[float] = []
+    model_at: List[float] = []
+    outcomes = {"model": 0, "enriched": 0, "fallback": 0}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # 키가 없으면 RAG가 OpenAI 임베딩을 포기하므로 코퍼스보다 먼저 설정한다.
+            set_openai_api_key("sk-benchmark-stub")
+            rag_module.rag_data_dir = Path(tmp)
+            rag_module.rag_service.bootstrap_scenarios(scenarios)
+            analysis.logger.setLevel(logging.WARNING)
+            analysis.analysis_cache = AnalysisCache(ttl_seconds=0)
+            analysis.reset_agent_cache()
+            with STATE_LOCK:
+                STATE.preferences.slack = True
+                STATE.slack.token = "xoxb-benchmark"
+            # 클라이언트 생성과 그래프 컴파일은 측정에서 뺀다.
+            analysis.agent_cache.executor("sk-benchmark-stub")
+            httpx.delete(f"{stub_url}/stub/stats")
+            print(f"[e2e] {incidents} incident(s) against {stub_url}/v1, deadline {deadline or 'none'}")
+            print(f"  stub settings: {json.dumps(settings.describe())}")
+
+            rng = random.Random(11)
+            for step in range(incidents):
+                scenario = scenarios[step % len(scenarios)]
+                sample = make_sample(0.05 * (1 + rng.uniform(0.1, 1.0)), 0.05, 0.4, 0.8, node="edge-node-02")
+                slack = _RecordingSlack()
+                monitor = PrometheusMonitor(PrometheusService(), AlertService(), SlackService(slack), ActionExecutionService())
+                started = time.perf_counter()
+                monitor._handle_incident(sample, preferred_code=scenario.code)
+                with STATE_LOCK:
+                    report_id = STATE.last_report.id
+                stream = analysis_streams.get(report_id)
+                # 늦은 AI 분석(또는 그 실패)이 끝날 때까지 기다린다.
+                while stream is not None and not stream.done and time.perf_counter() - started < 120:
+                    time.sleep(0.01)
+                first_at.append(slack.messages[0][0] - started)
+                if slack.delivered.wait(timeout=1.0):
+                    outcomes["enriched"] += 1
+                    model_at.append(slack.messages[1][0] - started)
+                elif "사고가 감지되었습니다" in slack.messages[0][1]:
+                    # 스텁의 분석 요약 문구 (결정적 폴백은 "시나리오가 감지되었습니다").
+                    outcomes["model"] += 1
+                    model_at.append(first_at[-1])
+                else:
+                    outcomes["fallback"] += 1
+            stats = httpx.get(f"{stub_url}/stub/stats").json()
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        analysis.analysis_cache = cache
+        analysis.reset_agent_cache()
+        set_openai_api_key(None)
+        server.should_exit = True
+        server_thread.join(timeout=5)
+
+    for label, samples in (("first notification", first_at), ("AI analysis delivered", model_at)):
+        if samples:
+            print(
+                f"  {label:<22} p50={_percentile(samples, 50):6.2f}s p90={_percentile(samples, 90):6.2f}s "
+                f"p99={_percentile(samples, 99):6.2f}s max={max(samples):6.2f}s"
+            )
+    print(
+        f"  outcomes: AI in time={outcomes['model']} AI after fallback={outcomes['enriched']} "
+        f"fallback only={outcomes['fallback']}"
+    )
+    print(f"  stub stats: {json.dumps(stats, sort_keys=True)}")
+    assert stats.get("chat.tool_calls", 0) > 0 and stats.get("embeddings.requests", 0) > 0, stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    agent = subparsers.add_parser("agent-cache", help="Per-call overhead: rebuilt vs cached LLM client and agent")
+    agent.add_argument("--calls", type=int, default=200)
+    agent.add_argument("--latency-ms", type=float, default=0.0, help="Simulated model latency per turn")
+
+    result_cache = subparsers.add_parser("analysis-cache", help="Analysis reuse while metrics flap around a threshold")
+    result_cache.add_argument("--incidents", type=int, default=100)
+    result_cache.add_argument("--latency-ms", type=float, default=100.0, help="Simulated model latency per turn")
+    result_cache.add_argument("--mutate-every", type=int, default=25, help="Record an approved action every N incidents")
+
+    deadline = subparsers.add_parser("deadline", help="Time to first notification with a slow model")
+    deadline.add_argument("--latency-ms", type=float, default=1500.0, help="Simulated model latency per turn")
+    deadline.add_argument("--deadline", type=float, default=0.5, help="Analysis deadline in seconds")
+    deadline.add_argument("--embedding-ms", type=float, default=2000.0, help="Stub RAG embedding latency for the last case")
+
+    sse = subparsers.add_parser("stream", help="Time to first partial analysis over SSE vs full generation")
+    sse.add_argument("--latency-ms", type=float, default=300.0, help="Simulated time to first token per turn")
+    sse.add_argument("--token-ms", type=float, default=40.0, help="Simulated delay per streamed 4-char token")
+
+    e2e = subparsers.add_parser("e2e", help="Incident latency with real OpenAI clients against the local stub server")
+    e2e.add_argument("--incidents", type=int, default=10)
+    e2e.add_argument("--first-token", default="lognormal:400,1500", help="Stub delay before the first token")
+    e2e.add_argument("--tokens-per-second", type=float, default=60.0)
+    e2e.add_argument("--embedding-latency", default="fixed:30")
+    e2e.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected 429/500/503")
+    e2e.add_argument("--stream-abort-rate", type=float, default=0.0, help="Probability of a stream cut off midway")
+    e2e.add_argument("--deadline", type=float, default=8.0, help="Analysis deadline in seconds (0 waits)")
+    e2e.add_argument("--seed", type=int, default=7)
+
+    args = parser.parse_args()
+    if args.command == "agent-cache":
+        bench_agent_cache(args.calls, args.latency_ms)
+    elif args.command == "analysis-cache":
+        bench_analysis_cache(args.incidents, args.latency_ms, args.mutate_every)
+    elif args.command == "deadline":
+        bench_deadline(args.latency_ms, args.deadline, args.embedding_ms)
+    elif args.command == "stream":
+        bench_stream(args.latency_ms, args.token_ms)
+    elif args.command == "e2e":
+        settings = StubSettings(
+            first_token=Latency.parse(args.first_token),
+            tokens_per_second=args.tokens_per_second,
+            embedding_latency=Latency.parse(args.embedding_latency),
+            error_rate=args.error_rate,
+            stream_abort_rate=args.stream_abort_rate,
+            seed=args.seed,
+        )
+        bench_e2e(args.incidents, settings, args.deadline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""오프라인 부하 테스트용 OpenAI 호환 스텁 서버.
+
+chat completions(도구 호출·스트리밍 포함), embeddings, models API를 흉내 낸다.
+분석 응답은 SYSTEM_PROMPT의 JSON 스키마를 따르며 프롬프트의 사고 제목·가설·플레이북으로 채운다.
+
+    python scripts/openai_stub_server.py --port 8790 --first-token lognormal:400,1500 --tokens-per-second 60
+    python scripts/openai_stub_server.py --error-rate 0.05 --error-statuses 429,503 --seed 7
+
+백엔드는 다음처럼 스텁을 가리키게 한 뒤 실행한다 (키는 비어 있지만 않으면 된다).
+
+    OPENAI_BASE_URL=http://127.0.0.1:8790/v1 OPENAI_API_KEY=sk-stub python -m src.backend.main
+
+실행 중에는 GET/PUT /stub/settings로 설정을 바꾸고, GET /stub/stats로 요청·오류 수를 본다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import uvicorn
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.fake_openai_api import Latency, StubSettings, build_fake_openai_app  # noqa: E402
+
+
+def _statuses(value: str) -> tuple:
+    return tuple(int(status) for status in value.split(",") if status.strip())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument(
+        "--first-token",
+        type=Latency.parse,
+        default=Latency.parse("lognormal:400,1500"),
+        help="Delay before the first token: fixed:MS, uniform:LO-HI, normal:MEAN,SD or lognormal:P50,P99",
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="Answer pacing (0 sends it at once)")
+    parser.add_argument("--embedding-latency", type=Latency.parse, default=Latency.parse("fixed:30"))
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected HTTP error")
+    parser.add_argument("--error-statuses", type=_statuses, default=(429, 500, 503))
+    parser.add_argument("--stream-abort-rate", type=float, default=0.0, help="Probability of cutting a stream off midway")
+    parser.add_argument("--no-tool-calls", action="store_true", help="Answer directly even when tools are offered")
+    parser.add_argument("--dimensions", type=int, default=1536, help="Embedding width when the request sets none")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible latencies and errors")
+    args = parser.parse_args()
+
+    settings = StubSettings()
+    try:
+        settings.update(
+            {
+                "first_token": str(args.first_token),
+                "tokens_per_second": args.tokens_per_second,
+                "embedding_latency": str(args.embedding_latency),
+                "error_rate": args.error_rate,
+                "error_statuses": args.error_statuses,
+                "stream_abort_rate": args.stream_abort_rate,
+                "tool_calls": not args.no_tool_calls,
+                "dimensions": args.dimensions,
+                "seed": args.seed,
+            }
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    print(f"[INFO] OpenAI 스텁: OPENAI_BASE_URL=http://{args.host}:{args.port}/v1")
+    print(f"[INFO] 설정: {settings.describe()}")
+    uvicorn.run(build_fake_openai_app(settings), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
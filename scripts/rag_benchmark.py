@@ -0,0 +1,1593 @@
+#!/usr/bin/env python3
+"""RAGService 성능 측정 스크립트.
+
+OpenAI 키 없이 오프라인으로 동작하며, 임시 디렉터리에 합성 코퍼스를 만들어 측정한다.
+
+    python scripts/rag_benchmark.py writes --sizes 10000 100000
+    python scripts/rag_benchmark.py journal-recovery
+    python scripts/rag_benchmark.py embedding-cache
+    python scripts/rag_benchmark.py indexes --size 100000
+    python scripts/rag_benchmark.py lexical --size 100000
+    python scripts/rag_benchmark.py local-embeddings --size 5000
+    python scripts/rag_benchmark.py bulk-upload --size 10000 --documents 5000
+    python scripts/rag_benchmark.py passages --sections 200
+    python scripts/rag_benchmark.py alert-storm --alerts 500
+    python scripts/rag_benchmark.py index-swap --size 20000
+    python scripts/rag_benchmark.py concurrency --size 20000 --readers 8
+    python scripts/rag_benchmark.py filtered-recall --size 100000
+    python scripts/rag_benchmark.py query-cache --size 20000
+    python scripts/rag_benchmark.py vector-engines --sizes 1000 10000 100000
+    python scripts/rag_benchmark.py suite --sizes 1000 10000 100000 1000000 --json suite.json
+    python scripts/rag_benchmark.py startup --budget 1.5 --size 20000
+    python scripts/rag_benchmark.py normalize --size 50000
+    python scripts/rag_benchmark.py upload-stream --documents 100000
+    python scripts/rag_benchmark.py retention --size 100000
+    python scripts/rag_benchmark.py bundle --size 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import codecs
+import gc
+import hashlib
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# 벤치마크는 항상 오프라인으로 실행한다 (.env의 키보다 우선).
+os.environ["OPENAI_API_KEY"] = ""
+
+from src.backend.json_stream import JSONDocumentStream  # noqa: E402
+from src.backend.lazy import LazyService  # noqa: E402
+from src.backend.rag import RAGService  # noqa: E402
+from src.backend.rag_bundle import read_bundle  # noqa: E402
+from src.backend.rag_embeddings import HashingEmbeddings  # noqa: E402
+from src.backend.rag_retention import RetentionPolicy  # noqa: E402
+from src.incident_console.scenarios import load_default_scenarios  # noqa: E402
+from src.backend.rag_store import DocumentJournal  # noqa: E402
+from src.backend.rag_vectors import ENGINES, load_vector_index  # noqa: E402
+from src.backend.state import ActionExecution, IncidentReport, MetricSample  # noqa: E402
+from src.backend.text_utils import _TEXT_FIXUPS, normalize_legacy_payload  # noqa: E402
+from src.incident_console.models import AlertScenario  # noqa: E402
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:  # pragma: no cover - optional dependency
+    Embeddings = object  # type: ignore[assignment,misc]
+
+_SCENARIOS = ("http_5xx_surge", "cpu_spike_core", "db_latency", "disk_pressure")
+
+
+def synthetic_entry(index: int) -> Dict[str, object]:
+    """documents.json 항목과 같은 모양의 합성 문서를 만든다."""
+
+    scenario_code = _SCENARIOS[index % len(_SCENARIOS)]
+    doc_type = ("incident_report", "action_execution")[index % 2]
+    status = "report" if doc_type == "incident_report" else "executed"
+    created_at = f"2025-{(index // 28 // 24) % 12 + 1:02d}-{index // 24 % 28 + 1:02d}T{index % 24:02d}:00:00+00:00"
+    actions = [
+        f"Roll back checkout-service build #{index}",
+        "트래픽을 재조정하기 위해 로드 밸런서 가중치를 업데이트합니다.",
+    ]
+    metadata: Dict[str, object] = {
+        "type": doc_type,
+        "scenario_code": scenario_code,
+        "status": status,
+        "title": f"Synthetic incident {index}",
+        "summary": f"합성 인시던트 {index}: {scenario_code}",
+        "actions": actions,
+        "created_at": created_at,
+        "doc_key": f"synthetic:{index}",
+    }
+    return {
+        "doc_key": f"synthetic:{index}",
+        "content": "\n".join(
+            [
+                f"Incident report snapshot: Synthetic incident {index}",
+                f"시나리오 코드: {scenario_code}",
+                "요약:",
+                f"HTTP 오류율이 임계값을 초과했습니다 (sample {index}).",
+                "조치 항목:",
+                *(f"- {action}" for action in actions),
+            ]
+        ),
+        "created_at": created_at,
+        "title": metadata["title"],
+        "summary": metadata["summary"],
+        "scenario_code": scenario_code,
+        "status": status,
+        "type": doc_type,
+        "metadata": metadata,
+    }
+
+
+class FakeEmbeddings(Embeddings):  # type: ignore[misc,valid-type]
+    """텍스트 해시로 벡터를 만드는 결정론적 임베딩 (호출 횟수 집계)."""
+
+    def __init__(self, dim: int = 64) -> None:
+        self.dim = dim
+        self.embedded_texts = 0
+        self.calls = 0
+        self.queries = 0
+
+    def _vector(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [(digest[i % len(digest)] - 127.5) / 127.5 for i in range(self.dim)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded_texts += len(texts)
+        self.calls += 1
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.queries += 1
+        return self._vector(text)
+
+
+def seed_corpus(index_dir: Path, size: int) -> None:
+    """합성 문서 ``size``개를 스냅샷으로 기록한다."""
+
+    entries = [synthetic_entry(i) for i in range(size)]
+    journal = DocumentJournal(index_dir / "documents.json")
+    journal.compact(entries, 0)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+def _measure(fn: Callable[[int], None], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for step in range(iterations):
+        started = time.perf_counter()
+        fn(step)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    print(
+        f"  {label:<22} p50={_percentile(samples, 50):8.3f}ms "
+        f"p99={_percentile(samples, 99):8.3f}ms mean={statistics.fmean(samples):8.3f}ms"
+    )
+
+
+def bench_writes(sizes: List[int], iterations: int) -> None:
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            index_dir = Path(tmp)
+            seed_corpus(index_dir, size)
+            service = RAGService(index_dir)
+            print(f"[writes] corpus={size} docs, {iterations} write(s)")
+
+            def journal_write(step: int) -> None:
+                service._add_document(
+                    doc_key=f"bench:{step}",
+                    content=f"Benchmark document {step}",
+                    metadata={"type": "uploaded", "scenario_code": "http_5xx_surge", "status": "reference"},
+                )
+
+            _report("journal append", _measure(journal_write, iterations))
+
+            # 이전 방식: 쓰기마다 전체 코퍼스를 indent=2로 다시 직렬화한다.
+            legacy_path = index_dir / "legacy_documents.json"
+            documents = list(service.list_documents())
+
+            def full_rewrite(step: int) -> None:
+                legacy_path.write_text(
+                    json.dumps(documents, ensure_ascii=False, indent=2),
+                    encoding="utf-8",
+                )
+
+            _report("full rewrite (legacy)", _measure(full_rewrite, max(1, min(iterations, 20))))
+            service.compact_documents()
+
+
+def check_journal_recovery() -> None:
+    """잘린 저널 마지막 줄과 찢어진 스냅샷에서 복구되는지 확인한다."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = Path(tmp) / "documents.json"
+        journal = DocumentJournal(snapshot, compact_threshold=10_000)
+        journal.load()
+        for index in range(5):
+            journal.put(synthetic_entry(index))
+        journal.compact([synthetic_entry(i) for i in range(5)], journal.seq)
+        for index in range(5, 8):
+            journal.put(synthetic_entry(index))
+        journal.close()
+
+        # 1) 마지막 저널 줄이 중간에 잘린 경우: 해당 레코드만 버린다.
+        with journal.journal_path.open("ab") as handle:
+            handle.write(b'{"seq": 99, "op": "put", "doc": {"doc_key": "torn')
+        recovered = DocumentJournal(snapshot).load()
+        assert sorted(recovered) == sorted(f"synthetic:{i}" for i in range(8)), sorted(recovered)
+        assert journal.journal_path.read_bytes().endswith(b"\n")
+
+        # 2) 스냅샷이 찢어진 경우: .prev 스냅샷과 저널 꼬리로 복구한다.
+        journal = DocumentJournal(snapshot)
+        journal.load()
+        journal.compact([synthetic_entry(i) for i in range(8)], journal.seq)
+        journal.put(synthetic_entry(8))
+        journal.close()
+        data = snapshot.read_bytes()
+        snapshot.write_bytes(data[: len(data) // 2])
+        recovered = DocumentJournal(snapshot).load()
+        assert sorted(recovered) == sorted(f"synthetic:{i}" for i in range(9)), sorted(recovered)
+    print("[journal-recovery] torn journal tail and torn snapshot recovered OK")
+
+
+def check_embedding_cache(size: int) -> None:
+    """메타데이터만 바뀐 뒤 인덱스를 재구성해도 임베딩 호출이 없는지 확인한다."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        fake = FakeEmbeddings()
+        service = RAGService(index_dir, embeddings=fake)
+        service._add_document(
+            doc_key="action_execution:bench:executed",
+            content="승인된 조치 실행 기록 (bench)",
+            metadata={"type": "action_execution", "scenario_code": "http_5xx_surge", "status": "executed"},
+        )
+        assert service.wait_for_index()
+        print(f"[embedding-cache] initial build embedded {fake.embedded_texts} text(s)")
+
+        before = fake.embedded_texts
+        service.mark_action_recovery("bench", "recovered", metrics={"http": 0.01})
+        mark_calls = fake.embedded_texts - before
+        print(f"[embedding-cache] recovery mark embedded {mark_calls} text(s)")
+        assert mark_calls == 0, mark_calls
+        [indexed] = service.search(
+            "승인된 조치 실행 기록 (bench)",
+            limit=1,
+            metadata_filter={"doc_key": "action_execution:bench:executed"},
+        )
+        assert indexed.metadata.get("recovery_status") == "recovered", indexed.metadata
+
+        # 인덱스를 지우고 새 프로세스처럼 재구성해도 캐시 덕분에 재임베딩이 없어야 한다.
+        (index_dir / "index.current").unlink(missing_ok=True)
+        for generation_dir in index_dir.glob("index-*"):
+            shutil.rmtree(generation_dir)
+        fresh = FakeEmbeddings()
+        reloaded = RAGService(index_dir, embeddings=fresh)
+        assert reloaded.wait_for_index()
+        print(f"[embedding-cache] cold rebuild from persisted cache embedded {fresh.embedded_texts} text(s)")
+        assert fresh.embedded_texts == 0, fresh.embedded_texts
+        print(f"[embedding-cache] stats: {reloaded.stats()['embedding_cache']}")
+
+
+def _legacy_recent_actions(service: RAGService, scenario_code: str, status: str, limit: int) -> List[str]:
+    """보조 인덱스 도입 전 구현: 전체 복사 후 created_at 정렬."""
+
+    entries = list(service._documents_by_key.values())
+    entries.sort(key=lambda entry: entry.get("created_at") or "", reverse=True)
+    found: List[str] = []
+    for entry in entries:
+        metadata = entry.get("metadata")
+        if not isinstance(metadata, dict):
+            continue
+        if metadata.get("scenario_code") != scenario_code or metadata.get("status") != status:
+            continue
+        for action in metadata.get("actions") or []:
+            found.append(action)
+            if len(found) >= limit:
+                return found
+    return found
+
+
+def _legacy_metadata_search(service: RAGService, filter_dict: Dict[str, object], limit: int) -> List[Dict[str, object]]:
+    matches = [
+        entry
+        for entry in service._documents_by_key.values()
+        if isinstance(entry.get("metadata"), dict)
+        and all(entry["metadata"].get(key) == value for key, value in filter_dict.items())
+    ]
+    matches.sort(key=lambda entry: entry["metadata"].get("created_at") or "", reverse=True)
+    return matches[:limit]
+
+
+def bench_indexes(size: int, iterations: int) -> None:
+    scenario = load_default_scenarios()[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        service = RAGService(index_dir)
+        print(f"[indexes] corpus={size} docs, {iterations} lookup(s) per path")
+
+        _report("recent_actions legacy", _measure(
+            lambda _: _legacy_recent_actions(service, scenario.code, "executed", 5), iterations))
+        _report("recent_actions index", _measure(
+            lambda _: service.recent_actions(scenario.code, status="executed", limit=5), iterations))
+
+        criteria = {"scenario_code": scenario.code, "status": "executed"}
+        _report("search legacy", _measure(lambda _: _legacy_metadata_search(service, criteria, 4), iterations))
+        _report("search index", _measure(
+            lambda _: service.search("checkout 5xx", limit=4, metadata_filter=criteria), iterations))
+
+        _report("build_context index", _measure(
+            lambda _: service.build_context_for_scenario(scenario), iterations))
+
+
+def bench_lexical(size: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        started = time.perf_counter()
+        service = RAGService(index_dir)
+        print(f"[lexical] corpus={size} docs, load+index {time.perf_counter() - started:.2f}s")
+
+        selective = f"checkout-service build #{size // 2}"
+        _report("bm25 selective", _measure(lambda _: service.search(selective, limit=4), iterations))
+        _report("bm25 selective+filter", _measure(
+            lambda _: service.search(selective, limit=4, metadata_filter={"status": "executed"}), iterations))
+        _report("bm25 common terms", _measure(
+            lambda _: service.search("로드 밸런서 가중치 업데이트", limit=4), max(1, iterations // 10)))
+
+
+def bench_local_embeddings(size: int) -> None:
+    texts = [str(synthetic_entry(i)["content"]) for i in range(size)]
+    embedder = HashingEmbeddings()
+    started = time.perf_counter()
+    vectors = embedder.embed_documents(texts)
+    elapsed = time.perf_counter() - started
+    print(
+        f"[local-embeddings] {size} docs x {embedder.dim} dims in {elapsed:.2f}s "
+        f"({size / elapsed:,.0f} docs/s, {embedder.model_name})"
+    )
+    assert vectors == embedder.embed_documents(texts[:1]) + vectors[1:], "embeddings must be deterministic"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        service = RAGService(index_dir, embeddings=embedder)
+        service.wait_for_index()
+        _report("vector search", _measure(
+            lambda step: service.search(f"checkout-service build #{step}", limit=4), 50))
+
+
+def bench_bulk_upload(size: int, documents: int, batch_size: int) -> None:
+    """업로드 N건을 건별 추가와 add_documents_bulk로 각각 넣어 비교한다."""
+
+    uploads = [
+        {
+            "title": f"Postmortem {index}",
+            "content": f"Postmortem {index}: checkout-service 5xx 급증 후 롤백으로 복구했습니다.",
+            "metadata": {"source_filename": "postmortems.json"},
+        }
+        for index in range(documents)
+    ]
+    legacy_count = max(1, min(documents, 200))
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        fake = FakeEmbeddings()
+        service = RAGService(index_dir, embeddings=fake)
+        service.wait_for_index()
+        print(f"[bulk-upload] corpus={size} docs")
+
+        fake.calls = 0
+        started = time.perf_counter()
+        for item in uploads[:legacy_count]:
+            service.add_uploaded_document(**item)
+        per_doc = (time.perf_counter() - started) / legacy_count
+        print(
+            f"  one-by-one             {legacy_count} docs in {per_doc * legacy_count:.2f}s "
+            f"(~{per_doc * documents:.1f}s for {documents}), {fake.calls} embedding call(s)"
+        )
+
+        fake.calls = 0
+        started = time.perf_counter()
+        result = service.add_documents_bulk(uploads, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"  bulk                   {documents} docs in {elapsed:.2f}s, {fake.calls} embedding call(s)")
+        print(f"  phases (ms)            {result['timings_ms']}")
+        assert len(result["documents"]) == documents
+        assert service.stats()["vectors"] == size + legacy_count + documents
+
+        try:
+            service.add_documents_bulk([uploads[0], {"title": "empty", "content": "  "}])
+        except ValueError as exc:
+            print(f"  invalid batch rejected: {exc}")
+        else:  # pragma: no cover - benchmark sanity check
+            raise AssertionError("an invalid entry must reject the whole batch")
+        assert service.stats()["documents"] == size + legacy_count + documents
+
+
+def check_passages(sections: int) -> None:
+    """긴 .txt 런북에서 필요한 구간만 검색 결과에 실리는지 확인한다."""
+
+    needle = sections * 2 // 3
+    runbook = "\n\n".join(
+        f"## 단계 {index}\n"
+        + f"서비스 component-{index} 점검 절차입니다. " * 12
+        + ("\nkafka consumer lag 복구: 파티션 재할당 후 오프셋을 리셋합니다." if index == needle else "")
+        for index in range(sections)
+    )
+    query = "kafka consumer lag 파티션 재할당"
+    for label, passage_chars in (("whole document", len(runbook) + 1), ("passages", 1000)):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = RAGService(Path(tmp), embeddings=HashingEmbeddings(), passage_chars=passage_chars)
+            service.bootstrap_scenarios(load_default_scenarios())
+            result = service.add_documents_bulk([{"title": "runbook", "content": runbook}])
+            service.wait_for_index()
+            documents = service.search(query, limit=3)
+            context_chars = sum(len(document.page_content) for document in documents)
+            found = any("kafka" in document.page_content for document in documents)
+            print(
+                f"[passages] {label:<15} {result['passages']:>3} passage(s), "
+                f"context {context_chars:>6} chars, needle found={found}"
+            )
+            assert found
+            assert len({document.id for document in documents}) == len(documents)
+
+
+def check_alert_storm(alerts: int) -> None:
+    """플래핑 알림이 반복돼도 인덱스가 커지지 않고 복구 표시가 병합 문서에 반영되는지 확인한다."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = FakeEmbeddings()
+        service = RAGService(Path(tmp), embeddings=fake)
+        service.bootstrap_scenarios(load_default_scenarios())
+        service.wait_for_index()
+        baseline = service.stats()["vectors"]
+        started = time.perf_counter()
+        for index in range(alerts):
+            created_at = f"2025-03-01T{index // 60 % 24:02d}:{index % 60:02d}:00+00:00"
+            service.record_incident_report(
+                IncidentReport(
+                    id=f"report-{index}",
+                    scenario_code="http_5xx_surge",
+                    title="HTTP 5xx surge on checkout",
+                    created_at=created_at,
+                    report_body="",
+                    metrics=MetricSample(created_at, 0.07 + index % 5 / 100, 0.05, 0.4, 0.8),
+                    summary=f"HTTP 오류율 {7 + index % 5}% 로 임계값 5% 초과",
+                    root_cause="checkout-service 신규 배포 이후 5xx 증가",
+                    impact="결제 요청 일부 실패",
+                    action_items=["Roll back checkout-service", "Scale gateway pool"],
+                    follow_up=["배포 파이프라인 카나리 단계 점검"],
+                )
+            )
+            service.record_action_execution(
+                ActionExecution(
+                    id=f"exec-{index}",
+                    report_id=f"report-{index}",
+                    scenario_code="http_5xx_surge",
+                    scenario_title="HTTP 5xx surge on checkout",
+                    created_at=created_at,
+                    actions=["Roll back checkout-service", "Scale gateway pool"],
+                    status="executed",
+                    executed_at=created_at,
+                )
+            )
+        elapsed = time.perf_counter() - started
+        stats = service.stats()
+        print(
+            f"[alert-storm] {alerts} alert(s) in {elapsed:.2f}s: "
+            f"{stats['vectors'] - baseline} new vector(s), {stats['duplicates_merged']} merged"
+        )
+        assert stats["vectors"] - baseline == 2, stats
+        assert service.mark_action_recovery(f"exec-{alerts - 2}", "failed")
+        assert service.mark_action_recovery(f"exec-{alerts - 1}", "recovered")
+        merged = [doc for doc in service.list_documents() if doc["type"] == "action_execution"]
+        assert merged[0]["metadata"]["occurrences"] == alerts, merged[0]["metadata"]
+        assert merged[0]["metadata"]["recovery_status"] == "recovered"
+        service.compact_documents()
+
+        # 병합된 실행마다 복구 결과가 따로 남아 서로 덮어쓰지 않아야 한다.
+        reopened = RAGService(Path(tmp), embeddings=fake)
+        merged = [doc for doc in reopened.list_documents() if doc["type"] == "action_execution"]
+        outcomes = {
+            item["execution_id"]: item["recovery_status"] for item in merged[0]["metadata"]["recovery_history"]
+        }
+        assert outcomes == {f"exec-{alerts - 2}": "failed", f"exec-{alerts - 1}": "recovered"}, outcomes
+
+
+class SlowEmbeddings(FakeEmbeddings):
+    """원격 임베딩 API처럼 문서당 지연이 있는 임베딩."""
+
+    def __init__(self, seconds_per_text: float = 0.0002, query_seconds: float = 0.0) -> None:
+        super().__init__()
+        self.seconds_per_text = seconds_per_text
+        self.query_seconds = query_seconds
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.seconds_per_text * len(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.query_seconds)
+        return super().embed_query(text)
+
+
+def check_index_swap(size: int) -> None:
+    """백그라운드 재구성 중에도 검색이 막히지 않고 세대가 원자적으로 교체되는지 확인한다."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        service = RAGService(index_dir, embeddings=SlowEmbeddings())
+        print(f"[index-swap] corpus={size} docs")
+
+        def search_while_building(label: str) -> None:
+            samples: List[float] = []
+            step = 0
+            while service.stats()["index_building"] or not samples:
+                started = time.perf_counter()
+                service.search(f"checkout-service build #{step}", limit=4)
+                samples.append((time.perf_counter() - started) * 1000.0)
+                step += 1
+            _report(label, samples)
+
+        # 첫 구성 중에는 BM25로, 재구성 중에는 이전 세대로 응답한다.
+        search_while_building("search, first build")
+        assert service.wait_for_index()
+        first = service.stats()["index_generation"]
+        with service._lock.write():
+            service._mark_index_stale()
+        search_while_building("search, rebuild")
+        assert service.wait_for_index()
+        stats = service.stats()
+        print(f"  generation {first} -> {stats['index_generation']}, {stats['vectors']} vector(s)")
+        assert stats["index_generation"] == first + 1 and stats["vectors"] == size
+        live = (index_dir / "index.current").read_text(encoding="utf-8").strip()
+        assert live == f"index-{stats['index_generation']:06d}", live
+
+
+def bench_concurrency(size: int, readers: int, seconds: float) -> None:
+    """리더 N개 + 라이터 1개로 검색 지연을 잰다 (전역 Lock 직렬화 vs 읽기/쓰기 락)."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        # 쿼리 임베딩은 원격 API처럼 2ms, 문서 임베딩은 문서당 2ms가 걸린다고 가정한다.
+        service = RAGService(index_dir, embeddings=SlowEmbeddings(seconds_per_text=0.002, query_seconds=0.002))
+        assert service.wait_for_index()
+        print(f"[concurrency] corpus={size} docs, {readers} reader(s) + 1 writer, {seconds:.0f}s per mode")
+
+        def run(label: str, guard, save_each_write: bool) -> None:
+            stop = Event()
+            samples: List[List[float]] = [[] for _ in range(readers)]
+            writes = [0]
+
+            def reader(slot: int) -> None:
+                step = 0
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    with guard():
+                        service.search(f"checkout-service build #{step}", limit=4)
+                    samples[slot].append((time.perf_counter() - started) * 1000.0)
+                    step += readers
+
+            def writer() -> None:
+                while not stop.is_set():
+                    with guard():
+                        service._add_document(
+                            doc_key=f"{label}:{writes[0]}",
+                            content=f"동시성 벤치마크 문서 {label} {writes[0]}",
+                            metadata={"type": "uploaded", "scenario_code": "", "status": "reference"},
+                        )
+                        if save_each_write:
+                            service._persist_index(immediate=True)
+                    writes[0] += 1
+
+            threads = [Thread(target=reader, args=(slot,)) for slot in range(readers)] + [Thread(target=writer)]
+            for thread in threads:
+                thread.start()
+            time.sleep(seconds)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            merged = [sample for slot in samples for sample in slot]
+            _report(f"{label} ({len(merged)} q, {writes[0]} w)", merged)
+
+        # 이전 동작: 검색(쿼리 임베딩 포함)과 쓰기가 하나의 Lock으로 직렬화되고,
+        # 쓰기마다 FAISS 인덱스 전체를 저장한다.
+        serial = Lock()
+        run("global lock", lambda: serial, save_each_write=True)
+        run("rw lock", nullcontext, save_each_write=False)
+
+
+def check_filtered_recall(size: int, queries: int, limit: int, engine: str) -> None:
+    """메타데이터 필터 검색이 정확한 top-k를 돌려주는지 전수 계산과 비교한다."""
+
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        fake = FakeEmbeddings()
+        service = RAGService(index_dir, embeddings=fake, vector_engine=engine)
+        assert service.wait_for_index()
+        vectors = service._vectors
+        print(f"[filtered-recall] corpus={size} docs, engine={engine}, {queries} queries per filter, k={limit}")
+
+        filters = [
+            {"scenario_code": _SCENARIOS[1], "status": "executed"},
+            {"scenario_code": _SCENARIOS[2], "type": "incident_report"},
+            {"title": f"Synthetic incident {size // 3}"},
+        ]
+        for criteria in filters:
+            candidates = [
+                key for key, entry in service._documents_by_key.items() if service._matches(entry, criteria)
+            ]
+            matrix = np.asarray(
+                fake.embed_documents([service._documents_by_key[key]["content"] for key in candidates]),
+                dtype=np.float32,
+            )
+            expected_hits = min(limit, len(candidates))
+            legacy_hits = recall = 0.0
+            latencies: List[float] = []
+            for step in range(queries):
+                vector = fake.embed_query(f"query {step}")
+                distances = ((matrix - np.asarray(vector, dtype=np.float32)) ** 2).sum(axis=1)
+                truth = {candidates[i] for i in np.argsort(distances)[:limit]}
+
+                # 이전 방식: 고정 크기(fetch_k=20) kNN 뒤에 필터를 적용한다.
+                legacy = [
+                    key
+                    for key, _ in vectors.search(vector, 20)
+                    if service._matches(service._documents_by_key[key], criteria)
+                ][:limit]
+                legacy_hits += len(legacy)
+                started = time.perf_counter()
+                with service._lock.read():
+                    found = service._vector_search(vectors, vector, limit, criteria)
+                latencies.append((time.perf_counter() - started) * 1000.0)
+                assert len(found) == expected_hits, (criteria, len(found))
+                recall += len(set(found) & truth) / max(1, len(truth))
+            print(
+                f"  {json.dumps(criteria, ensure_ascii=False)}: {len(candidates)} candidate(s), "
+                f"post-filter hits {legacy_hits / queries:.1f}/{expected_hits}, "
+                f"pre-filter recall@{limit} {recall / queries:.3f}"
+            )
+            _report("pre-filtered search", latencies)
+            assert expected_hits and (recall / queries == 1.0 or not vectors.exact)
+
+
+def check_query_cache(size: int, rounds: int) -> None:
+    """인시던트 중 반복되는 시나리오 조회가 캐시에서 처리되고 변경 후에는 무효화되는지 확인한다."""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        # 원격 임베딩 API의 질의 왕복 지연을 흉내 낸다.
+        slow = SlowEmbeddings(query_seconds=0.05)
+        service = RAGService(index_dir, embeddings=slow)
+        assert service.wait_for_index()
+        scenario = next(item for item in load_default_scenarios() if item.code in _SCENARIOS)
+        print(f"[query-cache] corpus={size} docs, {rounds} analysis round(s) for {scenario.code}")
+
+        def analysis_round(step: int) -> None:
+            # generate_incident_analysis + 에이전트 도구가 같은 조회를 되풀이하는 패턴.
+            service.recent_actions(scenario.code)
+            service.build_context_for_scenario(scenario)
+            query = f"  {scenario.title} rollback " if step % 2 else f"{scenario.title.upper()} ROLLBACK"
+            service.search(query, limit=4, metadata_filter={"scenario_code": scenario.code})
+
+        cold = _measure(analysis_round, 1)
+        queries = slow.queries
+        warm = _measure(lambda step: analysis_round(step + 1), rounds)
+        _report("cold round", cold)
+        _report("cached rounds", warm)
+        print(f"  query embeddings: {queries} cold, {slow.queries - queries} cached")
+        assert slow.queries == queries
+
+        before = service.build_context_for_scenario(scenario)
+        service.record_action_execution(
+            ActionExecution(
+                id="exec-cache-check",
+                report_id="report-cache-check",
+                scenario_code=scenario.code,
+                scenario_title=scenario.title,
+                created_at="2026-01-01T00:00:00+00:00",
+                actions=["Drain the canary pool"],
+                status="executed",
+                executed_at="2026-01-01T00:00:00+00:00",
+            )
+        )
+        after = service.build_context_for_scenario(scenario)
+        assert after != before and "2026-01-01T00:00:00+00:00" in after, after
+        stats = service.stats()["query_cache"]
+        print(f"  invalidated by write: yes, stats={stats}")
+        service.compact_documents()
+
+
+def bench_vector_engines(sizes: List[int], dim: int, queries: int, limit: int) -> None:
+    """벡터 엔진별 재현율/지연/메모리를 코퍼스 크기별로 비교한다 (정답은 전수 L2)."""
+
+    import numpy as np
+
+    from src.backend.rag_vectors import create_vector_index, engine_available
+
+    rng = np.random.default_rng(0)
+    print(f"[vector-engines] dim={dim}, {queries} queries, recall@{limit} vs exact L2")
+    for size in sizes:
+        # 임베딩처럼 군집을 이루는 단위 벡터.
+        centers = rng.normal(size=(max(1, size // 100), dim)).astype(np.float32)
+        matrix = centers[rng.integers(0, len(centers), size)] + 0.3 * rng.normal(size=(size, dim)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        keys = [f"doc:{index}" for index in range(size)]
+        probes = matrix[rng.integers(0, size, queries)] + 0.02 * rng.normal(size=(queries, dim)).astype(np.float32)
+        subset = keys[::10]
+        rows = np.arange(0, size, 10)
+
+        truth_all = [set(np.argsort(((matrix - probe) ** 2).sum(axis=1))[:limit].tolist()) for probe in probes]
+        truth_subset = [
+            set(rows[np.argsort(((matrix[rows] - probe) ** 2).sum(axis=1))[:limit]].tolist()) for probe in probes
+        ]
+        for engine in ENGINES:
+            if not engine_available(engine):
+                print(f"  n={size:<8} {engine:<12} unavailable")
+                continue
+            index = create_vector_index(engine, dim)
+            # 서비스의 백그라운드 빌드처럼 한 번에 넣는다 (IVF-PQ는 전체로 학습).
+            started = time.perf_counter()
+            index.add(keys, matrix)
+            build = time.perf_counter() - started
+
+            def recall_of(found, truth) -> float:
+                return len({int(key.split(":")[1]) for key, _ in found} & truth) / limit
+
+            latencies: List[float] = []
+            recall = filtered = 0.0
+            for probe, expected, expected_subset in zip(probes, truth_all, truth_subset):
+                started = time.perf_counter()
+                found = index.search(probe, limit)
+                latencies.append((time.perf_counter() - started) * 1000.0)
+                recall += recall_of(found, expected)
+                filtered += recall_of(index.search(probe, limit, subset), expected_subset)
+            print(
+                f"  n={size:<8} {engine:<12} build {build:7.2f}s  "
+                f"p50 {_percentile(latencies, 50):7.3f}ms p99 {_percentile(latencies, 99):7.3f}ms  "
+                f"recall {recall / queries:.3f} (10% filter {filtered / queries:.3f})  "
+                f"memory {index.memory_bytes() / 1e6:8.1f}MB{'' if index.exact else ' (approx)'}"
+            )
+            if index.exact:
+                assert recall / queries == 1.0 and filtered / queries == 1.0, engine
+
+
+# --------------------------------------------------------------------------- #
+# suite: documents.json 모양의 합성 코퍼스로 규모별 성능을 측정한다.
+# --------------------------------------------------------------------------- #
+
+_SUITE_KINDS = (
+    ("http_5xx_surge", "HTTP 5xx 급증", "HTTP 5xx surge", "Prometheus http_requests_total"),
+    ("cpu_spike", "CPU 사용률 급증", "CPU spike", "node_cpu_seconds_total"),
+    ("db_latency", "DB 응답 지연", "Database latency", "pg_stat_statements"),
+    ("disk_pressure", "디스크 용량 압박", "Disk pressure", "node_filesystem_avail_bytes"),
+    ("memory_leak", "메모리 누수", "Memory leak", "container_memory_working_set_bytes"),
+    ("queue_backlog", "큐 적체", "Queue backlog", "kafka_consumergroup_lag"),
+)
+_SUITE_SERVICES = ("checkout", "payment", "search", "auth", "inventory", "gateway", "notification", "catalog")
+_SUITE_ACTIONS = (
+    "Roll back {service}-service to the previous release",
+    "{service} 파드를 2배로 스케일 아웃합니다.",
+    "Drain the unhealthy {service} node from the load balancer",
+    "{service} 커넥션 풀 크기를 늘리고 재시작합니다.",
+    "Flush the {service} cache and warm it from the primary",
+    "{service} 배포 파이프라인의 카나리 단계를 다시 실행합니다.",
+    "Raise the {service} rate limit temporarily",
+    "{service} 로그 볼륨을 정리하고 보존 기간을 줄입니다.",
+)
+_SUITE_CAUSES = (
+    "신규 배포 이후 {service} 오류율이 증가했습니다.",
+    "A slow query on {service} saturated the connection pool.",
+    "{service} 노드의 디스크 사용률이 95%를 넘었습니다.",
+    "GC pauses on {service} exceeded 2s after a traffic spike.",
+)
+
+
+def _suite_scenarios() -> List[AlertScenario]:
+    scenarios: List[AlertScenario] = []
+    for code, title_ko, title_en, source in _SUITE_KINDS:
+        for service in _SUITE_SERVICES:
+            scenarios.append(
+                AlertScenario(
+                    code=f"{code}_{service}",
+                    title=f"{title_en} on {service} ({title_ko})",
+                    source=source,
+                    description=f"{service} 서비스에서 {title_ko} 알림이 발생했습니다. {title_en} detected.",
+                    hypotheses=[cause.format(service=service) for cause in _SUITE_CAUSES[:2]],
+                    evidences=[f"{source} > threshold", f"{service} error budget burn"],
+                    actions=[action.format(service=service) for action in _SUITE_ACTIONS[:3]],
+                )
+            )
+    return scenarios
+
+
+def suite_entry(index: int, scenarios: List[AlertScenario]) -> Dict[str, object]:
+    """``index``번째 합성 문서. 같은 ``index``는 항상 같은 문서가 된다."""
+
+    if index < len(scenarios):
+        scenario = scenarios[index]
+        doc_key = f"scenario:{scenario.code}"
+        content = "\n".join(
+            [
+                f"시나리오: {scenario.title} ({scenario.code})",
+                f"원인 지표: {scenario.source}",
+                f"설명: {scenario.description}",
+                "우선 가설:",
+                *(f"- {item}" for item in scenario.hypotheses),
+                "추천 조치:",
+                *(f"- {item}" for item in scenario.actions),
+            ]
+        )
+        metadata: Dict[str, object] = {
+            "type": "scenario",
+            "status": "reference",
+            "title": scenario.title,
+            "summary": scenario.description,
+            "actions": scenario.actions,
+            "created_at": "2025-01-01T00:00:00+00:00",
+        }
+    else:
+        rng = random.Random(index)
+        scenario = scenarios[rng.randrange(len(scenarios))]
+        service = scenario.code.rsplit("_", 1)[1]
+        actions = [action.format(service=service) for action in rng.sample(_SUITE_ACTIONS, 3)]
+        cause = rng.choice(_SUITE_CAUSES).format(service=service)
+        created_at = (
+            f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+            f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00+00:00"
+        )
+        roll = rng.random()
+        if roll < 0.45:
+            doc_key = f"incident_report:suite-{index}"
+            rate = rng.uniform(5, 40)
+            content = "\n".join(
+                [
+                    f"Incident report snapshot: {scenario.title} #{index}",
+                    f"시나리오 코드: {scenario.code}",
+                    f"작성 시각(UTC): {created_at}",
+                    "",
+                    "요약:",
+                    f"{service} 오류율 {rate:.1f}% 로 임계값 5% 초과 (incident {index}).",
+                    "",
+                    "근본 원인:",
+                    cause,
+                    "",
+                    "조치 항목:",
+                    *(f"- {action}" for action in actions),
+                ]
+            )
+            metadata = {
+                "type": "incident_report",
+                "status": "report",
+                "recovery_status": "not_applicable",
+                "title": f"{scenario.title} #{index}",
+                "summary": f"{service} 오류율 {rate:.1f}%",
+                "actions": actions,
+                "created_at": created_at,
+            }
+        else:
+            executed = roll < 0.85
+            status = "executed" if executed else "deferred"
+            doc_key = f"action_execution:suite-{index}:{status}"
+            content = "\n".join(
+                [
+                    f"{'승인된 조치 실행 기록' if executed else '보류된 조치 계획'} ({scenario.title})",
+                    f"시나리오 코드: {scenario.code}",
+                    f"결과 상태: {status}",
+                    f"실행 시각(UTC): {created_at}",
+                    f"Recovery status: {rng.choice(('recovered', 'pending', 'not_executed'))}",
+                    "조치 목록:",
+                    *(f"- {action} -> status=success, 비고=run {index}" for action in actions),
+                ]
+            )
+            metadata = {
+                "type": "action_execution",
+                "status": status,
+                "recovery_status": "pending",
+                "title": f"{scenario.title} {'승인된' if executed else '보류된'} 조치",
+                "summary": f"{'승인된' if executed else '보류된'} 조치: {', '.join(actions)}",
+                "actions": actions,
+                "created_at": created_at,
+            }
+    metadata.update(scenario_code=scenario.code, doc_key=doc_key)
+    return {
+        "doc_key": doc_key,
+        "content": content,
+        "created_at": metadata["created_at"],
+        "title": metadata["title"],
+        "summary": metadata["summary"],
+        "scenario_code": scenario.code,
+        "status": metadata["status"],
+        "type": metadata["type"],
+        "metadata": metadata,
+    }
+
+
+def _write_suite_snapshot(path: Path, size: int, scenarios: List[AlertScenario]) -> None:
+    """스냅샷을 한 건씩 스트리밍으로 기록한다 (100만 건도 메모리에 모으지 않는다)."""
+
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write('{"version": 1, "seq": 0, "documents": [\n')
+        for index in range(size):
+            if index:
+                handle.write(",\n")
+            handle.write(json.dumps(suite_entry(index, scenarios), ensure_ascii=False))
+        handle.write("\n]}\n")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:  # pragma: no cover - non-Linux
+        pass
+    return 0.0
+
+
+def _dir_mb(path: Path) -> float:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file()) / 1e6
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(_percentile(samples, 50), 3),
+        "p95_ms": round(_percentile(samples, 95), 3),
+        "p99_ms": round(_percentile(samples, 99), 3),
+    }
+
+
+def bench_suite(sizes: List[int], queries: int, ingest: int, output: str) -> None:
+    """규모별 로드/적재/검색/컨텍스트 지연, 저장 크기, RSS를 측정한다."""
+
+    scenarios = _suite_scenarios()
+    queries_pool = [
+        f"{kind[2]} {service} {action.format(service=service)}"
+        for kind in _SUITE_KINDS
+        for service in _SUITE_SERVICES
+        for action in _SUITE_ACTIONS
+    ]
+    results: List[Dict[str, object]] = []
+    for size in sizes:
+        size = max(size, len(scenarios))
+        gc.collect()
+        with tempfile.TemporaryDirectory() as tmp:
+            index_dir = Path(tmp)
+            started = time.perf_counter()
+            _write_suite_snapshot(index_dir / "documents.json", size, scenarios)
+            generate_s = time.perf_counter() - started
+
+            rss_before = _rss_mb()
+            fake = FakeEmbeddings()
+            started = time.perf_counter()
+            # 질의 캐시를 끄고 매 조회의 실제 비용을 잰다.
+            service = RAGService(index_dir, embeddings=fake, query_cache_size=0)
+            load_s = time.perf_counter() - started
+            started = time.perf_counter()
+            assert service.wait_for_index()
+            index_s = time.perf_counter() - started
+            rss_loaded = _rss_mb()
+
+            started = time.perf_counter()
+            for step in range(ingest):
+                scenario = scenarios[step % len(scenarios)]
+                service.record_action_execution(
+                    ActionExecution(
+                        id=f"suite-ingest-{step}",
+                        report_id=f"suite-report-{step}",
+                        scenario_code=scenario.code,
+                        scenario_title=scenario.title,
+                        created_at="2026-01-01T00:00:00+00:00",
+                        actions=[f"{scenario.actions[step % 3]} (ingest {step})"],
+                        status="executed",
+                        executed_at="2026-01-01T00:00:00+00:00",
+                    )
+                )
+            single_s = time.perf_counter() - started
+            uploads = [
+                {"title": f"suite upload {step}", "content": f"{queries_pool[step % len(queries_pool)]} 런북 {step}"}
+                for step in range(ingest * 10)
+            ]
+            started = time.perf_counter()
+            service.add_documents_bulk(uploads)
+            bulk_s = time.perf_counter() - started
+
+            rng = random.Random(size)
+            search_samples = _measure(
+                lambda step: service.search(
+                    f"{rng.choice(queries_pool)} {step}",
+                    limit=4,
+                    metadata_filter={"scenario_code": rng.choice(scenarios).code} if step % 2 else None,
+                ),
+                queries,
+            )
+            context_samples = _measure(
+                lambda step: service.build_context_for_scenario(scenarios[step % len(scenarios)]),
+                queries,
+            )
+
+            service._flush_index()
+            service.compact_documents()
+            result = {
+                "documents": size,
+                "generate_s": round(generate_s, 3),
+                "load_s": round(load_s, 3),
+                "index_build_s": round(index_s, 3),
+                "ingest_single_docs_per_s": round(ingest / single_s, 1) if single_s else 0.0,
+                "ingest_bulk_docs_per_s": round(len(uploads) / bulk_s, 1) if bulk_s else 0.0,
+                "search": _latency_summary(search_samples),
+                "build_context": _latency_summary(context_samples),
+                "persisted_mb": round(_dir_mb(index_dir), 2),
+                "rss_mb": round(_rss_mb(), 1),
+                "rss_loaded_delta_mb": round(rss_loaded - rss_before, 1),
+            }
+            results.append(result)
+            print(
+                f"[suite] n={size:<8} load {load_s:7.2f}s  index {index_s:7.2f}s  "
+                f"ingest {result['ingest_single_docs_per_s']:>8} doc/s single, "
+                f"{result['ingest_bulk_docs_per_s']:>9} doc/s bulk"
+            )
+            print(
+                f"        search p50/p95/p99 {result['search']['p50_ms']}/{result['search']['p95_ms']}/"
+                f"{result['search']['p99_ms']}ms  context {result['build_context']['p50_ms']}/"
+                f"{result['build_context']['p95_ms']}/{result['build_context']['p99_ms']}ms  "
+                f"disk {result['persisted_mb']}MB  rss {result['rss_mb']}MB "
+                f"(+{result['rss_loaded_delta_mb']}MB on load)"
+            )
+            del service
+    if output:
+        Path(output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[suite] wrote {output}")
+
+
+# --------------------------------------------------------------------------- #
+# startup: 백엔드 임포트 시간 예산과 RAG 준비(ready)까지의 시간을 잰다.
+# --------------------------------------------------------------------------- #
+
+# /health 응답 전에 로드되면 안 되는 모듈들.
+_DEFERRED_MODULES = (
+    "langchain_core",
+    "langchain_openai",
+    "langgraph",
+    "openai",
+    "faiss",
+    "langchain_text_splitters",
+)
+_STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.backend.app as app
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "import_s": elapsed,
+    "loaded": [name for name in %r if name in sys.modules],
+    "rag_loaded": app.rag_service.loaded,
+}))
+"""
+
+
+def bench_startup(runs: int, budget: float, size: int) -> None:
+    """새 인터프리터에서 ``src.backend.app`` 임포트 시간을 재고 예산을 검사한다."""
+
+    env = dict(os.environ, OPENAI_API_KEY="", PYTHONWARNINGS="ignore")
+    samples: List[float] = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE % (_DEFERRED_MODULES,)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        assert not probe["loaded"], f"imported at startup: {probe['loaded']}"
+        assert not probe["rag_loaded"], "RAG service was built during import"
+        samples.append(probe["import_s"])
+    median = statistics.median(samples)
+    print(f"[startup] import src.backend.app: median {median:.3f}s, min {min(samples):.3f}s over {runs} runs")
+    assert median <= budget, f"import took {median:.3f}s (budget {budget:.3f}s)"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        seed_corpus(index_dir, size)
+        service = LazyService(lambda: RAGService(index_dir, embeddings=FakeEmbeddings()), name="rag")
+        started = time.perf_counter()
+        service.warm_up()
+        # /health 폴링과 같은 방식으로 준비 상태를 기다린다.
+        while not service.status()["ready"]:
+            assert service.status()["state"] != "failed", service.status()
+            time.sleep(0.005)
+        ready_s = time.perf_counter() - started
+        assert service.wait_for_index()
+        indexed_s = time.perf_counter() - started
+        print(f"[startup] n={size}: rag ready {ready_s:.2f}s, vector index ready {indexed_s:.2f}s after warm-up")
+
+
+# --------------------------------------------------------------------------- #
+# normalize: 레거시 문자열 정규화 비용과 마이그레이션 마커 효과를 잰다.
+# --------------------------------------------------------------------------- #
+
+
+def _replace_each_fixup(value: object) -> object:
+    """이전 구현(치환 키마다 str.replace)을 비교 기준으로 재현한다."""
+
+    if isinstance(value, str):
+        for legacy, replacement in _TEXT_FIXUPS.items():
+            if legacy in value:
+                value = value.replace(legacy, replacement)
+        return value
+    if isinstance(value, list):
+        return [_replace_each_fixup(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _replace_each_fixup(item) for key, item in value.items()}
+    return value
+
+
+def bench_normalize(size: int) -> None:
+    """단일 패스 정규화와 스냅샷 마커로 건너뛴 로드를 측정한다."""
+
+    legacy = list(_TEXT_FIXUPS)
+    entries = [synthetic_entry(i) for i in range(size)]
+    # 100건 중 1건에 레거시 문자열을 섞는다.
+    for index in range(0, size, 100):
+        entry = entries[index]
+        entry["content"] = f"{entry['content']}\n{legacy[index % len(legacy)]}"
+        entry["metadata"] = {**entry["metadata"], "actions": [legacy[(index + 1) % len(legacy)]]}
+
+    started = time.perf_counter()
+    expected = [_replace_each_fixup(entry) for entry in entries]
+    replace_s = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = [normalize_legacy_payload(entry) for entry in entries]
+    single_s = time.perf_counter() - started
+    assert actual == expected, "single-pass normalizer disagrees with per-fixup replace"
+    unchanged = sum(1 for before, after in zip(entries, actual) if before is after)
+    print(
+        f"[normalize] n={size}: per-fixup replace {replace_s * 1000:.1f}ms, "
+        f"single pass {single_s * 1000:.1f}ms, {unchanged} entries returned unchanged"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        DocumentJournal(index_dir / "documents.json").compact(entries, 0)
+        loads: List[float] = []
+        for _ in range(2):
+            started = time.perf_counter()
+            service = RAGService(index_dir, embeddings=FakeEmbeddings())
+            loads.append(time.perf_counter() - started)
+            assert service.wait_for_index()
+            service.compact_documents()
+            stored = json.dumps(list(service._documents_by_key.values()), ensure_ascii=False)
+            assert not any(key in stored for key in legacy), "legacy text survived the load"
+        header = json.loads((index_dir / "documents.json").read_text(encoding="utf-8"))
+        assert header.get("migrations", {}).get("text_fixups"), "migration marker was not persisted"
+        print(f"[normalize] load without marker {loads[0]:.2f}s, with marker {loads[1]:.2f}s")
+
+
+# --------------------------------------------------------------------------- #
+# upload-stream: 대용량 JSON 업로드의 스트리밍 파싱/적재를 잰다.
+# --------------------------------------------------------------------------- #
+
+
+def _write_upload_file(path: Path, documents: int) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write('{"source": "postmortem-export", "documents": [\n')
+        for index in range(documents):
+            if index:
+                handle.write(",\n")
+            entry = synthetic_entry(index)
+            handle.write(
+                json.dumps(
+                    {"title": entry["title"], "content": entry["content"], "metadata": entry["metadata"]},
+                    ensure_ascii=False,
+                )
+            )
+        handle.write("\n]}\n")
+
+
+def _traced_peak_mb(fn: Callable[[], object]) -> Tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def bench_upload_stream(documents: int, chunk_bytes: int, batch: int) -> None:
+    """``json.loads`` 일괄 파싱과 스트리밍 파싱의 메모리 피크, 스트리밍 적재 처리량을 비교한다."""
+
+    from starlette.datastructures import UploadFile
+
+    from src.backend.app import _stream_rag_upload
+
+    with tempfile.TemporaryDirectory() as tmp:
+        upload_path = Path(tmp) / "upload.json"
+        _write_upload_file(upload_path, documents)
+        size_mb = upload_path.stat().st_size / 1e6
+
+        def parse_whole() -> None:
+            payload = json.loads(upload_path.read_bytes().decode("utf-8"))
+            assert len(payload["documents"]) == documents
+
+        def parse_streaming() -> None:
+            parser = JSONDocumentStream()
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            with upload_path.open("rb") as handle:
+                while True:
+                    chunk = handle.read(chunk_bytes)
+                    if not chunk:
+                        break
+                    parser.feed(decoder.decode(chunk))
+            parser.close()
+            assert parser.count == documents
+
+        whole_s, whole_mb = _traced_peak_mb(parse_whole)
+        stream_s, stream_mb = _traced_peak_mb(parse_streaming)
+        print(f"[upload-stream] file {size_mb:.1f}MB, {documents} document(s)")
+        print(f"  json.loads whole   {whole_s:6.2f}s  peak {whole_mb:8.1f}MB")
+        print(f"  streaming parser   {stream_s:6.2f}s  peak {stream_mb:8.1f}MB")
+
+        index_dir = Path(tmp) / "rag"
+        service = RAGService(index_dir, embeddings=FakeEmbeddings())
+
+        async def ingest() -> Dict[str, object]:
+            events = []
+            with upload_path.open("rb") as handle:
+                upload = UploadFile(handle, filename="upload.json", size=upload_path.stat().st_size)
+                async for event in _stream_rag_upload(
+                    upload, "upload.json", service=service, chunk_bytes=chunk_bytes, batch_documents=batch
+                ):
+                    events.append(event)
+            return {"events": len(events) - 1, "done": events[-1]}
+
+        rss_before = _rss_mb()
+        started = time.perf_counter()
+        result = asyncio.run(ingest())
+        elapsed = time.perf_counter() - started
+        stored = len(result["done"]["documents"])
+        assert stored == documents, stored
+        # 업로드가 끝났다고 응답하기 전에 벡터 인덱스가 디스크에 있어야 한다.
+        saved = load_vector_index(service._index_path)
+        assert saved is not None and len(saved) == service.stats()["vectors"], "upload finished before the index was saved"
+        assert "save" in result["done"]["timings_ms"], result["done"]["timings_ms"]
+        print(
+            f"  streaming ingest   {elapsed:6.2f}s  {stored / elapsed:8.0f} doc/s, "
+            f"{result['events']} progress event(s), RSS +{_rss_mb() - rss_before:.1f}MB (corpus included)"
+        )
+
+
+# --------------------------------------------------------------------------- #
+# retention: 보존 정책 적용 전후의 코퍼스 크기와 검색 지연을 잰다.
+# --------------------------------------------------------------------------- #
+
+
+def bench_retention(size: int, engine: str, max_age_days: float, max_per_scenario: int) -> None:
+    """합성 코퍼스에 보존 정책을 dry-run/적용하고 저장 크기·벡터 수·검색 지연을 비교한다."""
+
+    scenarios = _suite_scenarios()
+    policy = RetentionPolicy(
+        max_age_days={"incident_report": max_age_days, "action_execution": max_age_days},
+        max_per_scenario=max_per_scenario or None,
+    )
+    # 합성 문서는 2025년 안에서 생성되므로 기준 시각을 고정해 결과를 결정적으로 만든다.
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    queries = [f"{scenario.title} 조치 {step}" for step, scenario in enumerate(scenarios)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = Path(tmp)
+        with (index_dir / "documents.json").open("w", encoding="utf-8") as handle:
+            handle.write('{"version": 1, "seq": 0, "documents": [\n')
+            for index in range(size):
+                entry = suite_entry(index, scenarios)
+                # 조치 기록 5건 중 1건은 복구가 확인된 것으로 표시한다.
+                if entry["type"] == "action_execution" and index % 5 == 0:
+                    entry["metadata"]["recovery_status"] = "recovered"
+                handle.write((",\n" if index else "") + json.dumps(entry, ensure_ascii=False))
+            handle.write("\n]}\n")
+
+        service = RAGService(index_dir, embeddings=FakeEmbeddings(), query_cache_size=0, vector_engine=engine)
+        assert service.wait_for_index()
+        service._flush_index()
+        service.compact_documents()
+        before = {
+            "documents": len(service._documents_by_key),
+            "vectors": service.stats()["vectors"],
+            "snapshot_mb": (index_dir / "documents.json").stat().st_size / 1e6,
+            "vector_mb": service.stats()["vector_memory_bytes"] / 1e6,
+            "search": _measure(lambda step: service.search(queries[step % len(queries)], limit=4), 200),
+        }
+        protected = [
+            key
+            for key, entry in service._documents_by_key.items()
+            if entry["metadata"].get("type") == "scenario" or entry["metadata"].get("recovery_status") == "recovered"
+        ]
+
+        started = time.perf_counter()
+        report = service.retention_report(policy, now=now, sample=5)
+        dry_run_s = time.perf_counter() - started
+        assert len(service._documents_by_key) == before["documents"], "dry run evicted documents"
+        result = service.apply_retention(policy, now=now)
+        assert result["evicted"] == report["evictable"], (result, report["evictable"])
+        service.wait_for_index()
+        service._flush_index()
+        after = {
+            "documents": len(service._documents_by_key),
+            "vectors": service.stats()["vectors"],
+            "snapshot_mb": (index_dir / "documents.json").stat().st_size / 1e6,
+            "vector_mb": service.stats()["vector_memory_bytes"] / 1e6,
+            "search": _measure(lambda step: service.search(queries[step % len(queries)], limit=4), 200),
+        }
+        assert all(key in service._documents_by_key for key in protected), "a protected document was evicted"
+        assert after["vectors"] <= after["documents"], "evicted vectors are still indexed"
+        assert not service.retention_report(policy, now=now)["evictable"], "retention is not idempotent"
+
+        reloaded = RAGService(index_dir, embeddings=FakeEmbeddings(), vector_engine=engine)
+        assert len(reloaded._documents_by_key) == after["documents"], "evictions were not persisted"
+
+    print(
+        f"[retention] n={size} engine={engine}: dry run {dry_run_s * 1000:.1f}ms, "
+        f"apply {result['duration_ms']:.1f}ms, evicted {result['evicted']} {result['by_reason']}"
+    )
+    for label, stats in (("before", before), ("after", after)):
+        print(
+            f"  {label:<6} documents {stats['documents']:>8} ({stats['vectors']:>8} indexed)  "
+            f"snapshot {stats['snapshot_mb']:7.2f}MB  vectors {stats['vector_mb']:6.2f}MB  search p50 {_percentile(stats['search'], 50):7.3f}ms "
+            f"p99 {_percentile(stats['search'], 99):7.3f}ms"
+        )
+
+
+# --------------------------------------------------------------------------- #
+# bundle: 바이너리 번들 내보내기/가져오기와 documents.json 로드를 비교한다.
+# --------------------------------------------------------------------------- #
+
+
+def bench_bundle(size: int, engine: str, dim: int) -> None:
+    """번들 크기·읽기·가져오기 시간을 documents.json + 인덱스 로드와 비교하고 왕복 결과를 검사한다."""
+
+    scenarios = _suite_scenarios()
+    queries = [f"{scenario.title} 조치 {step}" for step, scenario in enumerate(scenarios)]
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir, target_dir = Path(tmp) / "source", Path(tmp) / "target"
+        source_dir.mkdir()
+        _write_suite_snapshot(source_dir / "documents.json", size, scenarios)
+        source = RAGService(source_dir, embeddings=FakeEmbeddings(dim), vector_engine=engine, query_cache_size=0)
+        assert source.wait_for_index()
+        source._flush_index()
+        source.compact_documents()
+        del source
+        gc.collect()
+
+        started = time.perf_counter()
+        source = RAGService(source_dir, embeddings=FakeEmbeddings(dim), vector_engine=engine, query_cache_size=0)
+        json_load_s = time.perf_counter() - started
+        assert source.wait_for_index(), "persisted index was not reused"
+        snapshot_mb = (source_dir / "documents.json").stat().st_size / 1e6
+        index_mb = _dir_mb(source._index_path)
+
+        bundle_path = Path(tmp) / "corpus.ragbundle"
+        exported = source.export_bundle(bundle_path)
+        bundle_mb = exported["bytes"] / 1e6
+
+        started = time.perf_counter()
+        json.loads((source_dir / "documents.json").read_text(encoding="utf-8"))
+        json_parse_s = time.perf_counter() - started
+        started = time.perf_counter()
+        bundle = read_bundle(bundle_path)
+        read_s = time.perf_counter() - started
+        started = time.perf_counter()
+        float(bundle.vectors[-1, 0]) if bundle.vectors is not None else None
+        map_ms = (time.perf_counter() - started) * 1000
+        del bundle
+
+        fake = FakeEmbeddings(dim)
+        target = RAGService(target_dir, embeddings=fake, vector_engine=engine, query_cache_size=0)
+        imported = target.import_bundle(bundle_path)
+        assert not imported["index_rebuild"], "bundle vectors were not adopted"
+        assert fake.embedded_texts == 0, "import re-embedded documents"
+        assert target._documents_by_key == source._documents_by_key, "documents changed in the round trip"
+        overlap = []
+        for query in queries:
+            expected = [doc.id for doc in source.search(query, limit=4)]
+            actual = [doc.id for doc in target.search(query, limit=4)]
+            # IVF-PQ exports its 8-bit refine copies and retrains, so only exact engines match row for row.
+            assert actual == expected or not target._vectors.exact, query
+            overlap.append(len(set(actual) & set(expected)) / max(1, len(expected)))
+        target._flush_index()
+        del target
+        reloaded = RAGService(target_dir, embeddings=FakeEmbeddings(dim), vector_engine=engine)
+        assert reloaded.wait_for_index(timeout=0) and len(reloaded._documents_by_key) == len(source._documents_by_key)
+
+        # 이전 코퍼스의 인덱스 구성이 진행 중일 때 가져와도 가져온 세대가 살아남아야 한다.
+        small = RAGService(Path(tmp) / "small", embeddings=SlowEmbeddings(0.0), vector_engine=engine)
+        small.add_documents_bulk([{"title": f"new {step}", "content": f"new document {step}"} for step in range(50)])
+        assert small.wait_for_index()
+        small.export_bundle(Path(tmp) / "small.ragbundle")
+        slow = SlowEmbeddings(0.2)
+        racing = RAGService(Path(tmp) / "racing", embeddings=slow, vector_engine=engine)
+        racing.add_documents_bulk([{"title": f"old {step}", "content": f"old document {step}"} for step in range(8)])
+        racing.search("old document", limit=1)
+        # 구성 스레드가 세대 번호를 잡고 임베딩에 들어갈 때까지 기다린다 (8건 x 0.2s).
+        time.sleep(0.3)
+        assert racing.stats()["index_building"], "expected an index build in flight"
+        raced = racing.import_bundle(Path(tmp) / "small.ragbundle")
+        assert not raced["index_rebuild"], "bundle vectors were not adopted"
+        racing.wait_for_index(timeout=30)
+        assert (Path(tmp) / "racing" / "index.current").read_text(encoding="utf-8").strip() == racing._index_path.name
+        saved = load_vector_index(racing._index_path)
+        assert saved is not None and len(saved) == raced["vectors"] == 50, "a stale build replaced the imported index"
+        # 가져온 벡터를 다시 임베딩했다면 이전 구성이 가져온 세대를 덮어쓴 것이다.
+        assert slow.embedded_texts <= 8, f"{slow.embedded_texts} text(s) embedded; a stale build replaced the import"
+
+    timings = imported["timings_ms"]
+    print(f"[bundle] n={size} engine={engine} dim={dim}: top-4 overlap after round trip {statistics.fmean(overlap):.3f}")
+    print(
+        f"  size      documents.json {snapshot_mb:8.2f}MB + index {index_mb:7.2f}MB  "
+        f"bundle {bundle_mb:8.2f}MB  (export {exported['duration_ms']:.0f}ms)"
+    )
+    print(
+        f"  parse     json.loads {json_parse_s * 1000:8.1f}ms  read_bundle {read_s * 1000:8.1f}ms  "
+        f"(vector block mapped, last row in {map_ms:.3f}ms)"
+    )
+    print(
+        f"  load      RAGService(documents.json) {json_load_s:6.2f}s  import_bundle {timings['total'] / 1000:6.2f}s "
+        f"(read {timings['read']:.0f}ms, index {timings['index']:.0f}ms, persist {timings['persist']:.0f}ms)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline RAGService benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    writes = subparsers.add_parser("writes", help="Per-write latency: journal append vs full rewrite")
+    writes.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    writes.add_argument("--iterations", type=int, default=200)
+
+    subparsers.add_parser("journal-recovery", help="Crash-consistency check for the document journal")
+
+    cache = subparsers.add_parser("embedding-cache", help="Check that rebuilds reuse cached embeddings")
+    cache.add_argument("--size", type=int, default=2_000)
+
+    indexes = subparsers.add_parser("indexes", help="Metadata lookups: full sort vs secondary indexes")
+    indexes.add_argument("--size", type=int, default=100_000)
+    indexes.add_argument("--iterations", type=int, default=50)
+
+    lexical = subparsers.add_parser("lexical", help="Offline BM25 search latency")
+    lexical.add_argument("--size", type=int, default=100_000)
+    lexical.add_argument("--iterations", type=int, default=200)
+
+    local = subparsers.add_parser("local-embeddings", help="Offline hashing embedder throughput")
+    local.add_argument("--size", type=int, default=5_000)
+
+    bulk = subparsers.add_parser("bulk-upload", help="Upload ingestion: one-by-one vs add_documents_bulk")
+    bulk.add_argument("--size", type=int, default=10_000)
+    bulk.add_argument("--documents", type=int, default=5_000)
+    bulk.add_argument("--batch-size", type=int, default=256)
+
+    passages = subparsers.add_parser("passages", help="Chunked .txt uploads: context size and needle retrieval")
+    passages.add_argument("--sections", type=int, default=200)
+
+    storm = subparsers.add_parser("alert-storm", help="Near-duplicate merging under repeated alerts")
+    storm.add_argument("--alerts", type=int, default=500)
+
+    swap = subparsers.add_parser("index-swap", help="Search latency while a new FAISS generation is built")
+    swap.add_argument("--size", type=int, default=20_000)
+
+    concurrency = subparsers.add_parser("concurrency", help="Search latency with N readers and one writer")
+    concurrency.add_argument("--size", type=int, default=20_000)
+    concurrency.add_argument("--readers", type=int, default=8)
+    concurrency.add_argument("--seconds", type=float, default=5.0)
+
+    recall = subparsers.add_parser("filtered-recall", help="Exact top-k for metadata-filtered vector search")
+    recall.add_argument("--size", type=int, default=100_000)
+    recall.add_argument("--queries", type=int, default=20)
+    recall.add_argument("--limit", type=int, default=4)
+    recall.add_argument("--engine", choices=ENGINES, default="faiss")
+
+    cache = subparsers.add_parser("query-cache", help="Query-result cache hit rate and invalidation")
+    cache.add_argument("--size", type=int, default=20_000)
+    cache.add_argument("--rounds", type=int, default=50)
+
+    engines = subparsers.add_parser("vector-engines", help="Recall/latency/memory per vector engine")
+    engines.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    engines.add_argument("--dim", type=int, default=256)
+    engines.add_argument("--queries", type=int, default=100)
+    engines.add_argument("--limit", type=int, default=10)
+
+    suite = subparsers.add_parser("suite", help="Scaling suite over synthetic documents.json-shaped corpora")
+    suite.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    suite.add_argument("--queries", type=int, default=200)
+    suite.add_argument("--ingest", type=int, default=200)
+    suite.add_argument("--json", default="", help="Write results to this JSON file")
+
+    startup = subparsers.add_parser("startup", help="Backend import-time budget and RAG warm-up time")
+    startup.add_argument("--runs", type=int, default=5)
+    startup.add_argument("--budget", type=float, default=1.5, help="Max median import time in seconds")
+    startup.add_argument("--size", type=int, default=20_000)
+
+    normalize = subparsers.add_parser("normalize", help="Legacy-text normalizer cost and migration marker")
+    normalize.add_argument("--size", type=int, default=50_000)
+
+    upload_stream = subparsers.add_parser("upload-stream", help="Streaming JSON upload parsing and ingestion")
+    upload_stream.add_argument("--documents", type=int, default=100_000)
+    upload_stream.add_argument("--chunk-bytes", type=int, default=1024 * 1024)
+    upload_stream.add_argument("--batch", type=int, default=256)
+
+    retention = subparsers.add_parser("retention", help="Retention policy: dry run, eviction and corpus size")
+    retention.add_argument("--size", type=int, default=100_000)
+    retention.add_argument("--engine", choices=ENGINES, default="numpy")
+    retention.add_argument("--max-age-days", type=float, default=180.0)
+    retention.add_argument("--max-per-scenario", type=int, default=500)
+
+    bundle = subparsers.add_parser("bundle", help="Binary corpus bundle: size, read and import time")
+    bundle.add_argument("--size", type=int, default=100_000)
+    bundle.add_argument("--engine", choices=ENGINES, default="numpy")
+    bundle.add_argument("--dim", type=int, default=256)
+
+    args = parser.parse_args()
+    if args.command == "writes":
+        bench_writes(args.sizes, args.iterations)
+    elif args.command == "journal-recovery":
+        check_journal_recovery()
+    elif args.command == "embedding-cache":
+        check_embedding_cache(args.size)
+    elif args.command == "indexes":
+        bench_indexes(args.size, args.iterations)
+    elif args.command == "lexical":
+        bench_lexical(args.size, args.iterations)
+    elif args.command == "local-embeddings":
+        bench_local_embeddings(args.size)
+    elif args.command == "bulk-upload":
+        bench_bulk_upload(args.size, args.documents, args.batch_size)
+    elif args.command == "passages":
+        check_passages(args.sections)
+    elif args.command == "alert-storm":
+        check_alert_storm(args.alerts)
+    elif args.command == "index-swap":
+        check_index_swap(args.size)
+    elif args.command == "concurrency":
+        bench_concurrency(args.size, args.readers, args.seconds)
+    elif args.command == "filtered-recall":
+        check_filtered_recall(args.size, args.queries, args.limit, args.engine)
+    elif args.command == "query-cache":
+        check_query_cache(args.size, args.rounds)
+    elif args.command == "vector-engines":
+        bench_vector_engines(args.sizes, args.dim, args.queries, args.limit)
+    elif args.command == "suite":
+        bench_suite(args.sizes, args.queries, args.ingest, args.json)
+    elif args.command == "startup":
+        bench_startup(args.runs, args.budget, args.size)
+    elif args.command == "normalize":
+        bench_normalize(args.size)
+    elif args.command == "upload-stream":
+        bench_upload_stream(args.documents, args.chunk_bytes, args.batch)
+    elif args.command == "retention":
+        bench_retention(args.size, args.engine, args.max_age_days, args.max_per_scenario)
+    elif args.command == "bundle":
+        bench_bundle(args.size, args.engine, args.dim)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""RAG 코퍼스를 바이너리 번들(.ragbundle)로 내보내거나 가져오는 스크립트.
+
+    python scripts/rag_bundle.py export corpus.ragbundle --data-dir rag_data
+    python scripts/rag_bundle.py inspect corpus.ragbundle
+    python scripts/rag_bundle.py import corpus.ragbundle --data-dir rag_data --replace
+
+번들은 문서 메타데이터(열 단위)와 float32 벡터를 한 파일에 담으며 pickle을 쓰지 않는다.
+가져올 때 벡터 블록은 메모리 매핑되므로, 같은 임베딩 모델이면 다시 임베딩하지 않는다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.rag import RAGService, rag_data_dir  # noqa: E402
+from src.backend.rag_bundle import read_header  # noqa: E402
+
+
+def export_bundle(output: Path, data_dir: Path) -> None:
+    result = RAGService(data_dir).export_bundle(output)
+    print(
+        f"[INFO] {result['documents']}개 문서, {result['vectors']}개 벡터를 "
+        f"{output}에 저장했습니다 ({result['bytes'] / 1e6:.1f}MB, {result['duration_ms']:.0f}ms)."
+    )
+    if result["documents"] and not result["vectors"]:
+        print("[WARN] 최신 벡터 인덱스가 없어 문서만 내보냈습니다. 가져오는 쪽에서 인덱스를 재구성합니다.")
+
+
+def inspect_bundle(bundle: Path) -> None:
+    header = read_header(bundle)
+    summary = {key: value for key, value in header.items() if key != "columns"}
+    summary["columns"] = {column["name"]: column["kind"] for column in header["columns"]}
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+def import_bundle(bundle: Path, data_dir: Path, replace: bool) -> int:
+    read_header(bundle)
+    service = RAGService(data_dir)
+    existing = service.stats()["documents"]
+    if existing and not replace:
+        print(
+            f"[ERROR] {data_dir}에 이미 {existing}개 문서가 있습니다. 번들로 교체하려면 --replace를 지정하세요.",
+            file=sys.stderr,
+        )
+        return 1
+    result = service.import_bundle(bundle)
+    rebuild = " (벡터 인덱스는 백그라운드에서 재구성)" if result["index_rebuild"] else ""
+    print(
+        f"[INFO] {result['documents']}개 문서, {result['vectors']}개 벡터를 가져왔습니다{rebuild}: "
+        f"{json.dumps(result['timings_ms'])}"
+    )
+    if result["index_rebuild"]:
+        service.wait_for_index()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="Write the corpus and vectors to a bundle")
+    export.add_argument("output", type=Path)
+    export.add_argument("--data-dir", type=Path, default=rag_data_dir)
+
+    inspect = subparsers.add_parser("inspect", help="Print a bundle's header")
+    inspect.add_argument("bundle", type=Path)
+
+    load = subparsers.add_parser("import", help="Replace a corpus with a bundle")
+    load.add_argument("bundle", type=Path)
+    load.add_argument("--data-dir", type=Path, default=rag_data_dir)
+    load.add_argument("--replace", action="store_true", help="Overwrite a non-empty corpus")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_bundle(args.output, args.data_dir)
+    elif args.command == "inspect":
+        inspect_bundle(args.bundle)
+    elif args.command == "import":
+        return import_bundle(args.bundle, args.data_dir, args.replace)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -57,9 +57,22 @@ class ActionExecutionService:
     _sim_thread: ClassVar[threading.Thread | None] = None
 
     def __init__(self) -> None:
-        self._ensure_simulator()
+        # The simulator is started by start() or the first execution so that
+        # constructing the service does not block backend startup.
         self._session = requests.Session()
 
+    def start(self) -> None:
+        """Bring the simulator up in the background ahead of the first execution."""
+
+        threading.Thread(target=self._warm_up_simulator, name="ActionSimulatorWarmUp", daemon=True).start()
+
+    def _warm_up_simulator(self) -> None:
+        try:
+            self._ensure_simulator()
+        except RuntimeError:
+            # Retried (and reported) by the next execute_pending call.
+            pass
+
     def _ensure_simulator(self) -> None:
         if self.__class__._sim_started:
             return
@@ -81,10 +94,11 @@ class ActionExecutionService:
             thread.start()
             self.__class__._sim_thread = thread
 
-        # Wait for the server to report healthy.
-        if not self._wait_for_simulator():
-            raise RuntimeError("Failed to start action simulator service")
-        self.__class__._sim_started = True
+            # Wait for the server to report healthy; holding the lock keeps a
+            # concurrent caller from starting a second server meanwhile.
+            if not self._wait_for_simulator():
+                raise RuntimeError("Failed to start action simulator service")
+            self.__class__._sim_started = True
 
     @staticmethod
     def _probe_simulator(timeout: float = 0.5) -> bool:
@@ -128,10 +142,33 @@ class ActionExecutionService:
             )
         return execution
 
+    def refresh_from_report(self, report: IncidentReport) -> Optional[ActionExecution]:
+        """Replace the actions of the report's execution if it is still awaiting approval."""
+
+        actions = [action.strip() for action in report.action_items if action.strip()]
+        if not actions:
+            return None
+        with STATE_LOCK:
+            for execution in reversed(STATE.action_executions):
+                if execution.report_id != report.id:
+                    continue
+                if execution.status != "pending" or execution.actions == actions:
+                    return None
+                execution.actions = actions
+                STATE.append_feed(
+                    _feed_line(f"Action plan updated from enriched analysis ({execution.scenario_title})")
+                )
+                return execution
+        return None
+
     def execute_pending(self, execution_id: str) -> ActionExecution:
         execution = self._require_execution(execution_id)
         if execution.status == "executed":
             return execution
+        try:
+            self._ensure_simulator()
+        except RuntimeError as exc:
+            raise ValueError("Action simulator is unavailable") from exc
 
         results: List[ActionExecutionResult] = []
         for action in execution.actions:
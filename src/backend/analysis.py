@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from collections.abc import Sequence
 import sys
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from textwrap import dedent
-from typing import Dict, List
-
+from threading import Lock, Thread
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from src.backend.analysis_cache import AnalysisCache
+from src.backend.analysis_stream import COMPLETE, FALLBACK, PARTIAL, AnalysisStream
+from src.backend.json_stream import PartialJSONObject
+from src.backend.lazy import optional_import
 from src.backend.rag import rag_service
 from src.backend.state import MetricSample
 from src.backend.text_utils import normalize_legacy_payload
@@ -23,17 +32,20 @@ if not logger.handlers:
 logger.setLevel(logging.INFO)
 logger.propagate = False
 
-try:
+# LangChain/LangGraph take seconds to import, so they are loaded on the
+# first analysis rather than when the backend starts.
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
     from langchain_core.tools import Tool
     from langchain_openai import ChatOpenAI
-except ImportError:  # pragma: no cover - optional dependency
-    Tool = None  # type: ignore
-    ChatOpenAI = None  # type: ignore
 
-try:
-    from langgraph.prebuilt import create_react_agent as langgraph_create_react_agent
-except ImportError:  # pragma: no cover - optional dependency
-    langgraph_create_react_agent = None  # type: ignore
+ANALYSIS_MODEL = "gpt-4o-mini"
+_TEMPERATURE = 0.3
+_MAX_TOKENS = 900
+RAG_TOOL_NAME = "incident_rag_lookup"
+# Fields of the SYSTEM_PROMPT schema, and how often partial values are pushed.
+_REPORT_FIELDS = ("summary", "root_cause", "impact", "action_plan", "follow_up")
+_PARTIAL_INTERVAL_SECONDS = 0.1
 
 SYSTEM_PROMPT = (
     "당신은 SRE 사고 분석가입니다. 제공된 모니터링 결과를 바탕으로 사고의 원인, 영향 범위, "
@@ -107,11 +119,22 @@ def _prioritize_actions(
                 seen.add(stripped)
     return ordered
 
-def _build_rag_tool(scenario: AlertScenario) -> Tool | None:
-    if Tool is None:
+def _build_rag_tool() -> Tool | None:
+    """RAG lookup tool shared by every incident.
+
+    The scenario is read from ``config["configurable"]["scenario"]`` at
+    invoke time, so one compiled agent graph serves all scenarios.
+    """
+
+    tool_class = optional_import("langchain_core.tools", "Tool")
+    config_class = optional_import("langchain_core.runnables", "RunnableConfig")
+    if tool_class is None or config_class is None:
         return None
 
-    def _search(query: str) -> str:
+    def _search(query: str, config: RunnableConfig) -> str:
+        scenario = (config.get("configurable") or {}).get("scenario")
+        if not isinstance(scenario, AlertScenario):
+            return "관련된 RAG 조치 이력을 찾지 못했습니다."
         base_query = (query or "").strip() or " ".join(
             filter(
                 None,
@@ -163,8 +186,11 @@ def _build_rag_tool(scenario: AlertScenario) -> Tool | None:
                 lines.append(f"    · {summary}")
         return "\n".join(lines)
 
-    return Tool(
-        name="incident_rag_lookup",
+    # LangChain injects the run config into parameters whose resolved type
+    # hint is RunnableConfig; it is only imported lazily here.
+    _search.__annotations__["config"] = config_class
+    return tool_class(
+        name=RAG_TOOL_NAME,
         func=_search,
         description=(
             "현재 시나리오와 유사한 과거 보고/승인 조치를 RAG 데이터베이스에서 조회합니다. "
@@ -180,29 +206,143 @@ class _LangGraphAgentExecutor:
     def __init__(self, runnable) -> None:
         self._runnable = runnable
 
-    def invoke(self, payload: Dict[str, object]) -> Dict[str, object]:
-        if isinstance(payload, dict) and "messages" in payload:
-            return self._runnable.invoke(payload)
-
-        query = ""
-        if isinstance(payload, dict):
-            raw = payload.get("input") or payload.get("prompt") or ""
-            query = str(raw)
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": query},
-        ]
-        return self._runnable.invoke({"messages": messages})
+    def invoke(
+        self,
+        payload: Dict[str, object],
+        config: Optional[RunnableConfig] = None,
+        on_token: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, object]:
+        """Run the agent; ``on_token(message_id, text)`` receives model text as it streams."""
+
+        if not (isinstance(payload, dict) and "messages" in payload):
+            query = ""
+            if isinstance(payload, dict):
+                raw = payload.get("input") or payload.get("prompt") or ""
+                query = str(raw)
+            payload = {
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": query},
+                ]
+            }
+        if on_token is None:
+            return self._runnable.invoke(payload, config=config)
+
+        result: Dict[str, object] = {}
+        for mode, update in self._runnable.stream(payload, config=config, stream_mode=["messages", "values"]):
+            if mode == "values":
+                result = update
+                continue
+            chunk, metadata = update
+            text = getattr(chunk, "content", None)
+            # Only the model's own text; tool results stream as messages too.
+            if text and isinstance(text, str) and metadata.get("langgraph_node") == "agent":
+                on_token(str(getattr(chunk, "id", "") or ""), text)
+        return result
 
 
 def _build_agent_executor(llm: ChatOpenAI, tools: List[Tool]):
-    if langgraph_create_react_agent is None:
+    create_react_agent = optional_import("langgraph.prebuilt", "create_react_agent")
+    if create_react_agent is None:
         return None
 
-    graph_agent = langgraph_create_react_agent(llm, tools)
+    graph_agent = create_react_agent(llm, tools)
     return _LangGraphAgentExecutor(graph_agent)
 
 
+def _build_llm(api_key: str, model: str) -> ChatOpenAI | None:
+    chat_class = optional_import("langchain_openai", "ChatOpenAI")
+    if chat_class is None:
+        return None
+    return chat_class(
+        model=model,
+        temperature=_TEMPERATURE,
+        max_tokens=_MAX_TOKENS,
+        openai_api_key=api_key,
+    )
+
+
+# Tools the analysis agent can be compiled with, by name.
+_TOOL_BUILDERS: Dict[str, Callable[[], Optional[Tool]]] = {RAG_TOOL_NAME: _build_rag_tool}
+
+
+class AgentCache:
+    """LLM clients and compiled agent graphs reused across incidents.
+
+    Building a ``ChatOpenAI`` client opens a new HTTP connection pool and
+    ``create_react_agent`` compiles a graph; both are independent of the
+    incident, so they are keyed by (API key fingerprint, model, tool names)
+    and built once. Scenario specifics travel in the invoke-time config.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._clients: Dict[Tuple[str, str], object] = {}
+        self._executors: Dict[Tuple[str, str, Tuple[str, ...]], _LangGraphAgentExecutor] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def executor(
+        self,
+        api_key: str,
+        model: str = ANALYSIS_MODEL,
+        tool_names: Sequence[str] = (RAG_TOOL_NAME,),
+    ) -> _LangGraphAgentExecutor | None:
+        fingerprint = self.fingerprint(api_key)
+        key = (fingerprint, model, tuple(tool_names))
+        with self._lock:
+            executor = self._executors.get(key)
+            if executor is not None:
+                self.hits += 1
+                return executor
+            self.misses += 1
+            llm = self._clients.get((fingerprint, model))
+            if llm is None:
+                llm = _build_llm(api_key, model)
+                if llm is None:
+                    return None
+                self._clients[(fingerprint, model)] = llm
+            tools = [tool for tool in (_TOOL_BUILDERS[name]() for name in tool_names) if tool is not None]
+            executor = _build_agent_executor(llm, tools)
+            if executor is not None:
+                self._executors[key] = executor
+            return executor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._executors.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "agents": len(self._executors),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+agent_cache = AgentCache()
+
+
+def reset_agent_cache() -> None:
+    """Forget cached clients and agents, e.g. after the OpenAI API key changes."""
+
+    agent_cache.clear()
+
+
+analysis_cache = AnalysisCache.from_env()
+
+
+def analysis_stats() -> Dict[str, object]:
+    return {"cache": analysis_cache.stats(), "agents": agent_cache.stats()}
+
+
 def _extract_text(value: object) -> str:
     if value is None:
         return ""
@@ -229,39 +369,60 @@ def _extract_text(value: object) -> str:
     return str(value).strip()
 
 
-def _call_openai(scenario: AlertScenario, prompt: str) -> Dict[str, object] | None:
+class _PartialAnalysis:
+    """Turns streamed model text into throttled snapshots of the report fields."""
+
+    def __init__(self, on_partial: Callable[[Dict[str, object]], None]) -> None:
+        self._on_partial = on_partial
+        self._message_id: Optional[str] = None
+        self._parser = PartialJSONObject()
+        self._published: Dict[str, object] = {}
+        self._published_at = 0.0
+
+    def on_token(self, message_id: str, text: str) -> None:
+        if message_id != self._message_id:
+            # A new model turn (e.g. the answer after a tool call) starts over.
+            self._message_id = message_id
+            self._parser = PartialJSONObject()
+        self._parser.feed(text)
+        if monotonic() - self._published_at >= _PARTIAL_INTERVAL_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        snapshot = {key: value for key, value in self._parser.snapshot().items() if key in _REPORT_FIELDS}
+        if snapshot and snapshot != self._published:
+            self._published = snapshot
+            self._published_at = monotonic()
+            self._on_partial(snapshot)
+
+
+def _call_openai(
+    scenario: AlertScenario,
+    prompt: str,
+    on_partial: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, object] | None:
     api_key = get_openai_api_key()
     if not api_key:
         return None
-    if ChatOpenAI is None or Tool is None:
-        logger.info("Missing LangChain/LangGraph dependencies.")
-        return None
-    
-    try:
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            max_tokens=900,
-            openai_api_key=api_key,
-        )
 
-        tools: List[Tool] = []
-        rag_tool = _build_rag_tool(scenario)
-        if rag_tool:
-            tools.append(rag_tool)
-
-        agent_executor = _build_agent_executor(llm, tools)
+    try:
+        agent_executor = agent_cache.executor(api_key)
         if agent_executor is None:
             logger.info("Missing LangChain/LangGraph dependencies.")
             return None
 
         logger.info("AI prompt submitted: %s", prompt)
+        partial = _PartialAnalysis(on_partial) if on_partial is not None else None
         result = agent_executor.invoke(
             {
                 "input": f"{SYSTEM_PROMPT}\n\n{prompt}",
                 "chat_history": [],
-            }
+            },
+            config={"configurable": {"scenario": scenario}},
+            on_token=partial.on_token if partial is not None else None,
         )
+        if partial is not None:
+            partial.flush()
         logger.info("Agent raw result: %r", result)
 
         output = ""
@@ -395,13 +556,27 @@ def _build_report_text(analysis: Dict[str, object], scenario: AlertScenario, sam
         """
     ).strip()
 
-def generate_incident_analysis(
+def _cached_analysis(
     scenario: AlertScenario, sample: MetricSample
+) -> Tuple[Tuple[object, ...], Dict[str, object] | None]:
+    # Read before the lookup: an analysis computed while the corpus changes
+    # is stored under the older generation and never served afterwards.
+    cache_key = analysis_cache.key(scenario.code, sample, rag_service.corpus_generation)
+    cached = analysis_cache.get(cache_key) if get_openai_api_key() else None
+    if cached is not None:
+        logger.info("Reusing cached AI analysis for %s.", scenario.code)
+        cached = {**cached, "report_text": _build_report_text(cached, scenario, sample)}
+    return cache_key, cached
+
+
+def _finish_analysis(
+    scenario: AlertScenario,
+    sample: MetricSample,
+    analysis: Dict[str, object] | None,
+    approved_actions: Sequence[str],
+    cache_key: Tuple[object, ...],
 ) -> Dict[str, object]:
-    approved_actions = rag_service.recent_actions(scenario.code)
-    rag_context = rag_service.build_context_for_scenario(scenario)
-    prompt = _build_user_prompt(scenario, sample, rag_context)
-    analysis = _call_openai(scenario, prompt)
+    from_model = bool(analysis)
     logger.info("AI analysis result: %r", analysis)
     analysis = normalize_legacy_payload(analysis) if analysis else analysis
     if not analysis:
@@ -445,6 +620,10 @@ def generate_incident_analysis(
         "action_plan": action_plan,
         "follow_up": follow_up,
     }
+    if from_model:
+        # The deterministic fallback is cheap and quotes the sample, so only
+        # model output is worth reusing.
+        analysis_cache.put(cache_key, normalized)
     report_text = _build_report_text(normalized, scenario, sample)
     return {
         **normalized,
@@ -452,5 +631,99 @@ def generate_incident_analysis(
     }
 
 
+def generate_incident_analysis(
+    scenario: AlertScenario, sample: MetricSample
+) -> Dict[str, object]:
+    cache_key, cached = _cached_analysis(scenario, sample)
+    if cached is not None:
+        return cached
+
+    approved_actions = rag_service.recent_actions(scenario.code)
+    rag_context = rag_service.build_context_for_scenario(scenario)
+    prompt = _build_user_prompt(scenario, sample, rag_context)
+    analysis = _call_openai(scenario, prompt)
+    return _finish_analysis(scenario, sample, analysis, approved_actions, cache_key)
+
+
+def start_incident_analysis(
+    scenario: AlertScenario,
+    sample: MetricSample,
+    *,
+    deadline: float | None,
+    stream: AnalysisStream | None = None,
+) -> Tuple[Dict[str, object], Future | None]:
+    """Analyse an incident, waiting at most ``deadline`` seconds for RAG context and the model.
+
+    Returns ``(analysis, enrichment)``. When the model answers in time (or
+    no key is configured, or the cache hits) ``enrichment`` is ``None``.
+    Otherwise ``analysis`` is the deterministic fallback and the model call
+    keeps running: ``enrichment`` resolves to the finished AI analysis, or
+    to ``None`` if the model failed. ``deadline=None`` waits indefinitely.
+
+    With ``stream``, the fields decoded from the model's token stream are
+    published as ``partial`` events, the dispatched fallback as
+    ``fallback`` and the final analysis (tagged with its ``source``) as
+    ``complete``.
+    """
+
+    def publish(event: str, data: Dict[str, object]) -> None:
+        if stream is not None:
+            stream.publish(event, data)
+
+    cache_key, cached = _cached_analysis(scenario, sample)
+    if cached is not None:
+        publish(COMPLETE, {**cached, "source": "cache"})
+        return cached, None
+
+    # Only the fallback's inputs are gathered up front: the RAG context
+    # embeds its query (possibly through OpenAI, with retries), so it is
+    # built on the model thread where the deadline covers it.
+    approved_actions = rag_service.recent_actions(scenario.code)
+    on_partial = (lambda fields: publish(PARTIAL, fields)) if stream is not None else None
+
+    def _model_analysis() -> Dict[str, object] | None:
+        rag_context = rag_service.build_context_for_scenario(scenario)
+        prompt = _build_user_prompt(scenario, sample, rag_context)
+        analysis = _call_openai(scenario, prompt, on_partial)
+        if not analysis:
+            publish(
+                COMPLETE,
+                {**_finish_analysis(scenario, sample, None, approved_actions, cache_key), "source": "fallback"},
+            )
+            return None
+        enriched = _finish_analysis(scenario, sample, analysis, approved_actions, cache_key)
+        publish(COMPLETE, {**enriched, "source": "model"})
+        return enriched
+
+    if not get_openai_api_key() or deadline is None:
+        enriched = _model_analysis()
+        if enriched is None:
+            return _finish_analysis(scenario, sample, None, approved_actions, cache_key), None
+        return enriched, None
+
+    enrichment: Future = Future()
 
+    def _run() -> None:
+        try:
+            enrichment.set_result(_model_analysis())
+        except BaseException as exc:  # pragma: no cover - _call_openai guards its own errors
+            enrichment.set_exception(exc)
 
+    # A daemon thread, like the monitor itself: a hung model call must not
+    # hold up shutdown.
+    Thread(target=_run, name="IncidentAnalysis", daemon=True).start()
+    try:
+        enriched = enrichment.result(timeout=deadline)
+    except FutureTimeoutError:
+        logger.info(
+            "AI analysis for %s exceeded %.1fs; dispatching the fallback report first.",
+            scenario.code,
+            deadline,
+        )
+        fallback = _finish_analysis(scenario, sample, None, approved_actions, cache_key)
+        # Ignored by the stream if the model finished in the meantime.
+        publish(FALLBACK, fallback)
+        return fallback, enrichment
+    if enriched is None:
+        return _finish_analysis(scenario, sample, None, approved_actions, cache_key), None
+    return enriched, None
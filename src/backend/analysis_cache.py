@@ -0,0 +1,127 @@
+"""In-memory TTL/LRU cache of AI incident analyses."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from src.backend.state import MetricSample
+from src.incident_console.config import (
+    get_analysis_cache_bucket,
+    get_analysis_cache_size,
+    get_analysis_cache_ttl,
+)
+
+
+def overshoot_bucket(value: float, threshold: float, width: float) -> int:
+    """Bucket of ``value``'s overshoot relative to ``threshold`` (negative when below it)."""
+
+    scale = abs(threshold) or 1.0
+    return math.floor((value - threshold) / scale / width)
+
+
+class AnalysisCache:
+    """Structured analyses reused while an incident keeps re-triggering.
+
+    Metrics flapping around a threshold raise the same incident again and
+    again; each time the situation is essentially unchanged, yet an LLM
+    round-trip takes seconds. Entries are keyed by scenario code, the HTTP
+    and CPU overshoot buckets and the RAG corpus generation (so new
+    approved actions or uploads force a fresh analysis), expire after
+    ``ttl_seconds`` and are evicted least-recently-used beyond
+    ``max_entries``. Only the structured fields are cached; callers render
+    the report text from the fresh sample.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 900.0,
+        max_entries: int = 128,
+        bucket_width: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = max(0.0, ttl_seconds)
+        self._max_entries = max(0, max_entries)
+        self._bucket_width = bucket_width
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Dict[str, object]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisCache":
+        return cls(
+            ttl_seconds=get_analysis_cache_ttl(),
+            max_entries=get_analysis_cache_size(),
+            bucket_width=get_analysis_cache_bucket(),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_entries > 0
+
+    def key(self, scenario_code: str, sample: MetricSample, generation: int) -> Tuple[Hashable, ...]:
+        return (
+            scenario_code,
+            overshoot_bucket(sample.http, sample.http_threshold, self._bucket_width),
+            overshoot_bucket(sample.cpu, sample.cpu_threshold, self._bucket_width),
+            generation,
+        )
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Dict[str, object]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and self._clock() - cached[0] > self._ttl:
+                del self._entries[key]
+                self.expired += 1
+                cached = None
+            if cached is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy(cached[1])
+
+    def put(self, key: Tuple[Hashable, ...], analysis: Dict[str, object]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), _copy(analysis))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "bucket_width": self._bucket_width,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _copy(analysis: Dict[str, object]) -> Dict[str, object]:
+    # Callers own the lists they get back (the report keeps them).
+    return {key: list(value) if isinstance(value, list) else value for key, value in analysis.items()}
@@ -0,0 +1,112 @@
+"""Per-report fan-out of incident analyses while the model is still writing them."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+# Event names sent to subscribers, in the order they can occur.
+PARTIAL = "partial"
+FALLBACK = "fallback"
+COMPLETE = "complete"
+
+
+class AnalysisStream:
+    """Latest state of one report's analysis plus the queues following it.
+
+    The analysis thread publishes ``partial`` snapshots of the fields
+    decoded so far, a ``fallback`` when the report is dispatched before the
+    model finishes, and a final ``complete``. A subscriber first receives
+    the current state and then every later event on an ``asyncio.Queue``
+    bound to its own event loop; publishing never blocks on a slow reader.
+    """
+
+    def __init__(self, report_id: str, *, title: str = "", scenario_code: str = "") -> None:
+        self.report_id = report_id
+        self.title = title
+        self.scenario_code = scenario_code
+        self._lock = Lock()
+        self._latest: Dict[str, Tuple[str, Dict[str, object]]] = {}
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+    @property
+    def done(self) -> bool:
+        return COMPLETE in self._latest
+
+    def publish(self, event: str, data: Dict[str, object]) -> None:
+        with self._lock:
+            if self.done:
+                return
+            self._latest[event] = (event, data)
+            subscribers = list(self._subscribers)
+            if event == COMPLETE:
+                self._subscribers.clear()
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+            except RuntimeError:
+                # The subscriber's loop has shut down.
+                self.unsubscribe(queue)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue of ``(event, data)`` for the running loop, primed with the current state."""
+
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            for event in (PARTIAL, FALLBACK, COMPLETE):
+                if event in self._latest:
+                    queue.put_nowait(self._latest[event])
+            if not self.done:
+                self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = [entry for entry in self._subscribers if entry[1] is not queue]
+
+    def describe(self) -> Dict[str, object]:
+        with self._lock:
+            state = next(
+                (event for event in (COMPLETE, FALLBACK, PARTIAL) if event in self._latest),
+                "waiting",
+            )
+            return {
+                "report_id": self.report_id,
+                "title": self.title,
+                "scenario_code": self.scenario_code,
+                "state": state,
+                "subscribers": len(self._subscribers),
+            }
+
+
+class AnalysisStreams:
+    """Recent analysis streams by report id, oldest dropped beyond ``max_streams``."""
+
+    def __init__(self, *, max_streams: int = 32) -> None:
+        self._max_streams = max(1, max_streams)
+        self._lock = Lock()
+        self._streams: "OrderedDict[str, AnalysisStream]" = OrderedDict()
+
+    def open(self, report_id: str, *, title: str = "", scenario_code: str = "") -> AnalysisStream:
+        stream = AnalysisStream(report_id, title=title, scenario_code=scenario_code)
+        with self._lock:
+            self._streams[report_id] = stream
+            while len(self._streams) > self._max_streams:
+                self._streams.popitem(last=False)
+        return stream
+
+    def get(self, report_id: str) -> Optional[AnalysisStream]:
+        with self._lock:
+            return self._streams.get(report_id)
+
+    def active(self) -> List[Dict[str, object]]:
+        """Streams whose analysis is still running, oldest first."""
+
+        with self._lock:
+            streams = list(self._streams.values())
+        return [stream.describe() for stream in streams if not stream.done]
+
+
+analysis_streams = AnalysisStreams()
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
 import json
 from pathlib import Path
+from time import perf_counter
+from typing import AsyncIterator
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr, Field
 
 from src.backend.actions import ActionExecutionService
+from src.backend.analysis import analysis_stats, reset_agent_cache
+from src.backend.analysis_stream import COMPLETE, analysis_streams
 from src.backend.fake_actions_api import fake_actions_app
+from src.backend.json_stream import JSONDocumentStream
 from src.backend.monitor import PrometheusMonitor
 from src.backend.rag import RAGService, rag_service
 from src.backend.services import (
@@ -37,8 +46,19 @@ monitor = PrometheusMonitor(
     slack_service,
     action_service,
 )
-rag_service.bootstrap_scenarios(STATE.scenarios)
-ai_service = AIService(on_change=rag_service.reset_embeddings)
+# The RAG service loads on first use or in the startup warm-up below; seed
+# the scenario documents as soon as it exists.
+rag_service.add_initializer(lambda service: service.bootstrap_scenarios(STATE.scenarios))
+
+
+def _on_ai_settings_change() -> None:
+    reset_agent_cache()
+    # An unloaded service picks the new credentials up when it is built.
+    if rag_service.loaded:
+        rag_service.reset_embeddings()
+
+
+ai_service = AIService(on_change=_on_ai_settings_change)
 email_registry_service = EmailRegistryService()
 email_delivery_service = EmailDeliveryService(email_registry_service)
 
@@ -80,6 +100,10 @@ class EmailRecipientPayload(BaseModel):
 
 
 ALLOWED_RAG_UPLOAD_SUFFIXES = {".json", ".txt"}
+# JSON uploads are read and ingested incrementally so memory stays bounded
+# by one chunk plus one batch regardless of the file size.
+RAG_UPLOAD_CHUNK_BYTES = 1024 * 1024
+RAG_UPLOAD_BATCH_DOCUMENTS = 256
 
 
 app = FastAPI(title="Incident Response Console Backend", version="0.2.0")
@@ -103,29 +127,6 @@ def _handle_errors(fn):
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
-def _parse_uploaded_json_documents(payload: object) -> list[dict[str, object]]:
-    if isinstance(payload, list):
-        documents = payload
-    elif isinstance(payload, dict):
-        doc_list = payload.get("documents")
-        if isinstance(doc_list, list):
-            documents = doc_list
-        else:
-            documents = [payload]
-    else:
-        raise ValueError("Uploaded JSON must be an object or an array of objects.")
-
-    normalized: list[dict[str, object]] = []
-    for entry in documents:
-        if not isinstance(entry, dict):
-            raise ValueError("Uploaded JSON documents must contain objects.")
-        normalized.append(entry)
-
-    if not normalized:
-        raise ValueError("Uploaded JSON file does not contain any documents.")
-    return normalized
-
-
 def _normalize_uploaded_entry(
     entry: dict[str, object],
     *,
@@ -173,60 +174,131 @@ def _normalize_uploaded_entry(
     }
 
 
-def _ingest_rag_upload(
+def _ingest_rag_text_upload(
     filename: str,
-    suffix: str,
     text: str,
     *,
     service: RAGService | None = None,
-) -> list[str]:
+) -> dict[str, object]:
+    target = service or rag_service
+    base_title = Path(filename).stem or "Uploaded RAG reference"
+    if not text.strip():
+        raise ValueError("Uploaded document is empty.")
+    return target.add_documents_bulk(
+        [{"title": base_title, "content": text, "metadata": {"source_filename": filename}}]
+    )
+
+
+async def _stream_rag_upload(
+    upload: UploadFile,
+    filename: str,
+    *,
+    service: RAGService | None = None,
+    chunk_bytes: int = RAG_UPLOAD_CHUNK_BYTES,
+    batch_documents: int = RAG_UPLOAD_BATCH_DOCUMENTS,
+) -> AsyncIterator[dict[str, object]]:
+    """Parse a JSON upload chunk by chunk and ingest it in bounded batches.
+
+    Yields a ``progress`` event after every ingested batch and a final
+    ``done`` event with the same fields the non-streaming upload returned.
+    The next chunk is only read once the previous batch is stored, which is
+    the backpressure that keeps memory flat. Batches already stored stay
+    stored if a later part of the file turns out to be invalid.
+    """
+
     target = service or rag_service
     base_title = Path(filename).stem or "Uploaded RAG reference"
-    if suffix == ".txt":
-        if not text.strip():
-            raise ValueError("Uploaded document is empty.")
-        doc_key = target.add_uploaded_document(
-            title=base_title,
-            content=text,
-            metadata={"source_filename": filename},
-        )
-        return [doc_key]
+    parser = JSONDocumentStream()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    summary: dict[str, object] = {"documents": [], "passages": 0, "batches": 0, "bytes": 0}
+    timings: dict[str, float] = {}
+    batch: list[dict[str, object]] = []
+
+    def ingest(documents: list[dict[str, object]]) -> None:
+        result = target.add_documents_bulk(documents, defer_index_save=True)
+        summary["documents"].extend(result["documents"])
+        summary["passages"] += result["passages"]
+        summary["batches"] += 1
+        for phase, elapsed in result["timings_ms"].items():
+            timings[phase] = round(timings.get(phase, 0.0) + elapsed, 3)
+
+    def progress() -> dict[str, object]:
+        return {
+            "event": "progress",
+            "bytes": summary["bytes"],
+            "total_bytes": upload.size,
+            "documents": len(summary["documents"]),
+            "batches": summary["batches"],
+        }
 
     try:
-        payload = json.loads(text)
-    except json.JSONDecodeError as exc:
-        raise ValueError("Uploaded JSON file is not valid.") from exc
-
-    documents = _parse_uploaded_json_documents(payload)
-    doc_keys: list[str] = []
-    for entry in documents:
-        normalized = _normalize_uploaded_entry(
-            entry,
-            fallback_title=base_title,
-            filename=filename,
-        )
-        doc_key = target.add_uploaded_document(
-            title=normalized["title"],
-            content=normalized["content"],
-            metadata=normalized["metadata"],
-        )
-        doc_keys.append(doc_key)
-    return doc_keys
+        while True:
+            chunk = await upload.read(chunk_bytes)
+            if not chunk and not summary["bytes"]:
+                raise ValueError("Uploaded file is empty.")
+            summary["bytes"] += len(chunk)
+            try:
+                text = decoder.decode(chunk, final=not chunk)
+            except UnicodeDecodeError as exc:
+                raise ValueError("Uploaded file must be UTF-8 encoded.") from exc
+            entries = parser.feed(text) if chunk else parser.close()
+            for entry in entries:
+                batch.append(_normalize_uploaded_entry(entry, fallback_title=base_title, filename=filename))
+                if len(batch) >= batch_documents:
+                    await run_in_threadpool(ingest, batch)
+                    batch = []
+                    yield progress()
+            if not chunk:
+                break
+        if batch:
+            await run_in_threadpool(ingest, batch)
+            yield progress()
+        if summary["batches"]:
+            # Every batch deferred its index save; the upload is only done
+            # once its vectors are on disk.
+            save_started = perf_counter()
+            await run_in_threadpool(target.save_index)
+            timings["save"] = round(timings.get("save", 0.0) + (perf_counter() - save_started) * 1000, 3)
+    except ValueError as exc:
+        stored = len(summary["documents"])
+        if stored:
+            raise ValueError(f"{exc} ({stored} document(s) before the error were stored.)") from exc
+        raise
+
+    doc_keys = summary["documents"]
+    if not doc_keys:
+        raise ValueError("Uploaded JSON file does not contain any documents.")
+    yield {
+        "event": "done",
+        "message": f"Uploaded {len(doc_keys)} RAG document(s).",
+        "documents": doc_keys,
+        "passages": summary["passages"],
+        "batches": summary["batches"],
+        "bytes": summary["bytes"],
+        "timings_ms": timings,
+    }
 
 
 @app.on_event("startup")
 async def _startup() -> None:
     monitor.start()
+    action_service.start()
+    rag_service.warm_up()
 
 
 @app.on_event("shutdown")
 async def _shutdown() -> None:
     monitor.stop()
+    if rag_service.loaded:
+        rag_service.stop_retention()
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
+def health() -> dict[str, object]:
+    # Liveness stays "ok" while the RAG corpus loads; clients that need
+    # search should wait for "ready".
+    rag_status = rag_service.status()
+    return {"status": "ok", "ready": rag_status["ready"], "rag": rag_status}
 
 
 @app.get("/state")
@@ -234,18 +306,124 @@ def get_state() -> dict[str, object]:
     return alert_service.get_state()
 
 
+@app.get("/analysis/stats")
+def get_analysis_stats() -> dict[str, object]:
+    return analysis_stats()
+
+
+_SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _sse_event(event: str, data: dict[str, object]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/reports/{report_id}/analysis/stream")
+async def stream_report_analysis(report_id: str) -> StreamingResponse:
+    # Server-Sent Events: "partial" snapshots of the fields the model has
+    # written so far, "fallback" when the deterministic report went out
+    # first, then one "complete" with the final analysis.
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    stream = analysis_streams.get(report_id)
+    if stream is None:
+        with STATE_LOCK:
+            report = next(
+                (
+                    candidate
+                    for candidate in (STATE.last_report, *STATE.pending_reports)
+                    if candidate is not None and candidate.id == report_id
+                ),
+                None,
+            )
+            stored = report and {
+                "summary": report.summary,
+                "root_cause": report.root_cause,
+                "impact": report.impact,
+                "action_plan": list(report.action_items),
+                "follow_up": list(report.follow_up),
+                "report_text": report.report_body,
+                "source": "stored",
+            }
+        if not stored:
+            raise HTTPException(status_code=404, detail="Report not found.")
+
+        async def replay() -> AsyncIterator[str]:
+            yield _sse_event(COMPLETE, stored)
+
+        return StreamingResponse(replay(), media_type="text/event-stream", headers=headers)
+
+    queue = stream.subscribe()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), _SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse_event(event, data)
+                if event == COMPLETE:
+                    return
+        finally:
+            stream.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+
 @app.get("/rag/documents")
 def get_rag_documents() -> dict[str, object]:
     return {"documents": rag_service.list_documents()}
 
 
-@app.post("/rag/upload")
-async def upload_rag_document(file: UploadFile = File(...)) -> dict[str, object]:
+@app.get("/rag/stats")
+def get_rag_stats() -> dict[str, object]:
+    return rag_service.stats()
+
+
+@app.get("/rag/retention")
+def get_rag_retention(sample: int = 50) -> dict[str, object]:
+    # Dry run: reports what the configured policy would evict.
+    return rag_service.retention_report(sample=sample)
+
+
+@app.post("/rag/retention/apply")
+def apply_rag_retention() -> dict[str, object]:
+    return rag_service.apply_retention()
+
+
+@app.post("/rag/upload", response_model=None)
+async def upload_rag_document(
+    file: UploadFile = File(...),
+    stream: bool = False,
+) -> dict[str, object] | StreamingResponse:
     filename = file.filename or "upload"
     suffix = Path(filename).suffix.lower()
     if suffix not in ALLOWED_RAG_UPLOAD_SUFFIXES:
         raise HTTPException(status_code=400, detail="Only .json or .txt files are supported.")
 
+    if suffix == ".json":
+        events = _stream_rag_upload(file, filename)
+        if stream:
+            # One JSON object per line: progress events, then done or error.
+            async def ndjson() -> AsyncIterator[str]:
+                try:
+                    async for event in events:
+                        yield json.dumps(event, ensure_ascii=False) + "\n"
+                except ValueError as exc:
+                    yield json.dumps({"event": "error", "detail": str(exc)}, ensure_ascii=False) + "\n"
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+        try:
+            async for event in events:
+                final = event
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {
+            key: final[key]
+            for key in ("message", "documents", "passages", "batches", "timings_ms")
+        }
+
     raw_bytes = await file.read()
     if not raw_bytes:
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
@@ -256,13 +434,15 @@ async def upload_rag_document(file: UploadFile = File(...)) -> dict[str, object]
         raise HTTPException(status_code=400, detail="Uploaded file must be UTF-8 encoded.") from exc
 
     try:
-        doc_keys = _ingest_rag_upload(filename, suffix, decoded)
+        result = await run_in_threadpool(_ingest_rag_text_upload, filename, decoded)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+    doc_keys = result["documents"]
     return {
         "message": f"Uploaded {len(doc_keys)} RAG document(s).",
         "documents": doc_keys,
+        "timings_ms": result["timings_ms"],
     }
 
 
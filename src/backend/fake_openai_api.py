@@ -0,0 +1,529 @@
+"""OpenAI-compatible stub of the chat-completions and embeddings APIs for offline load tests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
+from threading import Lock
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.backend.rag_embeddings import HashingEmbeddings
+
+try:  # Optional: decodes token-id embedding inputs back to text
+    import tiktoken
+except ImportError:  # pragma: no cover - fallback when dependencies missing
+    tiktoken = None  # type: ignore[assignment]
+
+# Characters per simulated token, for streaming chunks and usage counts.
+_CHARS_PER_TOKEN = 4
+_LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+# z-score of the 99th percentile of a standard normal distribution.
+_Z99 = 2.3263
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Delay distribution in milliseconds parsed from a spec string.
+
+    ``fixed:200``, ``uniform:100-400``, ``normal:300,50`` (mean, stddev) and
+    ``lognormal:300,1500`` (median, p99) are understood; a bare number is
+    a fixed delay. Lognormal delays are the realistic choice for model
+    latency, whose tail is much longer than its median.
+    """
+
+    distribution: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        name, _, params = spec.strip().partition(":")
+        if not params:
+            name, params = "fixed", name
+        name = name.lower()
+        if name not in _LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{name}'")
+        values = [float(value) for value in re.split(r"[-,]", params) if value.strip()]
+        if name == "fixed":
+            if len(values) != 1:
+                raise ValueError(f"Expected fixed:<ms>, got '{spec}'")
+            return cls(name, max(0.0, values[0]))
+        if len(values) != 2 or min(values) < 0:
+            raise ValueError(f"Expected {name}:<a>,<b> with non-negative values, got '{spec}'")
+        if name == "lognormal" and (values[0] <= 0 or values[1] < values[0]):
+            raise ValueError(f"Expected lognormal:<median>,<p99> with 0 < median <= p99, got '{spec}'")
+        return cls(name, values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            return rng.uniform(min(self.a, self.b), max(self.a, self.b))
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(self.a, self.b))
+        if self.distribution == "lognormal":
+            sigma = math.log(self.b / self.a) / _Z99
+            return rng.lognormvariate(math.log(self.a), sigma)
+        return self.a
+
+    def __str__(self) -> str:
+        if self.distribution == "fixed":
+            return f"fixed:{self.a:g}"
+        separator = "-" if self.distribution == "uniform" else ","
+        return f"{self.distribution}:{self.a:g}{separator}{self.b:g}"
+
+
+@dataclass
+class StubSettings:
+    """Behaviour of the stub; every field can be changed at runtime via ``PUT /stub/settings``.
+
+    ``first_token`` is the delay before a completion's first byte,
+    ``tokens_per_second`` paces the rest of the answer (0 sends it at
+    once) and ``embedding_latency`` delays each embeddings call. A
+    request fails with a random status from ``error_statuses`` with
+    probability ``error_rate``; a streamed answer is cut off midway with
+    probability ``stream_abort_rate``. When tools are offered, the first
+    model turn calls one of them unless ``tool_calls`` is off.
+    """
+
+    first_token: Latency = field(default_factory=lambda: Latency.parse("lognormal:400,1500"))
+    tokens_per_second: float = 60.0
+    embedding_latency: Latency = field(default_factory=lambda: Latency.parse("fixed:30"))
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 500, 503)
+    stream_abort_rate: float = 0.0
+    tool_calls: bool = True
+    dimensions: int = 1536
+    seed: Optional[int] = None
+
+    def update(self, values: Dict[str, object]) -> None:
+        known = {item.name for item in fields(self)}
+        unknown = sorted(set(values) - known)
+        if unknown:
+            raise ValueError(f"Unknown stub setting(s): {', '.join(unknown)}")
+        # Validate everything first so a bad value leaves the settings untouched.
+        parsed: Dict[str, object] = {}
+        for name, value in values.items():
+            if name in ("first_token", "embedding_latency"):
+                value = Latency.parse(str(value))
+            elif name == "error_statuses":
+                value = tuple(int(status) for status in value)  # type: ignore[union-attr]
+                if not value or any(status < 400 or status > 599 for status in value):
+                    raise ValueError("error_statuses must be HTTP error codes")
+            elif name in ("tokens_per_second", "error_rate", "stream_abort_rate"):
+                value = float(value)  # type: ignore[arg-type]
+                if value < 0 or (name != "tokens_per_second" and value > 1):
+                    raise ValueError(f"{name} is out of range")
+            elif name == "dimensions":
+                value = max(1, int(value))  # type: ignore[arg-type]
+            elif name == "seed":
+                value = None if value is None else int(value)  # type: ignore[arg-type]
+            else:
+                value = bool(value)
+            parsed[name] = value
+        for name, value in parsed.items():
+            setattr(self, name, value)
+
+    def describe(self) -> Dict[str, object]:
+        values = asdict(self)
+        values["first_token"] = str(self.first_token)
+        values["embedding_latency"] = str(self.embedding_latency)
+        values["error_statuses"] = list(self.error_statuses)
+        return values
+
+
+class StreamAborted(Exception):
+    """Raised inside a streamed answer so the server drops the connection mid-response."""
+
+
+class _QuietAborts(logging.Filter):
+    # uvicorn logs the traceback of every exception raised by an app;
+    # injected aborts are expected, so only the client should notice them.
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not (record.exc_info and isinstance(record.exc_info[1], StreamAborted))
+
+
+class _StubStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counts: Dict[str, int] = {}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+# --------------------------------------------------------------------------- #
+# Canned analyses
+# --------------------------------------------------------------------------- #
+
+
+def _prompt_line(prompt: str, label: str) -> str:
+    match = re.search(rf"^\s*{re.escape(label)}:\s*(.+)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else ""
+
+
+def _prompt_items(prompt: str, heading: str) -> List[str]:
+    match = re.search(rf"^\s*{re.escape(heading)}:\s*\n((?:\s*- .*\n?)+)", prompt, re.MULTILINE)
+    if not match:
+        return []
+    items = [line.strip()[2:].strip() for line in match.group(1).splitlines()]
+    return [item for item in items if item and item != "(none)"]
+
+
+def _tool_actions(tool_outputs: Sequence[str]) -> List[str]:
+    """Actions listed by the RAG lookup tool (``    · action`` or ``- action`` lines)."""
+
+    actions: List[str] = []
+    for output in tool_outputs:
+        for line in output.splitlines():
+            stripped = line.strip()
+            if stripped.startswith("· "):
+                actions.append(stripped[2:].strip())
+            elif stripped.startswith("- ") and not stripped.startswith("- ["):
+                actions.append(stripped[2:].strip())
+    return actions
+
+
+def canned_analysis(prompt: str, tool_outputs: Sequence[str] = ()) -> Dict[str, object]:
+    """Analysis in the ``SYSTEM_PROMPT`` JSON schema built from the incident prompt.
+
+    Reads the title, metrics, hypotheses and playbook the analysis module
+    writes into the user prompt, so answers differ per scenario the way a
+    model's would; actions returned by the RAG tool are listed first.
+    """
+
+    title = _prompt_line(prompt, "Incident Title") or "알 수 없는 사고"
+    http = _prompt_line(prompt, "HTTP Error Rate")
+    cpu = _prompt_line(prompt, "CPU Usage")
+    hypotheses = _prompt_items(prompt, "Hypotheses")
+    playbook = _prompt_items(prompt, "Recommended Actions (playbook)")
+
+    metrics = ", ".join(part for part in (f"HTTP 오류율 {http}" if http else "", f"CPU 사용률 {cpu}" if cpu else "") if part)
+    summary = f"'{title}' 사고가 감지되었습니다."
+    if metrics:
+        summary += f" {metrics}로 임계치를 초과했습니다."
+    root_cause = f"{hypotheses[0]} (추정)" if hypotheses else "근본 원인을 특정할 근거가 부족합니다 (추정)."
+
+    action_plan: List[str] = []
+    for action, reason in [(item, "과거 승인된 유사 조치") for item in _tool_actions(tool_outputs)] + [
+        (item, "플레이북 권장 조치") for item in playbook
+    ]:
+        entry = f"{action} (사유: {reason})"
+        if action and all(not existing.startswith(action) for existing in action_plan):
+            action_plan.append(entry)
+    if not action_plan:
+        action_plan = ["최근 배포와 메트릭 변화를 교차 확인합니다 (사유: 원인 범위 축소)."]
+
+    return {
+        "summary": summary,
+        "root_cause": root_cause,
+        "impact": f"'{title}' 영향으로 일부 요청이 실패하거나 지연되었을 가능성이 있습니다.",
+        "action_plan": action_plan[:5],
+        "follow_up": ["사후 분석에서 탐지 임계치와 알림 경로를 점검합니다."],
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Wire format helpers
+# --------------------------------------------------------------------------- #
+
+
+def _message_text(message: Dict[str, object]) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return ""
+
+
+def _tool_call(request: Dict[str, object], prompt: str) -> Optional[Dict[str, object]]:
+    """Call the chosen (or first) offered function, filling its first string parameter."""
+
+    tools = [tool for tool in request.get("tools") or [] if isinstance(tool, dict) and tool.get("type") == "function"]
+    choice = request.get("tool_choice")
+    if not tools or choice == "none":
+        return None
+    function = tools[0]["function"]
+    if isinstance(choice, dict):
+        wanted = (choice.get("function") or {}).get("name")
+        function = next((tool["function"] for tool in tools if tool["function"].get("name") == wanted), function)
+    parameters = function.get("parameters") or {}
+    properties = parameters.get("properties") or {}
+    required = parameters.get("required") or list(properties)
+    query = f"{_prompt_line(prompt, 'Incident Title') or prompt[:80]} 과거 조치"
+    arguments = {name: query for name in required if (properties.get(name) or {}).get("type", "string") == "string"}
+    return {
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {"name": function.get("name", ""), "arguments": json.dumps(arguments, ensure_ascii=False)},
+    }
+
+
+def _plan_reply(request: Dict[str, object], settings: StubSettings) -> Tuple[str, Optional[Dict[str, object]]]:
+    """Answer text or a tool call for the conversation so far."""
+
+    messages = [message for message in request.get("messages") or [] if isinstance(message, dict)]
+    prompt = "\n".join(_message_text(message) for message in messages if message.get("role") in ("system", "user"))
+    tool_outputs = [_message_text(message) for message in messages if message.get("role") == "tool"]
+    if settings.tool_calls and not tool_outputs:
+        call = _tool_call(request, prompt)
+        if call is not None:
+            return "", call
+    return json.dumps(canned_analysis(prompt, tool_outputs), ensure_ascii=False), None
+
+
+def _tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / _CHARS_PER_TOKEN)) if text else 0
+
+
+def _usage(request: Dict[str, object], completion: str) -> Dict[str, int]:
+    prompt_tokens = sum(
+        _tokens(_message_text(message)) for message in request.get("messages") or [] if isinstance(message, dict)
+    )
+    completion_tokens = _tokens(completion)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _error(status: int, message: str, error_type: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": message, "type": error_type, "param": None, "code": None}},
+    )
+
+
+_INJECTED_ERRORS = {
+    429: ("Rate limit reached (injected by the stub).", "rate_limit_exceeded"),
+    500: ("The server had an error (injected by the stub).", "server_error"),
+    503: ("The engine is currently overloaded (injected by the stub).", "server_error"),
+}
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # pragma: no cover - encoding files unavailable offline
+        return None
+
+
+def _decode_input(value: object) -> List[str]:
+    """Embedding inputs as text; token-id arrays are decoded with tiktoken when available."""
+
+    items = value if isinstance(value, list) and value and not isinstance(value[0], int) else [value]
+    texts: List[str] = []
+    for item in items:
+        if isinstance(item, str):
+            texts.append(item)
+            continue
+        tokens = [int(token) for token in item or []]  # type: ignore[union-attr]
+        encoding = _token_encoding()
+        texts.append(encoding.decode(tokens) if encoding is not None else " ".join(str(token) for token in tokens))
+    return texts
+
+
+# --------------------------------------------------------------------------- #
+# App
+# --------------------------------------------------------------------------- #
+
+
+def build_fake_openai_app(settings: Optional[StubSettings] = None) -> FastAPI:
+    """FastAPI app serving ``/v1/chat/completions``, ``/v1/embeddings`` and ``/v1/models``.
+
+    Point ``ChatOpenAI``/``OpenAIEmbeddings`` at it with
+    ``OPENAI_BASE_URL=http://<host>:<port>/v1`` and any non-empty API key.
+    """
+
+    app = FastAPI(title="OpenAI Stub", version="1.0.0")
+    uvicorn_errors = logging.getLogger("uvicorn.error")
+    if not any(isinstance(item, _QuietAborts) for item in uvicorn_errors.filters):
+        uvicorn_errors.addFilter(_QuietAborts())
+    app.state.settings = settings or StubSettings()
+    app.state.rng = random.Random(app.state.settings.seed)
+    app.state.stats = _StubStats()
+    embedders: Dict[int, HashingEmbeddings] = {}
+
+    def current() -> StubSettings:
+        return app.state.settings
+
+    def rng() -> random.Random:
+        return app.state.rng
+
+    def injected_error(endpoint: str) -> Optional[JSONResponse]:
+        config = current()
+        if config.error_rate <= 0 or rng().random() >= config.error_rate:
+            return None
+        status = rng().choice(config.error_statuses)
+        app.state.stats.count(f"{endpoint}.errors")
+        message, error_type = _INJECTED_ERRORS.get(status, ("Injected failure.", "server_error"))
+        return _error(status, message, error_type)
+
+    def answer_delay(text: str) -> float:
+        rate = current().tokens_per_second
+        return _tokens(text) / rate if rate > 0 else 0.0
+
+    @app.get("/health")
+    def health() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/stub/settings")
+    def get_settings() -> Dict[str, object]:
+        return current().describe()
+
+    @app.put("/stub/settings")
+    async def put_settings(request: Request) -> JSONResponse:
+        try:
+            payload = await request.json()
+            if not isinstance(payload, dict):
+                raise ValueError("Expected a JSON object")
+            current().update(payload)
+        except (TypeError, ValueError) as exc:
+            return _error(400, str(exc), "invalid_request_error")
+        if "seed" in payload:
+            app.state.rng = random.Random(current().seed)
+        return JSONResponse(current().describe())
+
+    @app.get("/stub/stats")
+    def get_stats() -> Dict[str, int]:
+        return app.state.stats.snapshot()
+
+    @app.delete("/stub/stats")
+    def clear_stats() -> Dict[str, int]:
+        app.state.stats.clear()
+        return {}
+
+    @app.get("/v1/models")
+    def list_models() -> Dict[str, object]:
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "created": 0, "owned_by": "stub"}]}
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        payload = await request.json()
+        app.state.stats.count("embeddings.requests")
+        texts = _decode_input(payload.get("input"))
+        await asyncio.sleep(current().embedding_latency.sample(rng()) / 1000.0)
+        failure = injected_error("embeddings")
+        if failure is not None:
+            return failure
+        dimensions = int(payload.get("dimensions") or current().dimensions)
+        embedder = embedders.setdefault(dimensions, HashingEmbeddings(dim=dimensions))
+        vectors = embedder.embed_documents(texts)
+        app.state.stats.count("embeddings.inputs", len(texts))
+        tokens = sum(_tokens(text) for text in texts)
+        return {
+            "object": "list",
+            "data": [{"object": "embedding", "index": index, "embedding": vector} for index, vector in enumerate(vectors)],
+            "model": payload.get("model", "stub"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        app.state.stats.count("chat.requests")
+        await asyncio.sleep(current().first_token.sample(rng()) / 1000.0)
+        failure = injected_error("chat")
+        if failure is not None:
+            return failure
+        text, call = _plan_reply(payload, current())
+        app.state.stats.count("chat.tool_calls" if call else "chat.answers")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = str(payload.get("model") or "stub")
+        usage = _usage(payload, text or (call or {}).get("function", {}).get("arguments", ""))
+
+        if not payload.get("stream"):
+            await asyncio.sleep(answer_delay(text))
+            message: Dict[str, object] = {"role": "assistant", "content": text or None}
+            if call is not None:
+                message["tool_calls"] = [call]
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "message": message, "finish_reason": "tool_calls" if call else "stop", "logprobs": None}
+                ],
+                "usage": usage,
+            }
+
+        include_usage = bool((payload.get("stream_options") or {}).get("include_usage"))
+        abort = current().stream_abort_rate > 0 and rng().random() < current().stream_abort_rate
+        pause = 1.0 / current().tokens_per_second if current().tokens_per_second > 0 else 0.0
+
+        def chunk(delta: Dict[str, object], finish_reason: Optional[str] = None, **extra: object) -> str:
+            body = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason, "logprobs": None}],
+                **extra,
+            }
+            return f"data: {json.dumps(body, ensure_ascii=False)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            yield chunk({"role": "assistant", "content": ""})
+            if call is not None:
+                yield chunk(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": call["id"],
+                                "type": "function",
+                                "function": {"name": call["function"]["name"], "arguments": call["function"]["arguments"]},
+                            }
+                        ]
+                    }
+                )
+            pieces = [text[start : start + _CHARS_PER_TOKEN] for start in range(0, len(text), _CHARS_PER_TOKEN)]
+            for index, piece in enumerate(pieces):
+                if abort and index >= len(pieces) // 2:
+                    app.state.stats.count("chat.aborted_streams")
+                    # Drop the connection without a finish_reason or [DONE].
+                    raise StreamAborted(completion_id)
+                if pause:
+                    await asyncio.sleep(pause)
+                yield chunk({"content": piece})
+            yield chunk({}, "tool_calls" if call else "stop")
+            if include_usage:
+                body = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                }
+                yield f"data: {json.dumps(body)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
@@ -0,0 +1,297 @@
+"""Incremental parsing of JSON upload payloads and of streamed model output."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, List, Optional
+
+_NON_WHITESPACE = re.compile(r"[^ \t\r\n]")
+
+INVALID_JSON = "Uploaded JSON file is not valid."
+
+
+class JSONDocumentStream:
+    """Push parser returning upload documents as soon as each one is complete.
+
+    Accepts the same layouts as the upload endpoint always has: a top-level
+    array of objects, an object whose ``documents`` member is an array of
+    objects, or a single object. Array elements are decoded one at a time,
+    so only the element currently being read (plus the unread tail of the
+    last chunk) is held in memory. Top-level members other than a streamed
+    ``documents`` array are kept, since a single-object payload is itself
+    the document.
+    """
+
+    def __init__(self, *, max_document_chars: int = 64 * 1024 * 1024) -> None:
+        self._decoder = json.JSONDecoder()
+        self._max_document_chars = max_document_chars
+        self._buffer = ""
+        self._pos = 0
+        # Unparsed characters needed before retrying an incomplete value, so
+        # a value spanning many chunks is re-scanned O(log n) times, not O(n).
+        self._wait_for = 0
+        self._state = "start"
+        self._top_level_object = False
+        self._in_documents = False
+        self._key: Optional[str] = None
+        self._fields: Dict[str, object] = {}
+        self._streamed_documents = False
+        self.count = 0
+
+    def feed(self, text: str) -> List[Dict[str, object]]:
+        """Consume ``text`` and return the documents it completed."""
+
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        if len(self._buffer) < self._wait_for:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Dict[str, object]]:
+        """Finish the payload; raises ``ValueError`` if it is truncated or malformed."""
+
+        documents = self._parse(final=True)
+        if self._state != "end":
+            raise ValueError(INVALID_JSON)
+        if self._top_level_object and not self._streamed_documents:
+            documents.append(self._fields)
+            self.count += 1
+            self._fields = {}
+        return documents
+
+    # ------------------------------------------------------------------ #
+    # State machine
+    # ------------------------------------------------------------------ #
+
+    def _parse(self, *, final: bool) -> List[Dict[str, object]]:
+        documents: List[Dict[str, object]] = []
+        self._wait_for = 0
+        while True:
+            char = self._next_char()
+            if char is None:
+                return documents
+            state = self._state
+
+            if state == "start":
+                if char == "[":
+                    self._pos += 1
+                    self._state = "array_first"
+                elif char == "{":
+                    self._pos += 1
+                    self._top_level_object = True
+                    self._state = "object_first"
+                else:
+                    raise ValueError("Uploaded JSON must be an object or an array of objects.")
+
+            elif state in ("array_first", "array_next"):
+                if char == "]":
+                    self._pos += 1
+                    self._state = "object_next" if self._in_documents else "end"
+                    self._in_documents = False
+                elif state == "array_next":
+                    if char != ",":
+                        raise ValueError(INVALID_JSON)
+                    self._pos += 1
+                    self._state = "array_value"
+                else:
+                    self._state = "array_value"
+
+            elif state == "array_value":
+                parsed = self._decode_value(final)
+                if parsed is None:
+                    return documents
+                if not isinstance(parsed[0], dict):
+                    raise ValueError("Uploaded JSON documents must contain objects.")
+                documents.append(parsed[0])
+                self.count += 1
+                self._state = "array_next"
+
+            elif state in ("object_first", "object_next"):
+                if char == "}":
+                    self._pos += 1
+                    self._state = "end"
+                elif state == "object_next":
+                    if char != ",":
+                        raise ValueError(INVALID_JSON)
+                    self._pos += 1
+                    self._state = "object_key"
+                else:
+                    self._state = "object_key"
+
+            elif state == "object_key":
+                if char != '"':
+                    raise ValueError(INVALID_JSON)
+                parsed = self._decode_value(final)
+                if parsed is None:
+                    return documents
+                self._key = parsed[0]
+                self._state = "object_colon"
+
+            elif state == "object_colon":
+                if char != ":":
+                    raise ValueError(INVALID_JSON)
+                self._pos += 1
+                self._state = "object_value"
+
+            elif state == "object_value":
+                if self._key == "documents" and char == "[" and not self._streamed_documents:
+                    # Stream the documents array instead of decoding it whole.
+                    self._pos += 1
+                    self._streamed_documents = True
+                    self._in_documents = True
+                    self._fields = {}
+                    self._state = "array_first"
+                    continue
+                parsed = self._decode_value(final)
+                if parsed is None:
+                    return documents
+                if not self._streamed_documents:
+                    self._fields[self._key] = parsed[0]
+                self._state = "object_next"
+
+            else:  # "end": only trailing whitespace may follow
+                raise ValueError(INVALID_JSON)
+
+    def _next_char(self) -> Optional[str]:
+        match = _NON_WHITESPACE.search(self._buffer, self._pos)
+        if match is None:
+            self._pos = len(self._buffer)
+            return None
+        self._pos = match.start()
+        return self._buffer[self._pos]
+
+    def _decode_value(self, final: bool) -> Optional[tuple]:
+        """Decode the value at the cursor, or return ``None`` until more input arrives."""
+
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            value, end = None, -1
+        # A number (or literal) ending exactly at the buffer end may continue
+        # in the next chunk.
+        complete = end >= 0 and (final or end < len(self._buffer) or isinstance(value, (dict, list, str)))
+        if complete:
+            self._pos = end
+            return value, end
+        if final:
+            raise ValueError(INVALID_JSON)
+        pending = len(self._buffer) - self._pos
+        if pending > self._max_document_chars:
+            raise ValueError(f"Uploaded JSON document exceeds {self._max_document_chars} characters.")
+        self._wait_for = max(pending * 2, pending + 1)
+        return None
+
+
+class PartialJSONObject:
+    """Best-effort view of a JSON object that is still being generated.
+
+    Model output arrives a few characters at a time. :meth:`feed` advances
+    a small scanner over the new characters only, remembering which
+    containers are open and where the last complete member ended, so
+    :meth:`snapshot` can close the text at the current position (ending an
+    unfinished string, dropping an unfinished key or number) and decode it
+    in one ``json.loads`` call. Text before the first ``{`` (such as a
+    Markdown code fence) and after the matching ``}`` is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self._length = 0
+        self._started = False
+        self._closed = False
+        self._start = 0
+        self._end = 0
+        # One frame per open container: [bracket, state, cut]. ``cut`` is the
+        # offset to truncate to when the member in progress cannot be closed.
+        self._stack: List[List[object]] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape_at = -1
+        self._unicode_left = 0
+
+    def feed(self, text: str) -> None:
+        offset = self._length
+        self._chunks.append(text)
+        self._length += len(text)
+        if self._closed:
+            return
+        for index, char in enumerate(text, offset):
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._start = index
+                    self._stack.append(["{", "key", index + 1])
+                continue
+            if self._in_string:
+                self._scan_string(char, index)
+                continue
+            frame = self._stack[-1]
+            if char in " \t\r\n":
+                if frame[1] == "scalar":
+                    frame[1] = "after"
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = frame[0] == "{" and frame[1] == "key"
+                if not self._string_is_key:
+                    frame[1] = "string"
+            elif char in "{[":
+                frame[1] = "nested"
+                self._stack.append([char, "key" if char == "{" else "value", index + 1])
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._closed = True
+                    self._end = index + 1
+                    return
+                self._stack[-1][1] = "after"
+            elif char == ":":
+                frame[1] = "value"
+            elif char == ",":
+                frame[1] = "key" if frame[0] == "{" else "value"
+                frame[2] = index
+            elif frame[1] == "value":
+                frame[1] = "scalar"
+
+    def _scan_string(self, char: str, index: int) -> None:
+        if self._unicode_left:
+            self._unicode_left -= 1
+            if not self._unicode_left:
+                self._escape_at = -1
+        elif self._escape_at >= 0:
+            if char == "u":
+                self._unicode_left = 4
+            else:
+                self._escape_at = -1
+        elif char == "\\":
+            self._escape_at = index
+        elif char == '"':
+            self._in_string = False
+            frame = self._stack[-1]
+            frame[1] = "colon" if self._string_is_key else "after"
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return the members decoded so far; unfinished strings are cut short."""
+
+        if not self._started:
+            return {}
+        text = "".join(self._chunks)
+        self._chunks = [text]
+        if self._closed:
+            candidate = text[self._start : self._end]
+        else:
+            frame = self._stack[-1]
+            if self._in_string and not self._string_is_key:
+                end = self._escape_at if self._escape_at >= 0 else len(text)
+                candidate = text[self._start : end] + '"'
+            elif self._in_string or frame[1] in ("key", "colon", "value", "scalar"):
+                candidate = text[self._start : frame[2]]
+            else:
+                candidate = text[self._start :]
+            candidate += "".join("}" if open_frame[0] == "{" else "]" for open_frame in reversed(self._stack))
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError:
+            return {}
+        return value if isinstance(value, dict) else {}
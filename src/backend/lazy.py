@@ -0,0 +1,114 @@
+"""Deferred imports and lazily constructed singletons for fast backend startup."""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import sys
+from functools import lru_cache
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger("incident.startup")
+if not logger.handlers:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[incident.startup] %(message)s"))
+    logger.addHandler(handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def optional_import(module: str, attr: Optional[str] = None) -> Optional[object]:
+    """Import ``module`` (or ``module.attr``) on first use; ``None`` if it is not installed."""
+
+    try:
+        loaded = importlib.import_module(module)
+    except ImportError:
+        return None
+    return getattr(loaded, attr, None) if attr else loaded
+
+
+class LazyService(Generic[T]):
+    """Proxy that builds a shared service on first attribute access.
+
+    Importing a module that exposes the proxy costs nothing; the factory
+    runs either on first use or in :meth:`warm_up`'s background thread,
+    whichever comes first. Initializers registered before the service
+    exists run once, right after the factory, under the same lock.
+    """
+
+    def __init__(self, factory: Callable[[], T], *, name: str) -> None:
+        self._factory = factory
+        self._name = name
+        self._lock = Lock()
+        self._initializers: List[Callable[[T], None]] = []
+        self._instance: Optional[T] = None
+        self._state = "idle"
+        self._error: Optional[str] = None
+        self._load_ms: Optional[float] = None
+        self._thread: Optional[Thread] = None
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self.get(), name)
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def add_initializer(self, initializer: Callable[[T], None]) -> None:
+        with self._lock:
+            if self._instance is None:
+                self._initializers.append(initializer)
+                return
+        initializer(self._instance)
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                self._state = "loading"
+                started = perf_counter()
+                try:
+                    instance = self._factory()
+                    for initializer in self._initializers:
+                        initializer(instance)
+                except Exception as exc:
+                    self._state = "failed"
+                    self._error = str(exc) or type(exc).__name__
+                    raise
+                self._initializers.clear()
+                self._load_ms = round((perf_counter() - started) * 1000, 1)
+                self._instance = instance
+                self._state = "ready"
+                self._error = None
+                logger.info("%s ready in %.1f ms", self._name, self._load_ms)
+            return self._instance
+
+    def warm_up(self) -> Thread:
+        """Build the service in a daemon thread; failures are retried on next use."""
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._warm_up, name=f"{self._name}-warm-up", daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def _warm_up(self) -> None:
+        try:
+            self.get()
+        except Exception:
+            logger.exception("Failed to warm up %s", self._name)
+
+    def status(self) -> Dict[str, object]:
+        status: Dict[str, object] = {"state": self._state, "ready": self._instance is not None}
+        if self._load_ms is not None:
+            status["load_ms"] = self._load_ms
+        if self._error:
+            status["error"] = self._error
+        return status
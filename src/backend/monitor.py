@@ -5,13 +5,16 @@ from __future__ import annotations
 import threading
 import time
 import uuid
-from typing import List, Tuple
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
 
 from src.backend.actions import ActionExecutionService
-from src.backend.analysis import generate_incident_analysis
+from src.backend.analysis import start_incident_analysis
+from src.backend.analysis_stream import analysis_streams
 from src.backend.rag import rag_service
 from src.backend.services import AlertService, PrometheusService, SlackService
 from src.backend.state import STATE, STATE_LOCK, IncidentReport, MetricSample, make_sample
+from src.incident_console.config import get_analysis_deadline
 from src.incident_console.errors import IntegrationError
 from src.incident_console.models import AlertScenario
 from src.incident_console.utils import timestamp
@@ -136,10 +139,20 @@ class PrometheusMonitor:
             self._record_monitor_failure("No scenarios available to build incident report")
             return None
 
-        analysis = generate_incident_analysis(scenario, sample)
+        # The id is known before the analysis so the console can follow the
+        # model's output over /reports/{id}/analysis/stream. The fallback
+        # report goes out once the deadline passes; a late AI analysis
+        # upgrades it afterwards (see _apply_enrichment).
+        report_id = str(uuid.uuid4())
+        analysis, enrichment = start_incident_analysis(
+            scenario,
+            sample,
+            deadline=get_analysis_deadline(),
+            stream=analysis_streams.open(report_id, title=scenario.title, scenario_code=scenario.code),
+        )
         report_body = analysis["report_text"]
         report = IncidentReport(
-            id=str(uuid.uuid4()),
+            id=report_id,
             scenario_code=scenario.code,
             title=scenario.title,
             created_at=sample.timestamp,
@@ -150,6 +163,7 @@ class PrometheusMonitor:
             impact=analysis.get("impact", ""),
             action_items=list(analysis.get("action_plan", [])) or list(scenario.actions),
             follow_up=list(analysis.get("follow_up", [])),
+            analysis_status="pending" if enrichment is not None else "final",
         )
 
         self._action_service.queue_from_report(report)
@@ -168,8 +182,52 @@ class PrometheusMonitor:
                 if len(STATE.pending_reports) > 20:
                     STATE.pending_reports.pop(0)
 
+        if enrichment is not None:
+            enrichment.add_done_callback(
+                lambda done: self._apply_enrichment(scenario, report, done)
+            )
         return scenario.code
 
+    def _apply_enrichment(
+        self,
+        scenario: AlertScenario,
+        report: IncidentReport,
+        enrichment: Future,
+    ) -> None:
+        """Upgrade a fallback report in place once its AI analysis arrives."""
+
+        try:
+            analysis: Dict[str, object] | None = enrichment.result()
+        except Exception as exc:  # pragma: no cover - analysis guards its own errors
+            analysis = None
+            self._record_monitor_failure(f"Enriched analysis failed for {scenario.title}: {exc}")
+        if not analysis:
+            with STATE_LOCK:
+                report.analysis_status = "final"
+            self._record_monitor_failure(
+                f"AI analysis unavailable for {scenario.title}; the fallback report stands"
+            )
+            return
+
+        with STATE_LOCK:
+            report.analysis_status = "final"
+            report.report_body = analysis["report_text"]
+            report.summary = analysis.get("summary", "")
+            report.root_cause = analysis.get("root_cause", "")
+            report.impact = analysis.get("impact", "")
+            report.action_items = list(analysis.get("action_plan", [])) or list(scenario.actions)
+            report.follow_up = list(analysis.get("follow_up", []))
+        self._action_service.refresh_from_report(report)
+
+        message = f"[Enriched analysis] {report.title}\n\n{report.report_body}"
+        recipients_sent, recipients_missing = self._deliver_report(scenario, message)
+        with STATE_LOCK:
+            STATE.append_feed(
+                f"[{timestamp()}] Enriched AI analysis ready for {report.title} -> "
+                f"delivered=[{', '.join(recipients_sent) or 'none'}] "
+                f"missing=[{', '.join(recipients_missing) or 'none'}]"
+            )
+
     def _deliver_report(
         self,
         scenario: AlertScenario,
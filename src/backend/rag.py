@@ -1,30 +1,49 @@
-"""Lightweight RAG helper backed by FAISS and OpenAI embeddings."""
+"""Lightweight RAG helper backed by a pluggable vector index and OpenAI embeddings."""
 
 from __future__ import annotations
 
-import json
 import logging
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 import sys
-from threading import Lock
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from threading import Event, Lock, Thread, Timer
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
-from src.incident_console.config import get_openai_api_key
+from src.incident_console.config import (
+    get_openai_api_key,
+    get_openai_base_url,
+    get_rag_embeddings_backend,
+    get_rag_vector_engine,
+)
 from src.incident_console.models import AlertScenario
 from src.incident_console.utils import utcnow_iso
-from src.backend.text_utils import normalize_legacy_payload, normalize_legacy_text
+from src.backend.lazy import LazyService, optional_import
+from src.backend.rag_bundle import read_bundle, write_bundle
+from src.backend.rag_cache import MISSING, QueryCache, query_key
+from src.backend.rag_dedup import NearDuplicateIndex, simhash
+from src.backend.rag_embeddings import CachedEmbeddings, EmbeddingCache, HashingEmbeddings
+from src.backend.rag_index import MetadataIndex
+from src.backend.rag_lexical import BM25Index, reciprocal_rank_fusion
+from src.backend.rag_retention import RetentionPolicy, last_activity, plan_evictions
+from src.backend.rag_store import DocumentJournal, IndexGenerations
+from src.backend.rag_vectors import (
+    VectorIndex,
+    create_vector_index,
+    engine_available,
+    load_legacy_vectors,
+    load_vector_index,
+    vector_index_from_matrix,
+)
+from src.backend.rwlock import ReadWriteLock
+from src.backend.text_utils import TEXT_FIXUPS_VERSION, normalize_legacy_payload
 
-try:  # Optional dependencies are resolved at runtime
+if TYPE_CHECKING:
     from langchain_core.documents import Document
-    from langchain_community.vectorstores import FAISS
     from langchain_openai import OpenAIEmbeddings
-except ImportError:  # pragma: no cover - fallback when dependencies missing
-    Document = None  # type: ignore[assignment]
-    FAISS = None  # type: ignore[assignment]
-    OpenAIEmbeddings = None  # type: ignore[assignment]
 
-if TYPE_CHECKING:
     from src.backend.state import ActionExecution, IncidentReport
 
 logger = logging.getLogger("incident.rag")
@@ -35,201 +54,877 @@ if not logger.handlers:
 logger.setLevel(logging.INFO)
 logger.propagate = False
 
+# Machine-generated document types that repeat during flapping incidents.
+_DEDUP_TYPES = ("incident_report", "action_execution")
+# Merged doc_keys remembered per document so later recovery marks resolve;
+# recovery_history keeps one outcome per remembered execution plus the original.
+_MAX_DUPLICATE_KEYS = 50
+# Back-off before retrying a background index build that failed.
+_BUILD_RETRY_SECONDS = 30
+# Delay used to coalesce index saves after single-document writes.
+_INDEX_SAVE_DELAY = 1.0
+# Share of an approximate index evicted at once that warrants a rebuild,
+# since its trained lists and refine store keep the removed vectors' space.
+_RETENTION_REBUILD_RATIO = 0.25
+
 
 class RAGService:
-    """Persisted FAISS-backed document store tailored for incident actions."""
+    """Persisted vector-indexed document store tailored for incident actions."""
 
     def __init__(
         self,
         index_dir: Path,
         embedding_model: str = "text-embedding-3-small",
+        *,
+        embeddings: Optional[object] = None,
+        embedding_cache_size: int = 50_000,
+        embedding_batch_size: int = 256,
+        passage_chars: int = 1000,
+        passage_overlap: int = 200,
+        passages_per_parent: int = 2,
+        dedup_window: int = 200,
+        query_cache_size: int = 1024,
+        vector_engine: Optional[str] = None,
+        retention: Optional[RetentionPolicy] = None,
     ) -> None:
         self._index_dir = index_dir
         self._embedding_model = embedding_model
-        self._lock = Lock()
+        self._embeddings_override = embeddings
+        self._embedding_cache_size = embedding_cache_size
+        self._embedding_batch_size = max(1, embedding_batch_size)
+        self._passage_chars = passage_chars
+        self._passages_per_parent = max(1, passages_per_parent)
+        self._dedup_window = dedup_window
+        # LangChain is imported here rather than at module import so the
+        # backend can serve /health before it is loaded.
+        splitter_class = optional_import("langchain_text_splitters", "RecursiveCharacterTextSplitter")
+        self._splitter = (
+            splitter_class(chunk_size=passage_chars, chunk_overlap=passage_overlap)
+            if splitter_class is not None
+            else None
+        )
+        self._document_class = optional_import("langchain_core.documents", "Document")
+        # Searches and listings share the read side; mutations take the write
+        # side. Embedding calls happen outside the lock entirely.
+        self._lock = ReadWriteLock()
+        self._save_lock = Lock()
+        self._flush_lock = Lock()
+        self._flush_pending = False
         self._index_dir.mkdir(parents=True, exist_ok=True)
 
         self._metadata_path = self._index_dir / "documents.json"
+        self._journal = DocumentJournal(self._metadata_path)
+        self._compaction_thread: Optional[Thread] = None
         self._documents_by_key: Dict[str, Dict[str, object]] = {}
+        self._metadata_index = MetadataIndex()
+        self._lexical_index = BM25Index()
+        self._near_duplicates = NearDuplicateIndex()
+        # Merged doc_key -> the document it was folded into.
+        self._duplicate_aliases: Dict[str, str] = {}
+        self._duplicates_merged = 0
+        # Bumped on every change visible to searches; cached results are
+        # keyed by it so a mutation never has to walk the cache.
+        self._corpus_generation = 0
+        self._query_cache = QueryCache(max_entries=query_cache_size)
 
         self._embeddings: Optional[OpenAIEmbeddings] = None  # type: ignore[assignment]
-        self._vectorstore: Optional[FAISS] = None  # type: ignore[assignment]
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        # Set when no embeddings backend is configured; cleared by reset_embeddings.
+        self._embeddings_unavailable = False
+        # Identifies the model behind the live embeddings; an index built
+        # with a different one is rebuilt instead of loaded.
+        self._embedding_id = ""
+        self._vector_engine = self._resolve_vector_engine(vector_engine or get_rag_vector_engine())
+        self._vectors: Optional[VectorIndex] = None
+        # Set when the live vector index no longer matches the metadata; the
+        # background builder then prepares a new generation.
+        self._index_stale = False
+        self._generations = IndexGenerations(self._index_dir)
+        self._generation, self._index_path = self._generations.current()
+        self._min_build_generation = 0
+        self._builder_thread: Optional[Thread] = None
+        self._build_retry_at = 0.0
+
+        self._retention = retention if retention is not None else RetentionPolicy.from_env()
+        self._retention_stop = Event()
+        self._retention_thread: Optional[Thread] = None
+        self._last_retention: Optional[Dict[str, object]] = None
 
         self._load_documents()
-        # Try to eagerly load the FAISS index; falls back to lazy rebuild.
-        self._ensure_vectorstore(load_only=True)
+        # Try to eagerly load the vector index; falls back to lazy rebuild.
+        self._ensure_vectors(load_only=True)
+        if self._retention.enabled:
+            self._start_retention()
+
+    @staticmethod
+    def _resolve_vector_engine(engine: str) -> Optional[str]:
+        if engine_available(engine):
+            return engine
+        if engine_available("numpy"):
+            logger.warning("RAG vector engine %s unavailable; falling back to numpy.", engine)
+            return "numpy"
+        logger.warning("No RAG vector engine available; search is lexical only.")
+        return None
 
     # ------------------------------------------------------------------ #
     # Lifecycle helpers
     # ------------------------------------------------------------------ #
 
     def _load_documents(self) -> None:
-        if not self._metadata_path.exists():
-            self._documents_by_key = {}
-            return
-
-        changed = False
         try:
-            raw = json.loads(self._metadata_path.read_text(encoding="utf-8"))
-            if isinstance(raw, list):
-                for entry in raw:
-                    key = entry.get("doc_key")
-                    if isinstance(key, str):
-                        normalized = normalize_legacy_payload(entry)
-                        if normalized != entry:
-                            changed = True
-                        self._documents_by_key[key] = normalized
+            loaded = self._journal.load()
         except Exception:  # pragma: no cover - corrupted metadata guard
             logger.exception("Failed to load persisted RAG metadata; starting empty.")
             self._documents_by_key = {}
             return
 
-        if changed:
-            self._persist_documents()
+        changed: List[Dict[str, object]] = []
+        migrated = self._journal.migrations.get("text_fixups") == TEXT_FIXUPS_VERSION
+        if migrated:
+            self._documents_by_key = loaded
+        else:
+            # One-time walk for corpora written before the current fixups;
+            # entries added since are normalised by _prepare_entry.
+            for key, entry in loaded.items():
+                normalized = normalize_legacy_payload(entry)
+                if normalized is not entry:
+                    changed.append(normalized)
+                self._documents_by_key[key] = normalized
+            self._journal.mark_migrated("text_fixups", TEXT_FIXUPS_VERSION)
+
+        with self._lock.write():
+            self._index_corpus()
+            self._persist_entries(changed)
+            if not migrated and self._documents_by_key:
+                # Persist the marker so the next start skips the walk.
+                self._schedule_compaction()
+
+    def _index_corpus(self) -> None:
+        """Rebuild the lookup indexes from ``_documents_by_key``. Caller holds the write lock."""
+
+        self._metadata_index.rebuild(self._documents_by_key.values())
+        self._lexical_index = BM25Index()
+        self._near_duplicates = NearDuplicateIndex()
+        self._duplicate_aliases = {}
+        for key, entry in self._documents_by_key.items():
+            self._register_aliases(key, entry)
+        self._lexical_index.add_many(
+            (key, entry["content"])
+            for key, entry in self._documents_by_key.items()
+            if isinstance(entry.get("content"), str) and not self._is_passage_parent(entry)
+        )
+
+    def _persist_entry(self, entry: Dict[str, object]) -> None:
+        """Journal a single document mutation. Caller must hold the write lock."""
 
-    def _persist_documents(self) -> None:
-        data = list(self._documents_by_key.values())
+        self._persist_entries([entry])
+
+    def _persist_entries(self, entries: Sequence[Dict[str, object]]) -> None:
+        """Journal document mutations in one write. Caller must hold the write lock."""
+
+        if not entries:
+            return
         try:
-            self._metadata_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            self._journal.put_many(entries)
         except Exception:  # pragma: no cover - defensive guard
-            logger.exception("Failed to persist RAG metadata to %s", self._metadata_path)
+            logger.exception("Failed to journal %d RAG document(s)", len(entries))
+            return
+        self._maybe_schedule_compaction()
+
+    def _maybe_schedule_compaction(self) -> None:
+        if self._journal.needs_compaction():
+            self._schedule_compaction()
+
+    def _schedule_compaction(self) -> None:
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+
+        # Entries are replaced rather than mutated, so a shallow copy is a
+        # consistent view of the corpus at the current journal sequence.
+        entries = list(self._documents_by_key.values())
+        seq = self._journal.seq
+        self._compaction_thread = Thread(
+            target=self._run_compaction,
+            args=(entries, seq),
+            name="RAGCompaction",
+            daemon=True,
+        )
+        self._compaction_thread.start()
+
+    def _run_compaction(self, entries: List[Dict[str, object]], seq: int) -> None:
+        try:
+            self._journal.compact(entries, seq)
+            logger.info("Compacted RAG journal into snapshot (%d document(s)).", len(entries))
+        except Exception:  # pragma: no cover - persistence guard
+            logger.exception("Failed to compact RAG journal into %s", self._metadata_path)
+
+    def compact_documents(self) -> None:
+        """Synchronously fold the journal into a fresh ``documents.json`` snapshot."""
+
+        with self._lock.read():
+            entries = list(self._documents_by_key.values())
+            seq = self._journal.seq
+        thread = self._compaction_thread
+        if thread is not None and thread.is_alive():
+            thread.join()
+        self._run_compaction(entries, seq)
 
     def _get_embeddings(self) -> Optional[OpenAIEmbeddings]:  # type: ignore[override]
-        if OpenAIEmbeddings is None:
-            return None
         if self._embeddings is not None:
             return self._embeddings
+        if self._embeddings_unavailable:
+            return None
+
+        if self._embeddings_override is not None:
+            base = self._embeddings_override
+            self._embedding_id = getattr(base, "model_name", None) or type(base).__name__
+        else:
+            backend = get_rag_embeddings_backend()
+            api_key = get_openai_api_key()
+            if backend == "local" or (backend == "auto" and not api_key):
+                try:
+                    base = HashingEmbeddings()
+                except Exception:  # pragma: no cover - numpy missing guard
+                    logger.exception("Failed to initialise local RAG embeddings.")
+                    self._embeddings_unavailable = True
+                    return None
+                self._embedding_id = base.model_name
+            else:
+                base = self._build_openai_embeddings(api_key)
+                if base is None:
+                    self._embeddings_unavailable = True
+                    return None
+                self._embedding_id = self._embedding_model
+
+        if isinstance(base, HashingEmbeddings):
+            # Local vectors are cheaper to recompute than to look up.
+            self._embeddings = base
+            return self._embeddings
+        cache = self._get_embedding_cache()
+        self._embeddings = CachedEmbeddings(base, cache) if cache is not None else base
+        return self._embeddings
 
-        api_key = get_openai_api_key()
+    def _build_openai_embeddings(self, api_key: Optional[str]) -> Optional[OpenAIEmbeddings]:  # type: ignore[override]
         if not api_key:
             logger.info("Skipping RAG embeddings setup (OPENAI_API_KEY missing).")
             return None
+        embeddings_class = optional_import("langchain_openai", "OpenAIEmbeddings")
+        if embeddings_class is None:
+            return None
 
         try:
-            self._embeddings = OpenAIEmbeddings(
+            return embeddings_class(
                 model=self._embedding_model,
                 openai_api_key=api_key,
+                # Compatible servers (e.g. the offline stub) take raw text; token
+                # arrays would need tiktoken's encoding files, fetched online.
+                check_embedding_ctx_length=get_openai_base_url() is None,
             )
         except Exception:  # pragma: no cover - API/SDK failure guard
             logger.exception("Failed to initialise OpenAI embeddings for RAG.")
-            self._embeddings = None
-        return self._embeddings
-
-    def _ensure_vectorstore(self, load_only: bool = False) -> Optional[FAISS]:  # type: ignore[override]
-        if FAISS is None:
             return None
 
-        if self._vectorstore is not None:
-            return self._vectorstore
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        if self._embedding_cache is None or self._embedding_cache.model != self._embedding_id:
+            try:
+                self._embedding_cache = EmbeddingCache(
+                    self._index_dir / "embedding_cache",
+                    self._embedding_id,
+                    max_entries=self._embedding_cache_size,
+                )
+            except Exception:  # pragma: no cover - numpy missing / unreadable cache
+                logger.exception("RAG embedding cache unavailable; embedding without cache.")
+                return None
+        return self._embedding_cache
+
+    def _ensure_vectors(self, load_only: bool = False) -> Optional[VectorIndex]:
+        """Return the live vector index, loading it or scheduling a background build.
+
+        Never embeds the corpus itself: until a build is swapped in, callers
+        get the previous generation, or ``None`` (lexical-only search) when
+        there is none. Caller holds the lock.
+        """
+
+        if self._vector_engine is None:
+            return None
+        if self._vectors is None and not self._index_stale:
+            self._load_vectors()
+        if not load_only and (self._vectors is None or self._index_stale):
+            self._schedule_index_build()
+        return self._vectors
 
+    def _load_vectors(self) -> None:
         embeddings = self._get_embeddings()
         if embeddings is None:
+            return
+        generation, path = self._generations.current()
+        if self._read_index_embedding_id(path) not in ("", self._embedding_id):
+            logger.info("Persisted vector index uses different embeddings; rebuilding.")
+            self._index_stale = True
+            return
+        imported = False
+        try:
+            vectors = load_vector_index(path)
+            if vectors is None:
+                vectors = self._import_legacy_index(path)
+                imported = vectors is not None
+        except Exception:  # pragma: no cover - corrupted index guard
+            logger.exception("Failed to load vector index, rebuilding from metadata.")
+            self._index_stale = True
+            return
+        if vectors is None:
+            return
+        if vectors.engine != self._vector_engine:
+            logger.info("Persisted vector index uses the %s engine; rebuilding for %s.", vectors.engine, self._vector_engine)
+            self._index_stale = True
+            return
+        logger.info("Loaded RAG %s index generation %d from %s", vectors.engine, generation, path)
+        missing = self._reconcile_vectors(vectors)
+        self._vectors = vectors
+        self._index_path = path
+        self._generation = generation
+        self._invalidate_queries()
+        if imported:
+            self._save_vectors()
+        if missing:
+            logger.info("%d document(s) missing from the vector index; rebuilding.", len(missing))
+            self._index_stale = True
+
+    def _import_legacy_index(self, path: Path) -> Optional[VectorIndex]:
+        """Convert a langchain ``save_local`` directory from older releases."""
+
+        legacy = load_legacy_vectors(path)
+        if legacy is None:
             return None
+        keys, matrix = legacy
+        vectors = create_vector_index(self._vector_engine, int(matrix.shape[1]))
+        if keys:
+            vectors.add(keys, matrix)
+        logger.info("Imported %d vector(s) from the legacy FAISS index in %s.", len(keys), path)
+        return vectors
 
-        index_file = self._index_dir / "index.faiss"
-        if index_file.exists():
-            try:
-                self._vectorstore = FAISS.load_local(
-                    str(self._index_dir),
-                    embeddings,
-                    allow_dangerous_deserialization=True,
-                )
-                logger.info("Loaded existing RAG FAISS index from %s", self._index_dir)
-            except Exception:  # pragma: no cover - corrupted index guard
-                logger.exception("Failed to load FAISS index, rebuilding from metadata.")
-                self._vectorstore = None
-
-        if self._vectorstore is None and not load_only:
-            documents = [
-                self._to_document(entry)
-                for entry in self._documents_by_key.values()
-                if self._to_document(entry) is not None
-            ]
-            if documents:
-                self._vectorstore = FAISS.from_documents(documents, embeddings)
-                self._save_vectorstore()
-                logger.info("Rebuilt RAG FAISS index with %d document(s).", len(documents))
+    def _mark_index_stale(self) -> None:
+        """Keep serving the current index but rebuild it in the background."""
+
+        self._index_stale = True
+        self._schedule_index_build()
 
-        return self._vectorstore
+    def _ensure_indexed(self, doc_key: str) -> None:
+        """Rebuild in the background if ``doc_key`` never made it into the live index."""
 
-    def _save_vectorstore(self) -> None:
-        if self._vectorstore is None:
+        if self._vectors is not None and doc_key not in self._vectors:
+            self._mark_index_stale()
+
+    def _schedule_index_build(self) -> None:
+        """Start the background builder unless it is running. Caller holds the lock."""
+
+        thread = self._builder_thread
+        if thread is not None and thread.is_alive():
+            return
+        if not len(self._lexical_index) or monotonic() < self._build_retry_at:
+            return
+        if self._get_embeddings() is None:
             return
+        self._builder_thread = Thread(target=self._build_index, name="RAGIndexBuilder", daemon=True)
+        self._builder_thread.start()
+
+    def _build_index(self) -> None:
+        """Embed the corpus into a new generation directory, then swap it in."""
+
+        with self._lock.read():
+            embeddings = self._embeddings
+            embedding_id = self._embedding_id
+            keys, texts = self._vector_inputs(list(self._documents_by_key.values()))
+            generation = self._generations.next_generation()
+        path = self._generations.path_for(generation)
+
+        started = monotonic()
         try:
-            self._vectorstore.save_local(str(self._index_dir))
-        except Exception:  # pragma: no cover - persistence guard
-            logger.exception("Failed to persist FAISS index to %s", self._index_dir)
+            matrix = self._embed_in_batches(embeddings, texts)
+            dim = len(matrix[0]) if matrix else len(embeddings.embed_query("dimension probe"))
+            vectors = create_vector_index(self._vector_engine, dim)
+            if keys:
+                vectors.add(keys, matrix)
+            vectors.save(path)
+            (path / "index.embedding").write_text(embedding_id, encoding="utf-8")
+        except Exception:  # pragma: no cover - embedding/API failure guard
+            logger.exception("Background vector index build failed; retrying in %ds.", _BUILD_RETRY_SECONDS)
+            self._generations.discard(generation)
+            with self._lock.write():
+                self._build_retry_at = monotonic() + _BUILD_RETRY_SECONDS
+            return
+
+        with self._lock.write():
+            if embeddings is not self._embeddings or embedding_id != self._embedding_id:
+                logger.info("Embeddings changed during index build; discarding generation %d.", generation)
+                self._generations.discard(generation)
+                return
+            if generation < self._min_build_generation:
+                # A bundle import replaced the corpus meanwhile; this index
+                # embedded the old one.
+                logger.info("Index generation %d superseded during build; discarding it.", generation)
+                self._generations.discard(generation)
+                self._builder_thread = None
+                if self._index_stale:
+                    self._schedule_index_build()
+                return
+            # Catch up with writes that landed while the corpus was embedded.
+            missing = self._reconcile_vectors(vectors)
+            self._vectors = vectors
+            self._index_path = path
+            self._generation = generation
+            self._index_stale = False
+            self._invalidate_queries()
+            if self._index_vectors(missing):
+                self._save_vectors()
+            self._generations.publish(generation)
+        logger.info(
+            "Built RAG %s index generation %d with %d document(s) in %.1fs.",
+            vectors.engine,
+            generation,
+            len(vectors),
+            monotonic() - started,
+        )
+
+    def wait_for_index(self, timeout: Optional[float] = None) -> bool:
+        """Block until a pending background build finishes; True if the index is current."""
+
+        with self._lock.write():
+            self._ensure_vectors()
+            thread = self._builder_thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._lock.read():
+            return self._vectors is not None and not self._index_stale
+
+    def _embed_in_batches(
+        self,
+        embeddings: object,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+    ) -> List[List[float]]:
+        """Embed ``texts`` in requests of at most ``batch_size`` documents."""
+
+        vectors: List[List[float]] = []
+        batch_size = max(1, batch_size or self._embedding_batch_size)
+        for start in range(0, len(texts), batch_size):
+            vectors.extend(embeddings.embed_documents(texts[start : start + batch_size]))
+        return vectors
+
+    def _vector_inputs(self, entries: Iterable[Dict[str, object]]) -> Tuple[List[str], List[str]]:
+        """doc_keys and texts of the entries that get a vector (passage parents do not)."""
+
+        keys: List[str] = []
+        texts: List[str] = []
+        for entry in entries:
+            content = entry.get("content")
+            if isinstance(content, str) and not self._is_passage_parent(entry):
+                keys.append(entry["doc_key"])
+                texts.append(content)
+        return keys, texts
+
+    def _reconcile_vectors(self, vectors: VectorIndex) -> List[Dict[str, object]]:
+        """Drop vectors of documents that left the corpus.
+
+        Returns the searchable entries that have no vector yet. Metadata is
+        never stored in the index, so recovery marks need no patching here.
+        Caller holds the lock.
+        """
+
+        orphans: List[str] = []
+        for doc_key in vectors.keys():
+            entry = self._documents_by_key.get(doc_key)
+            if entry is None or self._is_passage_parent(entry):
+                orphans.append(doc_key)
+        if orphans:
+            vectors.remove(orphans)
+            logger.info("Dropped %d vector(s) no longer in the corpus.", len(orphans))
+        return [
+            entry
+            for doc_key, entry in self._documents_by_key.items()
+            if doc_key not in vectors and not self._is_passage_parent(entry)
+        ]
+
+    @staticmethod
+    def _read_index_embedding_id(path: Path) -> str:
+        try:
+            return (path / "index.embedding").read_text(encoding="utf-8").strip()
+        except OSError:
+            return ""
+
+    def _save_vectors(self) -> None:
+        """Write the live index to its generation directory. Caller holds either lock side."""
+
+        if self._vectors is None:
+            return
+        with self._save_lock:
+            try:
+                self._vectors.save(self._index_path)
+                (self._index_path / "index.embedding").write_text(self._embedding_id, encoding="utf-8")
+            except Exception:  # pragma: no cover - persistence guard
+                logger.exception("Failed to persist vector index to %s", self._index_path)
 
     def reset_embeddings(self) -> None:
-        """Drop cached embeddings/vector store so credentials can change at runtime."""
+        """Drop cached embeddings/vector index so credentials can change at runtime."""
 
-        with self._lock:
+        with self._lock.write():
             self._embeddings = None
-            self._vectorstore = None
+            self._embeddings_unavailable = False
+            self._vectors = None
+            self._invalidate_queries()
 
     # ------------------------------------------------------------------ #
     # Document utilities
     # ------------------------------------------------------------------ #
 
     def _to_document(self, entry: Dict[str, object]) -> Optional[Document]:  # type: ignore[override]
-        if Document is None:
+        if self._document_class is None:
             return None
 
         content = entry.get("content")
         metadata = entry.get("metadata")
         if not isinstance(content, str) or not isinstance(metadata, dict):
             return None
-        return Document(page_content=content, metadata=metadata)
+        doc_key = entry.get("doc_key")
+        return self._document_class(
+            id=doc_key if isinstance(doc_key, str) else None,
+            page_content=content,
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _is_passage_parent(entry: Dict[str, object]) -> bool:
+        """Chunked uploads are searched through their passages, not as a whole."""
+
+        metadata = entry.get("metadata")
+        return isinstance(metadata, dict) and isinstance(metadata.get("passage_count"), int)
+
+    @staticmethod
+    def _parent_key(entry: Dict[str, object]) -> Optional[str]:
+        metadata = entry.get("metadata")
+        parent_key = metadata.get("parent_key") if isinstance(metadata, dict) else None
+        return parent_key if isinstance(parent_key, str) else None
+
+    def _split_passages(self, content: str) -> List[str]:
+        if self._splitter is None or len(content) <= self._passage_chars:
+            return [content]
+        passages = [passage for passage in self._splitter.split_text(content) if passage.strip()]
+        return passages or [content]
+
+    def _collapse_passages(
+        self,
+        ranked: Iterable[str],
+        limit: int,
+        *,
+        top_up: Iterable[str] = (),
+    ) -> List[Document]:  # type: ignore[valid-type]
+        """Turn ranked doc_keys into at most ``limit`` results, one per upload.
+
+        Passages of the same parent are merged (best ``passages_per_parent``
+        only) so a long runbook cannot crowd out other documents. ``top_up``
+        keys are consumed lazily until ``limit`` groups exist. Caller holds
+        the lock.
+        """
+
+        groups: Dict[str, List[Dict[str, object]]] = {}
+
+        def take(doc_key: str) -> None:
+            entry = self._documents_by_key.get(doc_key)
+            if entry is None or self._is_passage_parent(entry):
+                return
+            group_key = self._parent_key(entry) or doc_key
+            members = groups.get(group_key)
+            if members is None:
+                if len(groups) >= limit:
+                    return
+                members = groups[group_key] = []
+            if len(members) < self._passages_per_parent and all(item["doc_key"] != doc_key for item in members):
+                members.append(entry)
+
+        for doc_key in ranked:
+            take(doc_key)
+        if len(groups) < limit:
+            for doc_key in top_up:
+                take(doc_key)
+                if len(groups) >= limit:
+                    break
+
+        results: List[Document] = []  # type: ignore[valid-type]
+        for group_key, members in groups.items():
+            document = self._group_document(group_key, members)
+            if document is not None:
+                results.append(document)
+        return results
+
+    def _group_document(
+        self,
+        group_key: str,
+        members: List[Dict[str, object]],
+    ) -> Optional[Document]:  # type: ignore[valid-type]
+        if len(members) == 1 and self._parent_key(members[0]) is None:
+            return self._to_document(members[0])
+        if self._document_class is None:
+            return None
+
+        members = sorted(members, key=lambda entry: entry["metadata"].get("passage_index", 0))
+        content = "\n…\n".join(str(entry["content"]) for entry in members)
+        parent = self._documents_by_key.get(group_key)
+        metadata = dict(parent["metadata"] if parent else members[0]["metadata"])
+        metadata["passages"] = [entry["metadata"].get("passage_index") for entry in members]
+        metadata["summary"] = self._summarize_plain_text(content, max_length=400)
+        return self._document_class(id=group_key, page_content=content, metadata=metadata)
 
     def _format_summary(self, values: Iterable[str]) -> str:
         non_empty = [value.strip() for value in values if value and value.strip()]
         return ", ".join(non_empty[:4])
 
-    def _add_document(self, *, doc_key: str, content: str, metadata: Dict[str, object]) -> bool:
+    def _iter_matching(
+        self,
+        criteria: Optional[Dict[str, object]] = None,
+    ) -> Iterable[Dict[str, object]]:
+        """Yield entries whose metadata matches ``criteria``, newest first.
+
+        Walks a secondary index, so the caller must hold ``self._lock``
+        (either side) while consuming the iterator.
+        """
+
+        doc_keys, remaining = self._metadata_index.lookup(criteria)
+        for doc_key in doc_keys:
+            entry = self._documents_by_key.get(doc_key)
+            if entry is None:
+                continue
+            if self._matches(entry, remaining):
+                yield entry
+
+    @staticmethod
+    def _matches(entry: Dict[str, object], criteria: Dict[str, object]) -> bool:
+        metadata = entry.get("metadata")
+        if not isinstance(metadata, dict):
+            return False
+        return all(metadata.get(key) == value for key, value in criteria.items())
+
+    def _lexical_search(self, query: str, criteria: Dict[str, object], limit: int) -> List[str]:
+        """BM25 doc_keys for ``query`` restricted to ``criteria``. Caller holds the lock."""
+
+        def accept(doc_key: str) -> bool:
+            entry = self._documents_by_key.get(doc_key)
+            return entry is not None and self._matches(entry, criteria)
+
+        return [doc_key for doc_key, _ in self._lexical_index.search(query, limit=limit, accept=accept)]
+
+    def _prepare_entry(self, *, doc_key: str, content: str, metadata: Dict[str, object]) -> Dict[str, object]:
         created_at = metadata.get("created_at")
         if not isinstance(created_at, str):
             created_at = utcnow_iso()
             metadata["created_at"] = created_at
 
-        content = normalize_legacy_text(content)
-        metadata = normalize_legacy_payload(metadata)
+        clean_metadata = dict(metadata)
+        clean_metadata["doc_key"] = doc_key
+
+        doc_entry: Dict[str, object] = {
+            "doc_key": doc_key,
+            "content": content,
+            "created_at": created_at,
+            "title": metadata.get("title", ""),
+            "summary": metadata.get("summary", ""),
+            "scenario_code": metadata.get("scenario_code", ""),
+            "status": metadata.get("status", ""),
+            "type": metadata.get("type", ""),
+            "metadata": clean_metadata,
+        }
+        return normalize_legacy_payload(doc_entry)
+
+    def _register_entry(self, entry: Dict[str, object]) -> None:
+        """Make an entry visible to lookups. Caller must hold the write lock."""
+
+        doc_key = entry["doc_key"]
+        self._documents_by_key[doc_key] = entry
+        self._metadata_index.add(entry)
+        if not self._is_passage_parent(entry):
+            self._lexical_index.add(doc_key, entry["content"])
+        self._invalidate_queries()
+
+    def _invalidate_queries(self) -> None:
+        """Retire cached search results. Caller must hold the write lock."""
+
+        self._corpus_generation += 1
+
+    def _embed_for_index(
+        self,
+        entries: Sequence[Dict[str, object]],
+        batch_size: Optional[int] = None,
+    ) -> Optional[Tuple[str, Dict[str, List[float]]]]:
+        """Embed entries for the live index without holding the lock.
+
+        Returns ``(embedding_id, {doc_key: vector})``, or ``None`` when no
+        index is live; the background builder then picks the entries up.
+        """
+
+        with self._lock.read():
+            vectors = self._vectors
+            embeddings = self._embeddings
+            embedding_id = self._embedding_id
+        if vectors is None or embeddings is None:
+            return None
+        keys, texts = self._vector_inputs(entries)
+        if not keys:
+            return None
+        try:
+            matrix = self._embed_in_batches(embeddings, texts, batch_size)
+        except Exception:  # pragma: no cover - embedding/API failure guard
+            logger.exception("Failed to embed %d document(s) for the vector index.", len(keys))
+            return None
+        return embedding_id, dict(zip(keys, matrix))
 
-        with self._lock:
-            if doc_key in self._documents_by_key:
-                return False
+    def _index_vectors(
+        self,
+        entries: Sequence[Dict[str, object]],
+        precomputed: Optional[Tuple[str, Dict[str, List[float]]]] = None,
+    ) -> bool:
+        """Append entries to the live vector index; True if the index changed.
+
+        Vectors come from :meth:`_embed_for_index` when they were computed for
+        the same embeddings; anything else is embedded inline. The caller
+        holds the write lock and saves the index afterwards.
+        """
+
+        vectors = self._ensure_vectors()
+        if vectors is None:
+            return False
+        # A fresh build already indexed these entries.
+        keys, texts = self._vector_inputs(entry for entry in entries if entry["doc_key"] not in vectors)
+        if not keys:
+            return False
+
+        known: Dict[str, List[float]] = {}
+        if precomputed is not None and precomputed[0] == self._embedding_id:
+            known = precomputed[1]
+        try:
+            missing = [(key, text) for key, text in zip(keys, texts) if key not in known]
+            if missing:
+                matrix = self._embed_in_batches(self._embeddings, [text for _, text in missing])
+                known = {**known, **{key: vector for (key, _), vector in zip(missing, matrix)}}
+            vectors.add(keys, [known[key] for key in keys])
+        except Exception:  # pragma: no cover - index append guard
+            logger.exception("Failed to append %d document(s) to the vector index.", len(keys))
+            return False
+        self._invalidate_queries()
+        return True
 
-            clean_metadata = dict(metadata)
-            clean_metadata["doc_key"] = doc_key
-
-            doc_entry: Dict[str, object] = {
-                "doc_key": doc_key,
-                "content": content,
-                "created_at": created_at,
-                "title": metadata.get("title", ""),
-                "summary": metadata.get("summary", ""),
-                "scenario_code": metadata.get("scenario_code", ""),
-                "status": metadata.get("status", ""),
-                "type": metadata.get("type", ""),
-                "metadata": clean_metadata,
-            }
-            self._documents_by_key[doc_key] = normalize_legacy_payload(doc_entry)
-            self._persist_documents()
+    def _persist_index(self, *, immediate: bool = False) -> None:
+        """Save the live index under the read lock so searches keep running.
+
+        Single-document writes only schedule a save: a burst of them is
+        coalesced into one ``save_local`` after ``_INDEX_SAVE_DELAY``. Vectors
+        lost to a crash in between are rebuilt from the journal on load.
+        """
+
+        if not immediate:
+            with self._flush_lock:
+                if self._flush_pending:
+                    return
+                self._flush_pending = True
+            timer = Timer(_INDEX_SAVE_DELAY, self._flush_index)
+            timer.name = "RAGIndexSaver"
+            timer.daemon = True
+            timer.start()
+            return
+        with self._lock.read():
+            self._save_vectors()
 
-            vectorstore = self._ensure_vectorstore()
-            if vectorstore is None:
-                return True
+    def save_index(self) -> None:
+        """Write the live index now, e.g. after batches added with ``defer_index_save``."""
 
-            document = self._to_document(doc_entry)
-            if document is None:
-                return True
+        self._persist_index(immediate=True)
 
-            try:
-                vectorstore.add_documents([document])
-                self._save_vectorstore()
-            except Exception:  # pragma: no cover - index append guard
-                logger.exception("Failed to append document %s to FAISS index.", doc_key)
+    def _flush_index(self) -> None:
+        with self._flush_lock:
+            self._flush_pending = False
+        self._persist_index(immediate=True)
+
+    def _is_known_key(self, doc_key: str) -> bool:
+        return doc_key in self._documents_by_key or doc_key in self._duplicate_aliases
+
+    def _find_near_duplicate(self, entry: Dict[str, object], signature: Optional[int]) -> Optional[str]:
+        """Return an existing doc_key ``entry`` should merge into. Caller holds the lock."""
+
+        if signature is None:
+            return None
+        return self._near_duplicates.find(
+            signature,
+            (
+                (candidate["doc_key"], candidate["content"])
+                for candidate in islice(self._iter_matching(self._dedup_scope(entry)), self._dedup_window)
+            ),
+        )
+
+    def _add_document(self, *, doc_key: str, content: str, metadata: Dict[str, object]) -> bool:
+        doc_entry = self._prepare_entry(doc_key=doc_key, content=content, metadata=metadata)
+        signature = self._dedup_signature(doc_entry)
+
+        with self._lock.read():
+            if self._is_known_key(doc_key):
+                return False
+            duplicate_key = self._find_near_duplicate(doc_entry, signature)
+        vectors = self._embed_for_index([doc_entry]) if duplicate_key is None else None
+
+        with self._lock.write():
+            # Re-check: another writer may have landed while we were embedding.
+            if self._is_known_key(doc_key):
+                return False
+            duplicate_key = self._find_near_duplicate(doc_entry, signature)
+            if duplicate_key is not None:
+                self._merge_duplicate(duplicate_key, doc_entry)
+                return True
+            if signature is not None:
+                self._near_duplicates.remember(doc_key, signature)
+            self._register_entry(doc_entry)
+            self._persist_entry(doc_entry)
+            changed = self._index_vectors([doc_entry], vectors)
+        if changed:
+            self._persist_index()
         return True
 
+    def _dedup_signature(self, entry: Dict[str, object]) -> Optional[int]:
+        if self._dedup_window <= 0 or entry["metadata"].get("type") not in _DEDUP_TYPES:
+            return None
+        return simhash(entry["content"])
+
+    @staticmethod
+    def _dedup_scope(entry: Dict[str, object]) -> Dict[str, object]:
+        metadata = entry["metadata"]
+        return {field: metadata.get(field) for field in ("type", "scenario_code", "status")}
+
+    def _register_aliases(self, doc_key: str, entry: Dict[str, object]) -> None:
+        metadata = entry.get("metadata")
+        aliases = metadata.get("duplicate_keys") if isinstance(metadata, dict) else None
+        if isinstance(aliases, list):
+            for alias in aliases:
+                if isinstance(alias, str):
+                    self._duplicate_aliases[alias] = doc_key
+
+    def _merge_duplicate(self, doc_key: str, duplicate: Dict[str, object]) -> None:
+        """Fold ``duplicate`` into ``doc_key`` instead of indexing it. Caller holds the lock."""
+
+        entry = self._documents_by_key[doc_key]
+        metadata = dict(entry["metadata"])
+        occurrences = metadata.get("occurrences")
+        metadata["occurrences"] = (occurrences if isinstance(occurrences, int) else 1) + 1
+        metadata["last_seen"] = duplicate["created_at"]
+        aliases = metadata.get("duplicate_keys")
+        aliases = list(aliases) if isinstance(aliases, list) else []
+        aliases.append(duplicate["doc_key"])
+        metadata["duplicate_keys"] = aliases[-_MAX_DUPLICATE_KEYS:]
+
+        updated = {**entry, "metadata": metadata}
+        self._documents_by_key[doc_key] = updated
+        self._duplicate_aliases[duplicate["doc_key"]] = doc_key
+        self._duplicates_merged += 1
+        self._invalidate_queries()
+        self._persist_entry(updated)
+        self._ensure_indexed(doc_key)
+        logger.debug("Merged near-duplicate %s into %s.", duplicate["doc_key"], doc_key)
+
     @staticmethod
     def _summarize_plain_text(text: str, max_length: int = 200) -> str:
         squashed = " ".join(text.split())
@@ -239,6 +934,64 @@ class RAGService:
             return squashed
         return f"{squashed[: max_length - 3]}..."
 
+    def _start_retention(self) -> None:
+        self._retention_thread = Thread(target=self._run_retention, name="RAGRetention", daemon=True)
+        self._retention_thread.start()
+
+    def _run_retention(self) -> None:
+        while not self._retention_stop.wait(self._retention.interval_seconds):
+            try:
+                self.apply_retention()
+            except Exception:  # pragma: no cover - background guard
+                logger.exception("RAG retention pass failed; retrying in %.0fs.", self._retention.interval_seconds)
+
+    def stop_retention(self) -> None:
+        """Stop the background retention pass, if one is running."""
+
+        self._retention_stop.set()
+
+    def _evict_documents(self, doc_keys: Iterable[str]) -> Tuple[int, int]:
+        """Drop documents, their passages and aliases from every index. Caller holds the write lock.
+
+        Returns ``(documents, vectors)`` removed, passages included.
+        """
+
+        removed: List[str] = []
+        for doc_key in doc_keys:
+            entry = self._documents_by_key.get(doc_key)
+            if entry is None:
+                continue
+            removed.append(doc_key)
+            passage_count = entry["metadata"].get("passage_count")
+            if isinstance(passage_count, int):
+                removed.extend(
+                    f"{doc_key}#{index}"
+                    for index in range(passage_count)
+                    if f"{doc_key}#{index}" in self._documents_by_key
+                )
+        if not removed:
+            return 0, 0
+
+        for doc_key in removed:
+            del self._documents_by_key[doc_key]
+            self._metadata_index.remove(doc_key)
+            self._lexical_index.remove(doc_key)
+            self._near_duplicates.forget(doc_key)
+        gone = set(removed)
+        for alias in [alias for alias, target in self._duplicate_aliases.items() if target in gone]:
+            del self._duplicate_aliases[alias]
+
+        vectors_removed = 0
+        if self._vectors is not None:
+            vectors_removed = self._vectors.remove(removed)
+            self._vectors.compact()
+        try:
+            self._journal.delete_many(removed)
+        except Exception:  # pragma: no cover - defensive guard
+            logger.exception("Failed to journal %d RAG eviction(s)", len(removed))
+        self._invalidate_queries()
+        return len(removed), vectors_removed
+
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
@@ -270,13 +1023,12 @@ class RAGService:
                 },
             )
 
-    def add_uploaded_document(
+    def _prepare_upload_metadata(
         self,
-        *,
         title: str,
         content: str,
-        metadata: Optional[Dict[str, object]] = None,
-    ) -> str:
+        metadata: Optional[Dict[str, object]],
+    ) -> Dict[str, object]:
         clean_metadata: Dict[str, object] = {}
         if metadata:
             clean_metadata.update(metadata)
@@ -292,12 +1044,109 @@ class RAGService:
         clean_metadata.setdefault("type", "uploaded")
         clean_metadata.setdefault("scenario_code", "")
         clean_metadata.setdefault("recovery_status", "unknown")
+        return clean_metadata
+
+    def add_uploaded_document(
+        self,
+        *,
+        title: str,
+        content: str,
+        metadata: Optional[Dict[str, object]] = None,
+    ) -> str:
+        result = self.add_documents_bulk([{"title": title, "content": content, "metadata": metadata}])
+        return result["documents"][0]
+
+    def add_documents_bulk(
+        self,
+        documents: Iterable[Dict[str, object]],
+        *,
+        batch_size: Optional[int] = None,
+        defer_index_save: bool = False,
+    ) -> Dict[str, object]:
+        """Add uploaded documents with one journal write and one index save.
+
+        Each item carries ``title``, ``content`` and optional ``metadata`` as
+        for :meth:`add_uploaded_document`. Every item is validated before any
+        is stored, so a bad entry rejects the whole batch. Content longer than
+        ``passage_chars`` is split into overlapping passages that are indexed
+        individually and point back to the upload through ``parent_key``.
+        Returns the new doc_keys, the passage count and per-phase timings in
+        milliseconds. Callers feeding many consecutive batches pass
+        ``defer_index_save`` to coalesce the index save like single-document
+        writes do instead of rewriting the whole index per batch.
+        """
+
+        timings: Dict[str, float] = {"validate": 0.0, "persist": 0.0, "embed": 0.0, "index": 0.0, "save": 0.0}
+        started = perf_counter()
+        entries: List[Dict[str, object]] = []
+        doc_keys: List[str] = []
+        passage_total = 0
+        for position, item in enumerate(documents):
+            content = item.get("content") if isinstance(item, dict) else None
+            if not isinstance(content, str) or not content.strip():
+                raise ValueError(f"Document #{position + 1} has no content.")
+            title = item.get("title")
+            metadata = item.get("metadata")
+            if metadata is not None and not isinstance(metadata, dict):
+                raise ValueError(f"Document #{position + 1} metadata must be an object.")
+            clean_metadata = self._prepare_upload_metadata(
+                title if isinstance(title, str) else "",
+                content,
+                metadata,
+            )
+            doc_key = f"upload:{uuid4().hex}"
+            passages = self._split_passages(content)
+            if len(passages) > 1:
+                clean_metadata["passage_count"] = len(passages)
+            entries.append(self._prepare_entry(doc_key=doc_key, content=content, metadata=clean_metadata))
+            doc_keys.append(doc_key)
+            if len(passages) > 1:
+                passage_total += len(passages)
+                for index, passage in enumerate(passages):
+                    passage_metadata = dict(clean_metadata)
+                    del passage_metadata["passage_count"]
+                    passage_metadata.update(
+                        parent_key=doc_key,
+                        passage_index=index,
+                        summary=self._summarize_plain_text(passage),
+                    )
+                    entries.append(
+                        self._prepare_entry(
+                            doc_key=f"{doc_key}#{index}",
+                            content=passage,
+                            metadata=passage_metadata,
+                        )
+                    )
+        if not entries:
+            raise ValueError("No documents to add.")
+        timings["validate"] = perf_counter() - started
+
+        embed_started = perf_counter()
+        vectors = self._embed_for_index(entries, batch_size)
+        timings["embed"] = perf_counter() - embed_started
+
+        with self._lock.write():
+            persist_started = perf_counter()
+            for entry in entries:
+                self._register_entry(entry)
+            self._persist_entries(entries)
+            timings["persist"] = perf_counter() - persist_started
+
+            index_started = perf_counter()
+            changed = self._index_vectors(entries, vectors)
+            timings["index"] = perf_counter() - index_started
+
+        save_started = perf_counter()
+        if changed:
+            self._persist_index(immediate=not defer_index_save)
+        timings["save"] = perf_counter() - save_started
 
-        doc_key = f"upload:{uuid4().hex}"
-        added = self._add_document(doc_key=doc_key, content=content, metadata=clean_metadata)
-        if not added:  # pragma: no cover - duplicate guard
-            raise ValueError("Document already exists.")
-        return doc_key
+        timings["total"] = perf_counter() - started
+        return {
+            "documents": doc_keys,
+            "passages": passage_total,
+            "timings_ms": {phase: round(seconds * 1000, 3) for phase, seconds in timings.items()},
+        }
 
     def record_action_execution(
         self,
@@ -390,25 +1239,44 @@ class RAGService:
         doc_key = f"action_execution:{execution_id}:executed"
         resolved_at = resolved_at or utcnow_iso()
 
-        with self._lock:
+        with self._lock.write():
+            doc_key = self._duplicate_aliases.get(doc_key, doc_key)
             entry = self._documents_by_key.get(doc_key)
             if not entry:
                 return False
             metadata = entry.get("metadata")
-            if not isinstance(metadata, dict):
-                metadata = {}
+            metadata = dict(metadata) if isinstance(metadata, dict) else {}
 
             metadata["recovery_status"] = status
             metadata["recovered_at"] = resolved_at
             if metrics:
                 metadata["recovery_metrics"] = metrics
-            entry["metadata"] = normalize_legacy_payload(metadata)
-            self._documents_by_key[doc_key] = normalize_legacy_payload(entry)
-            self._persist_documents()
-            self._vectorstore = None
-
-        # Lazy rebuild (if embeddings configured) to keep FAISS metadata consistent.
-        self._ensure_vectorstore(load_only=False)
+            # Near-duplicate executions share one document, so the fields
+            # above only describe the latest mark; keep each execution's own
+            # outcome so one mark does not erase another.
+            outcome: Dict[str, object] = {
+                "execution_id": execution_id,
+                "recovery_status": status,
+                "recovered_at": resolved_at,
+            }
+            if metrics:
+                outcome["recovery_metrics"] = metrics
+            history = metadata.get("recovery_history")
+            history = [
+                item
+                for item in (history if isinstance(history, list) else [])
+                if isinstance(item, dict) and item.get("execution_id") != execution_id
+            ]
+            history.append(outcome)
+            metadata["recovery_history"] = history[-(_MAX_DUPLICATE_KEYS + 1) :]
+            # The entry was normalised when stored; only service-generated
+            # recovery fields are added here.
+            updated = {**entry, "metadata": metadata}
+            self._documents_by_key[doc_key] = updated
+            self._metadata_index.update(updated)
+            self._invalidate_queries()
+            self._persist_entry(updated)
+            self._ensure_indexed(doc_key)
         return True
 
     def record_incident_report(self, report: "IncidentReport") -> None:
@@ -454,14 +1322,252 @@ class RAGService:
             },
         )
 
-    def list_documents(self) -> List[Dict[str, object]]:
-        with self._lock:
-            items = list(self._documents_by_key.values())
-        items.sort(
-            key=lambda entry: entry.get("created_at") or "",
-            reverse=True,
+    def retention_report(
+        self,
+        policy: Optional[RetentionPolicy] = None,
+        *,
+        now: Optional[datetime] = None,
+        sample: int = 50,
+    ) -> Dict[str, object]:
+        """Dry run of :meth:`apply_retention`: what ``policy`` would evict, without evicting it."""
+
+        policy = policy or self._retention
+        with self._lock.read():
+            document_count = len(self._documents_by_key)
+            evictions = plan_evictions(self._documents_by_key.values(), policy, now)
+            candidates = [(self._documents_by_key[key], reason) for key, reason in evictions.items()]
+
+        by_reason: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        passages = 0
+        for entry, reason in candidates:
+            metadata = entry["metadata"]
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+            doc_type = str(metadata.get("type") or "unknown")
+            by_type[doc_type] = by_type.get(doc_type, 0) + 1
+            passage_count = metadata.get("passage_count")
+            passages += passage_count if isinstance(passage_count, int) else 0
+
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        candidates.sort(key=lambda item: last_activity(item[0]) or oldest)
+        return {
+            "policy": policy.describe(),
+            "enabled": policy.enabled,
+            "documents": document_count,
+            "evictable": len(candidates),
+            "passages": passages,
+            "by_reason": by_reason,
+            "by_type": by_type,
+            "sample": [
+                {
+                    "doc_key": entry["doc_key"],
+                    "title": entry["metadata"].get("title"),
+                    "type": entry["metadata"].get("type"),
+                    "scenario_code": entry["metadata"].get("scenario_code"),
+                    "created_at": entry.get("created_at"),
+                    "reason": reason,
+                }
+                for entry, reason in candidates[: max(0, sample)]
+            ],
+        }
+
+    def apply_retention(
+        self,
+        policy: Optional[RetentionPolicy] = None,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, object]:
+        """Evict what ``policy`` (the configured one by default) no longer keeps.
+
+        The journal is compacted into a fresh snapshot and the vector index
+        saved right away so the corpus shrinks on disk as well. Approximate
+        indexes losing a large share of their vectors are rebuilt in the
+        background.
+        """
+
+        policy = policy or self._retention
+        started = perf_counter()
+        with self._lock.write():
+            evictions = plan_evictions(self._documents_by_key.values(), policy, now)
+            vectors_before = len(self._vectors) if self._vectors is not None else 0
+            removed, vectors_removed = self._evict_documents(evictions)
+            rebuild = (
+                self._vectors is not None
+                and not self._vectors.exact
+                and vectors_removed >= vectors_before * _RETENTION_REBUILD_RATIO
+                and vectors_removed > 0
+            )
+            if rebuild:
+                self._mark_index_stale()
+
+        if vectors_removed:
+            self._persist_index(immediate=True)
+        if removed:
+            self.compact_documents()
+
+        by_reason: Dict[str, int] = {}
+        for reason in evictions.values():
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+        result: Dict[str, object] = {
+            "evicted": len(evictions),
+            "removed": removed,
+            "vectors_removed": vectors_removed,
+            "by_reason": by_reason,
+            "index_rebuild": rebuild,
+            "finished_at": utcnow_iso(),
+            "duration_ms": round((perf_counter() - started) * 1000, 3),
+        }
+        self._last_retention = result
+        if removed:
+            logger.info(
+                "Retention evicted %d document(s) (%d with passages, %d vector(s)).",
+                len(evictions),
+                removed,
+                vectors_removed,
+            )
+        return result
+
+    def export_bundle(self, path: Path) -> Dict[str, object]:
+        """Write the corpus and its live vectors to a portable bundle file.
+
+        Vectors are exported only when the index is current, so an importer
+        never mistakes a partial index for a complete one; it rebuilds
+        instead. IVF-PQ indexes export their 8-bit refine copies.
+        """
+
+        started = perf_counter()
+        with self._lock.read():
+            entries = list(self._documents_by_key.values())
+            vectors = self._vectors if not self._index_stale else None
+            keys, matrix = vectors.to_matrix() if vectors is not None else ([], None)
+            embedding_id = self._embedding_id if vectors is not None else ""
+            migrations = self._journal.migrations
+        header = write_bundle(
+            path,
+            entries,
+            keys,
+            matrix,
+            embedding_id=embedding_id,
+            migrations=migrations,
+            metadata={"vector_engine": vectors.engine if vectors is not None else None},
         )
-        return items
+        return {
+            "path": str(path),
+            "documents": header["documents"],
+            "vectors": header["vectors"]["rows"],
+            "bytes": path.stat().st_size,
+            "duration_ms": round((perf_counter() - started) * 1000, 3),
+        }
+
+    def import_bundle(self, path: Path) -> Dict[str, object]:
+        """Replace the corpus with a bundle written by :meth:`export_bundle`.
+
+        The vector block is memory-mapped and adopted without re-embedding
+        when it was produced by the embeddings in use; otherwise the index
+        is rebuilt in the background. The new corpus is searchable when this
+        returns and is persisted (snapshot first, then the index generation)
+        before it does.
+        """
+
+        timings: Dict[str, float] = {}
+        started = perf_counter()
+        bundle = read_bundle(path)
+        entries = bundle.documents
+        if bundle.migrations.get("text_fixups") != TEXT_FIXUPS_VERSION:
+            entries = [normalize_legacy_payload(entry) for entry in entries]
+        documents: Dict[str, Dict[str, object]] = {}
+        for entry in entries:
+            doc_key = entry.get("doc_key")
+            if isinstance(doc_key, str) and isinstance(entry.get("metadata"), dict):
+                documents[doc_key] = entry
+        timings["read"] = perf_counter() - started
+
+        with self._lock.write():
+            index_started = perf_counter()
+            self._documents_by_key = documents
+            self._index_corpus()
+            self._journal.mark_migrated("text_fixups", TEXT_FIXUPS_VERSION)
+            vectors: Optional[VectorIndex] = None
+            missing: List[Dict[str, object]] = []
+            if (
+                bundle.vectors is not None
+                and self._vector_engine is not None
+                and self._get_embeddings() is not None
+                and bundle.embedding_id == self._embedding_id
+            ):
+                vectors = vector_index_from_matrix(self._vector_engine, bundle.vector_keys, bundle.vectors)
+                missing = self._reconcile_vectors(vectors)
+            generation = self._generations.next_generation()
+            # Builds started before the import (lower generations) are discarded.
+            self._min_build_generation = generation
+            self._vectors = vectors
+            if vectors is not None:
+                self._index_path = self._generations.path_for(generation)
+                self._generation = generation
+            self._index_stale = vectors is None or bool(missing)
+            self._invalidate_queries()
+            timings["index"] = perf_counter() - index_started
+
+        persist_started = perf_counter()
+        self.compact_documents()
+        if vectors is not None:
+            self._persist_index(immediate=True)
+            self._generations.publish(generation)
+        timings["persist"] = perf_counter() - persist_started
+        with self._lock.write():
+            if self._index_stale:
+                self._mark_index_stale()
+
+        timings["total"] = perf_counter() - started
+        logger.info(
+            "Imported RAG bundle %s: %d document(s), %d vector(s) adopted.",
+            path,
+            len(documents),
+            len(vectors) if vectors is not None else 0,
+        )
+        return {
+            "documents": len(documents),
+            "vectors": len(vectors) if vectors is not None else 0,
+            "index_rebuild": vectors is None or bool(missing),
+            "timings_ms": {phase: round(seconds * 1000, 3) for phase, seconds in timings.items()},
+        }
+
+    @property
+    def corpus_generation(self) -> int:
+        """Counter bumped by every corpus mutation, for caches of derived results."""
+
+        return self._corpus_generation
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock.read():
+            document_count = len(self._documents_by_key)
+            vectors = self._vectors
+            vector_count = len(vectors) if vectors is not None else 0
+            vector_bytes = vectors.memory_bytes() if vectors is not None else 0
+        cache = self._embedding_cache
+        return {
+            "documents": document_count,
+            "vectors": vector_count,
+            "journal_seq": self._journal.seq,
+            "duplicates_merged": self._duplicates_merged,
+            "vector_engine": self._vector_engine,
+            "vector_memory_bytes": vector_bytes,
+            "index_generation": self._generation,
+            "index_building": self._builder_thread is not None and self._builder_thread.is_alive(),
+            "embedding_cache": cache.stats() if cache is not None else None,
+            "query_cache": self._query_cache.stats(),
+            "retention": {
+                "enabled": self._retention.enabled,
+                "policy": self._retention.describe(),
+                "last_run": self._last_retention,
+            },
+        }
+
+    def list_documents(self) -> List[Dict[str, object]]:
+        with self._lock.read():
+            doc_keys, _ = self._metadata_index.lookup()
+            entries = (self._documents_by_key[key] for key in doc_keys)
+            return [entry for entry in entries if self._parent_key(entry) is None]
 
     def recent_actions(
         self,
@@ -470,26 +1576,16 @@ class RAGService:
         status: str = "executed",
         limit: int = 5,
     ) -> List[str]:
-        with self._lock:
-            entries = list(self._documents_by_key.values())
-
         filtered: List[str] = []
-        entries.sort(key=lambda entry: entry.get("created_at") or "", reverse=True)
-        for entry in entries:
-            metadata = entry.get("metadata")
-            if not isinstance(metadata, dict):
-                continue
-            if metadata.get("scenario_code") != scenario_code:
-                continue
-            if metadata.get("status") != status:
-                continue
-            actions = metadata.get("actions")
-            if isinstance(actions, list):
-                for action in actions:
-                    if isinstance(action, str):
-                        filtered.append(action)
-                        if len(filtered) >= limit:
-                            return filtered
+        with self._lock.read():
+            for entry in self._iter_matching({"scenario_code": scenario_code, "status": status}):
+                actions = entry["metadata"].get("actions")
+                if isinstance(actions, list):
+                    for action in actions:
+                        if isinstance(action, str):
+                            filtered.append(action)
+                            if len(filtered) >= limit:
+                                return filtered
         return filtered[:limit]
 
     def search(
@@ -499,41 +1595,112 @@ class RAGService:
         limit: int = 4,
         metadata_filter: Optional[Dict[str, object]] = None,
     ) -> List[Document]:  # type: ignore[override]
-        with self._lock:
-            filter_dict = metadata_filter or {}
+        """Hybrid vector + BM25 search; repeated lookups between mutations hit the query cache."""
 
-            vectorstore = self._ensure_vectorstore()
-            if vectorstore is not None:
-                try:
-                    return vectorstore.similarity_search(
-                        query,
-                        k=limit,
-                        filter=filter_dict,
-                    )
-                except Exception:  # pragma: no cover - defensive guard
-                    logger.exception("RAG similarity search failed; falling back to metadata scan.")
-
-            # Fallback: metadata-only filtering ordered by recency.
-            matches: List[Document] = []
-            for entry in self._documents_by_key.values():
-                metadata = entry.get("metadata")
-                if not isinstance(metadata, dict):
-                    continue
-                include = True
-                for key, value in filter_dict.items():
-                    if metadata.get(key) != value:
-                        include = False
-                        break
-                if include:
-                    document = self._to_document(entry)
-                    if document:
-                        matches.append(document)
-
-            matches.sort(
-                key=lambda doc: doc.metadata.get("created_at") or "",
-                reverse=True,
-            )
-            return matches[:limit]
+        cache_key = query_key("search", query, metadata_filter, limit)
+        cached = self._query_cache.get(cache_key, self._corpus_generation)
+        if cached is not MISSING:
+            return list(cached)
+
+        filter_dict = metadata_filter or {}
+        embeddings = self._search_embeddings()
+        query_vector: Optional[List[float]] = None
+        if embeddings is not None:
+            try:
+                query_vector = embeddings.embed_query(query)
+            except Exception:  # pragma: no cover - API failure guard
+                logger.exception("RAG query embedding failed; falling back to lexical search.")
+
+        with self._lock.read():
+            generation = self._corpus_generation
+            # The vector is only valid against an index built with the same embeddings.
+            vectors = self._vectors if query_vector is not None and self._embeddings is embeddings else None
+            results = self._rank_documents(query, query_vector, vectors, filter_dict, limit)
+        # A failed query embedding is transient; don't pin its lexical fallback.
+        if query_vector is not None or embeddings is None:
+            self._query_cache.put(cache_key, generation, tuple(results))
+        return results
+
+    def _rank_documents(
+        self,
+        query: str,
+        query_vector: Optional[List[float]],
+        vectors: Optional[VectorIndex],
+        filter_dict: Dict[str, object],
+        limit: int,
+    ) -> List[Document]:  # type: ignore[valid-type]
+        """Fuse vector and BM25 rankings, or BM25 alone without a vector index. Caller holds the lock."""
+
+        # Passages of one upload collapse into a single result, so over-fetch.
+        fetch = limit * (1 + self._passages_per_parent)
+        lexical_keys = self._lexical_search(query, filter_dict, fetch)
+
+        while vectors is not None:
+            try:
+                vector_keys = self._vector_search(vectors, query_vector, fetch, filter_dict)
+            except Exception:  # pragma: no cover - defensive guard
+                logger.exception("RAG similarity search failed; falling back to lexical search.")
+                break
+            fused = reciprocal_rank_fusion([vector_keys, lexical_keys])
+            results = self._collapse_passages(fused, limit)
+            exhausted = len(vector_keys) < fetch and len(lexical_keys) < fetch
+            if len(results) >= limit or exhausted or fetch >= len(self._documents_by_key):
+                return results
+            # One long upload filled the candidates; widen the window.
+            fetch *= 4
+            lexical_keys = self._lexical_search(query, filter_dict, fetch)
+
+        # Offline: BM25 ranking, topped up with the newest metadata matches.
+        return self._collapse_passages(
+            lexical_keys,
+            limit,
+            top_up=(entry["doc_key"] for entry in self._iter_matching(filter_dict)),
+        )
+
+    def _vector_search(
+        self,
+        vectors: VectorIndex,
+        query_vector: List[float],
+        k: int,
+        criteria: Dict[str, object],
+    ) -> List[str]:
+        """doc_keys of the top-``k`` documents matching ``criteria``. Caller holds the lock.
+
+        The metadata index yields the candidates and the engine scores only
+        those, so selective filters are not starved by a post-filtered kNN.
+        """
+
+        candidates: Optional[Iterable[str]] = None
+        if criteria:
+            candidates, remaining = self._metadata_index.lookup(criteria)
+            if remaining:
+                documents_by_key = self._documents_by_key
+                candidates = (key for key in candidates if self._matches(documents_by_key[key], remaining))
+        return [doc_key for doc_key, _ in vectors.search(query_vector, k, candidates)]
+
+    def _search_embeddings(self) -> Optional[object]:
+        """Embeddings to encode a query with, or ``None`` when no index is live.
+
+        Only takes the write lock when the index still has to be loaded or a
+        rebuild scheduled; otherwise a read-side check is enough.
+        """
+
+        with self._lock.read():
+            if not self._needs_vector_setup():
+                return self._embeddings if self._vectors is not None else None
+        with self._lock.write():
+            vectors = self._ensure_vectors()
+            return self._embeddings if vectors is not None else None
+
+    def _needs_vector_setup(self) -> bool:
+        if self._vector_engine is None or self._embeddings_unavailable:
+            return False
+        if self._vectors is not None and not self._index_stale:
+            return False
+        builder = self._builder_thread
+        if builder is not None and builder.is_alive():
+            return False
+        return monotonic() >= self._build_retry_at
 
     def build_context_for_scenario(
         self,
@@ -552,6 +1719,15 @@ class RAGService:
                 ],
             )
         )
+        cache_key = query_key("context", query, {"scenario_code": scenario.code}, limit)
+        generation = self._corpus_generation
+        context = self._query_cache.get(cache_key, generation)
+        if context is MISSING:
+            context = self._build_context(scenario, query, limit)
+            self._query_cache.put(cache_key, generation, context)
+        return context
+
+    def _build_context(self, scenario: AlertScenario, query: str, limit: int) -> str:
         approved_docs = self.search(
             query,
             limit=limit,
@@ -580,15 +1756,17 @@ class RAGService:
                 lines.append(f"  {summary}")
             return "\n".join(lines)
 
-        fallback_entries = [
-            entry
-            for entry in self.list_documents()
-            if isinstance(entry.get("metadata"), dict)
-            and entry["metadata"].get("scenario_code") == scenario.code
-        ]
+        with self._lock.read():
+            fallback_entries = []
+            for entry in self._iter_matching({"scenario_code": scenario.code}):
+                if self._parent_key(entry) is not None:
+                    continue
+                fallback_entries.append(entry)
+                if len(fallback_entries) >= limit:
+                    break
         if fallback_entries:
             lines = ["Related history:"]
-            for entry in fallback_entries[:limit]:
+            for entry in fallback_entries:
                 metadata = entry.get("metadata", {})
                 title = metadata.get("title") or entry.get("title") or scenario.title
                 status = metadata.get("status") or entry.get("status") or "reference"
@@ -611,6 +1789,7 @@ class RAGService:
         return ""
 
 
-# Shared singleton used throughout the backend.
+# Shared singleton used throughout the backend. It is built on first use (or
+# by the app's startup warm-up) so importing this module stays cheap.
 rag_data_dir = Path(__file__).resolve().parents[2] / "rag_data"
-rag_service = RAGService(rag_data_dir)
+rag_service: RAGService = LazyService(lambda: RAGService(rag_data_dir), name="rag")  # type: ignore[assignment]
@@ -0,0 +1,217 @@
+"""Portable binary bundles of a RAG corpus and its vectors.
+
+A bundle is a single file::
+
+    MAGIC | column blocks ... | vector block | footer (JSON) | footer length (u64) | MAGIC
+
+Documents are stored column by column: each top-level entry field becomes
+a UTF-8 blob plus an array of little-endian ``u64`` end offsets counted in
+code points, so a column is decoded once and sliced. Fields
+holding only strings are stored verbatim; any other field (``metadata``,
+numbers, ...) is stored as one JSON text per row, with an empty cell for
+rows that lack it. Vectors are a raw row-major ``float32`` matrix aligned to
+64 bytes, so readers can memory-map it instead of parsing anything. The
+footer goes last so a bundle is written in one pass; nothing in the file is
+pickled.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence
+
+try:  # Optional dependencies are resolved at runtime
+    import numpy as np
+except ImportError:  # pragma: no cover - fallback when dependencies missing
+    np = None  # type: ignore[assignment]
+
+from src.incident_console.utils import utcnow_iso
+
+MAGIC = b"IRAGBND\x00"
+FORMAT_VERSION = 1
+SUFFIX = ".ragbundle"
+_FOOTER_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 64
+# Placeholder for entries lacking a field, distinct from a stored ``None``.
+_ABSENT = object()
+
+
+@dataclass
+class Bundle:
+    """Contents of a bundle; ``vectors`` is a copy-on-write view of the file."""
+
+    documents: List[Dict[str, object]]
+    vector_keys: List[str]
+    vectors: Optional["np.ndarray"]
+    embedding_id: str = ""
+    migrations: Dict[str, int] = field(default_factory=dict)
+    header: Dict[str, object] = field(default_factory=dict)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("RAG bundles need numpy.")
+
+
+def _pad(handle: BinaryIO) -> None:
+    remainder = handle.tell() % _ALIGNMENT
+    if remainder:
+        handle.write(b"\x00" * (_ALIGNMENT - remainder))
+
+
+def _write_strings(handle: BinaryIO, values: Sequence[str]) -> Dict[str, int]:
+    ends = np.cumsum([len(value) for value in values], dtype=np.uint64) if values else np.empty(0, np.uint64)
+    _pad(handle)
+    offsets = handle.tell()
+    handle.write(ends.astype("<u8").tobytes())
+    data = handle.tell()
+    handle.write("".join(values).encode("utf-8"))
+    return {"offsets": offsets, "data": data, "length": handle.tell() - data}
+
+
+def _read_strings(buffer: mmap.mmap, spec: Dict[str, int], rows: int) -> List[str]:
+    ends = np.frombuffer(buffer, dtype="<u8", count=rows, offset=spec["offsets"]).tolist()
+    text = buffer[spec["data"] : spec["data"] + spec["length"]].decode("utf-8")
+    return [text[start:end] for start, end in zip([0, *ends], ends)]
+
+
+def _read_json_cells(cells: List[str]) -> List[object]:
+    # One parse for the whole column instead of a json.loads call per row.
+    parsed = iter(json.loads("[" + ",".join(cell for cell in cells if cell) + "]"))
+    return [next(parsed) if cell else _ABSENT for cell in cells]
+
+
+def write_bundle(
+    path: Path,
+    documents: Sequence[Dict[str, object]],
+    vector_keys: Sequence[str],
+    vectors: Optional["np.ndarray"],
+    *,
+    embedding_id: str = "",
+    migrations: Optional[Dict[str, int]] = None,
+    metadata: Optional[Dict[str, object]] = None,
+) -> Dict[str, object]:
+    """Write a bundle atomically and return its footer."""
+
+    _require_numpy()
+    names: List[str] = []
+    for entry in documents:
+        for name in entry:
+            if name not in names:
+                names.append(name)
+
+    dim = int(vectors.shape[1]) if vectors is not None and vectors.ndim == 2 else 0
+    rows = len(vector_keys) if dim else 0
+    footer: Dict[str, object] = {
+        "version": FORMAT_VERSION,
+        "created_at": utcnow_iso(),
+        "documents": len(documents),
+        "embedding_id": embedding_id,
+        "migrations": dict(migrations or {}),
+        **(metadata or {}),
+        "columns": [],
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(MAGIC)
+        for name in names:
+            values = [entry.get(name, _ABSENT) for entry in documents]
+            if all(isinstance(value, str) for value in values):
+                kind, cells = "str", values
+            else:
+                kind = "json"
+                cells = [
+                    "" if value is _ABSENT else json.dumps(value, ensure_ascii=False)
+                    for value in values
+                ]
+            footer["columns"].append({"name": name, "kind": kind, **_write_strings(handle, cells)})
+
+        vector_spec: Dict[str, object] = {"rows": rows, "dim": dim, "dtype": "<f4"}
+        vector_spec["keys"] = _write_strings(handle, list(vector_keys) if rows else [])
+        _pad(handle)
+        vector_spec["offset"] = handle.tell()
+        if rows:
+            matrix = np.ascontiguousarray(vectors[:rows], dtype="<f4")
+            # Write in slices so a large matrix is never duplicated as bytes.
+            step = max(1, (16 * 1024 * 1024) // max(1, dim * 4))
+            for start in range(0, rows, step):
+                handle.write(matrix[start : start + step].tobytes())
+        footer["vectors"] = vector_spec
+
+        encoded = json.dumps(footer, ensure_ascii=False).encode("utf-8")
+        handle.write(encoded)
+        handle.write(_FOOTER_LENGTH.pack(len(encoded)))
+        handle.write(MAGIC)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    return footer
+
+
+def read_header(path: Path) -> Dict[str, object]:
+    """Return the footer of the bundle at ``path`` without reading its blocks."""
+
+    with path.open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        tail = len(MAGIC) + _FOOTER_LENGTH.size
+        if size < len(MAGIC) + tail:
+            raise ValueError(f"{path} is not a RAG bundle.")
+        handle.seek(0)
+        head = handle.read(len(MAGIC))
+        handle.seek(size - tail)
+        (length,) = _FOOTER_LENGTH.unpack(handle.read(_FOOTER_LENGTH.size))
+        if head != MAGIC or handle.read(len(MAGIC)) != MAGIC or length > size - len(MAGIC) - tail:
+            raise ValueError(f"{path} is not a RAG bundle (or is truncated).")
+        handle.seek(size - tail - length)
+        header = json.loads(handle.read(length).decode("utf-8"))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported RAG bundle version {header.get('version')!r} in {path}.")
+    return header
+
+
+def read_bundle(path: Path) -> Bundle:
+    """Decode the documents of ``path`` and memory-map its vector block."""
+
+    _require_numpy()
+    header = read_header(path)
+    with path.open("rb") as handle:
+        # Copy-on-write: the index may reorder rows in place without touching the file.
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    rows = int(header["documents"])
+    columns = []
+    for spec in header["columns"]:
+        values = _read_strings(buffer, spec, rows)
+        if spec["kind"] == "json":
+            values = _read_json_cells(values)
+        columns.append((spec["name"], values))
+    documents: List[Dict[str, object]] = []
+    for position in range(rows):
+        entry: Dict[str, object] = {}
+        for name, values in columns:
+            value = values[position]
+            if value is not _ABSENT:
+                entry[name] = value
+        documents.append(entry)
+
+    vector_spec = header["vectors"]
+    count, dim = int(vector_spec["rows"]), int(vector_spec["dim"])
+    vector_keys = _read_strings(buffer, vector_spec["keys"], count) if count else []
+    vectors = None
+    if count:
+        vectors = np.frombuffer(buffer, dtype=vector_spec["dtype"], count=count * dim, offset=int(vector_spec["offset"]))
+        vectors = vectors.reshape(count, dim)
+    return Bundle(
+        documents=documents,
+        vector_keys=vector_keys,
+        vectors=vectors,
+        embedding_id=str(header.get("embedding_id") or ""),
+        migrations=dict(header.get("migrations") or {}),
+        header=header,
+    )
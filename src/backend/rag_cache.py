@@ -0,0 +1,74 @@
+"""In-memory LRU of RAG query results keyed by corpus generation."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Returned by :meth:`QueryCache.get` on a miss so ``None`` can be cached.
+MISSING = object()
+
+
+def query_key(kind: str, query: str, criteria: Optional[Dict[str, object]], limit: int) -> Tuple[Hashable, ...]:
+    """Cache key for a lookup, ignoring case and whitespace differences in ``query``."""
+
+    normalized = _WHITESPACE.sub(" ", query).strip().casefold()
+    filter_key = json.dumps(criteria or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return kind, normalized, filter_key, limit
+
+
+class QueryCache:
+    """Size-bounded LRU whose entries are only valid for one corpus generation.
+
+    The service bumps its generation on every mutation and passes it with
+    each lookup, so stale results are never served and simply age out of
+    the LRU instead of being invalidated one by one.
+    """
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self._max_entries = max(0, max_entries)
+        self._lock = Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, ...], object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[Hashable, ...], generation: int) -> object:
+        with self._lock:
+            value = self._entries.get((generation, *key), MISSING)
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self._entries.move_to_end((generation, *key))
+                self.hits += 1
+            return value
+
+    def put(self, key: Tuple[Hashable, ...], generation: int, value: object) -> None:
+        if not self._max_entries:
+            return
+        with self._lock:
+            self._entries[(generation, *key)] = value
+            self._entries.move_to_end((generation, *key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
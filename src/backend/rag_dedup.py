@@ -0,0 +1,70 @@
+"""Near-duplicate detection for machine-generated RAG documents."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.backend.rag_lexical import tokenize
+
+# Timestamps, ids and metric values change on every alert of a flapping
+# incident; mask them so only the wording decides similarity.
+_VOLATILE = re.compile(r"\d+")
+_BITS = 64
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over BM25 terms weighted by term frequency."""
+
+    counts = Counter(tokenize(_VOLATILE.sub("0", text)))
+    weights = [0] * _BITS
+    for term, weight in counts.items():
+        value = int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(_BITS):
+            if value >> bit & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+class NearDuplicateIndex:
+    """Lazily computed SimHash signatures keyed by doc_key.
+
+    The service only compares a new document against a bounded window of
+    recent documents in the same scope, so signatures are computed on first
+    use instead of for the whole corpus at startup.
+    """
+
+    def __init__(self, *, max_distance: int = 3) -> None:
+        self._max_distance = max_distance
+        self._signatures: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, doc_key: str, text: str) -> int:
+        value = self._signatures.get(doc_key)
+        if value is None:
+            value = self._signatures[doc_key] = simhash(text)
+        return value
+
+    def remember(self, doc_key: str, signature: int) -> None:
+        self._signatures[doc_key] = signature
+
+    def forget(self, doc_key: str) -> None:
+        self._signatures.pop(doc_key, None)
+
+    def find(self, signature: int, candidates: Iterable[Tuple[str, str]]) -> Optional[str]:
+        """Return the first candidate ``(doc_key, text)`` within ``max_distance`` bits."""
+
+        for doc_key, text in candidates:
+            if hamming(signature, self.signature(doc_key, text)) <= self._max_distance:
+                return doc_key
+        return None
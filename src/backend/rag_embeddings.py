@@ -0,0 +1,295 @@
+"""Embedding helpers for the RAG service: a content-hash cache and a local backend."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:  # Optional dependencies are resolved at runtime
+    import numpy as np
+except ImportError:  # pragma: no cover - fallback when dependencies missing
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger("incident.rag")
+
+_WHITESPACE = re.compile(r"\s+")
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def content_hash(text: str) -> str:
+    """Hash ``text`` after NFC + whitespace normalisation so cosmetic edits hit the cache."""
+
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Size-bounded LRU of embedding vectors persisted as a float32 matrix.
+
+    One cache exists per embedding model: ``<model>.f32`` stores row-major
+    float32 vectors and ``<model>.keys`` stores a ``#dim=`` header followed
+    by the content hash of each row, one per line. New vectors are appended to both files; eviction drops the
+    least recently used rows and rewrites the pair.
+    """
+
+    def __init__(self, cache_dir: Path, model: str, *, max_entries: int = 50_000) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the RAG embedding cache.")
+        self._model = model
+        self._max_entries = max(1, max_entries)
+        safe_name = _UNSAFE_FILENAME.sub("_", model) or "embeddings"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = cache_dir / f"{safe_name}.f32"
+        self._keys_path = cache_dir / f"{safe_name}.keys"
+
+        self._lock = Lock()
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._matrix = None
+        self._size = 0
+        self._dim = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _load(self) -> None:
+        if not self._keys_path.exists() or not self._vectors_path.exists():
+            return
+        try:
+            header, *keys = self._keys_path.read_text(encoding="ascii").splitlines()
+            dim = int(header.split("=", 1)[1]) if header.startswith("#dim=") else 0
+            flat = np.fromfile(self._vectors_path, dtype=np.float32)
+        except Exception:  # pragma: no cover - corrupted cache guard
+            logger.exception("Failed to load embedding cache %s; starting empty.", self._vectors_path)
+            return
+        if dim <= 0:
+            return
+
+        # A torn append leaves extra keys or a partial row; keep complete rows only.
+        rows = min(len(keys), flat.size // dim)
+        self._dim = dim
+        if rows:
+            self._matrix = flat[: rows * dim].reshape(rows, dim).copy()
+            self._size = rows
+            for index, key in enumerate(keys[:rows]):
+                self._rows[key] = index
+        if rows != len(keys) or flat.size != rows * dim or rows > self._max_entries:
+            if rows > self._max_entries:
+                self._evict_locked()
+            self._rewrite_locked()
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        found: List[Optional[List[float]]] = []
+        with self._lock:
+            for key in keys:
+                row = self._rows.get(key)
+                if row is None:
+                    self.misses += 1
+                    found.append(None)
+                    continue
+                self._rows.move_to_end(key)
+                self.hits += 1
+                found.append(self._matrix[row].tolist())
+        return found
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        if not keys:
+            return
+        block = np.asarray(vectors, dtype=np.float32)
+        if block.ndim != 2 or block.shape[0] != len(keys):
+            return
+
+        with self._lock:
+            if self._dim and block.shape[1] != self._dim:
+                logger.warning("Embedding dimension changed for %s; resetting cache.", self._model)
+                self._rows.clear()
+                self._matrix = None
+                self._size = 0
+                self._dim = block.shape[1]
+                self._rewrite_locked()
+            self._dim = block.shape[1]
+
+            fresh = [(key, vector) for key, vector in zip(keys, block) if key not in self._rows]
+            if not fresh:
+                return
+            new_keys = [key for key, _ in fresh]
+            new_block = np.stack([vector for _, vector in fresh])
+            self._append_rows_locked(new_keys, new_block)
+
+            with self._vectors_path.open("ab") as handle:
+                handle.write(new_block.tobytes())
+            if not self._keys_path.exists() or self._keys_path.stat().st_size == 0:
+                self._keys_path.write_text(f"#dim={self._dim}\n", encoding="ascii")
+            with self._keys_path.open("a", encoding="ascii") as handle:
+                handle.write("".join(f"{key}\n" for key in new_keys))
+
+            if len(self._rows) > self._max_entries:
+                self._evict_locked()
+                self._rewrite_locked()
+
+    def _append_rows_locked(self, keys: List[str], block) -> None:
+        needed = self._size + len(keys)
+        if self._matrix is None:
+            self._matrix = np.empty((max(needed, 64), self._dim), dtype=np.float32)
+        elif needed > self._matrix.shape[0]:
+            grown = np.empty((max(needed, self._matrix.shape[0] * 2), self._dim), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._matrix[self._size : needed] = block
+        for offset, key in enumerate(keys):
+            self._rows[key] = self._size + offset
+        self._size = needed
+
+    def _evict_locked(self) -> None:
+        # Evict a little below the bound so rewrites are amortised.
+        target = int(self._max_entries * 0.9)
+        while len(self._rows) > target:
+            self._rows.popitem(last=False)
+            self.evictions += 1
+
+    def _rewrite_locked(self) -> None:
+        keys = list(self._rows)
+        if keys and self._matrix is not None:
+            block = self._matrix[[self._rows[key] for key in keys]]
+        else:
+            block = np.empty((0, self._dim or 0), dtype=np.float32)
+        self._matrix = block.copy() if keys else None
+        self._size = len(keys)
+        self._rows = OrderedDict((key, index) for index, key in enumerate(keys))
+
+        for path, payload in (
+            (self._vectors_path, block.tobytes()),
+            (self._keys_path, "".join([f"#dim={self._dim}\n", *(f"{key}\n" for key in keys)]).encode("ascii")),
+        ):
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model": self._model,
+                "entries": len(self._rows),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class CachedEmbeddings:
+    """Embeddings wrapper that only forwards texts missing from ``cache``.
+
+    Like :class:`HashingEmbeddings` it only implements the ``embed_documents``
+    / ``embed_query`` pair the service calls, so importing this module does
+    not pull in ``langchain_core``.
+    """
+
+    def __init__(self, underlying, cache: EmbeddingCache) -> None:
+        self._underlying = underlying
+        self._cache = cache
+
+    @property
+    def underlying(self):
+        return self._underlying
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [content_hash(text) for text in texts]
+        vectors = self._cache.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None and key not in missing:
+                missing[key] = text
+        if missing:
+            computed = self._underlying.embed_documents(list(missing.values()))
+            self._cache.put_many(list(missing), computed)
+            by_key = dict(zip(missing, computed))
+            vectors = [
+                vector if vector is not None else list(by_key[key])
+                for key, vector in zip(keys, vectors)
+            ]
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._underlying.embed_query(text)
+
+
+class HashingEmbeddings:
+    """Deterministic offline embeddings from hashed character n-grams.
+
+    Each n-gram is hashed (CRC32) to a signed bucket of a ``dim``-wide
+    vector, counts are damped with ``log1p`` and rows are L2-normalised, so
+    FAISS L2 distance ranks like cosine similarity. No network or model
+    files are needed and the same text always maps to the same vector.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (2, 4)) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for local RAG embeddings.")
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    @property
+    def model_name(self) -> str:
+        low, high = self.ngram_range
+        return f"local-hash-{self.dim}-ng{low}{high}"
+
+    def _features(self, text: str) -> Tuple[List[int], List[float]]:
+        normalized = f" {_WHITESPACE.sub(' ', unicodedata.normalize('NFC', text).lower()).strip()} "
+        columns: List[int] = []
+        signs: List[float] = []
+        low, high = self.ngram_range
+        for size in range(low, high + 1):
+            for start in range(len(normalized) - size + 1):
+                digest = zlib.crc32(normalized[start : start + size].encode("utf-8"))
+                columns.append(digest % self.dim)
+                signs.append(1.0 if digest & 0x80000000 else -1.0)
+        return columns, signs
+
+    def _vectorize(self, texts: Sequence[str]):
+        rows: List[int] = []
+        columns: List[int] = []
+        signs: List[float] = []
+        for row, text in enumerate(texts):
+            text_columns, text_signs = self._features(text or "")
+            rows.extend([row] * len(text_columns))
+            columns.extend(text_columns)
+            signs.extend(text_signs)
+
+        # Scatter the sparse (row, column, sign) triples into one dense block.
+        flat = np.bincount(
+            np.asarray(rows, dtype=np.int64) * self.dim + np.asarray(columns, dtype=np.int64),
+            weights=np.asarray(signs, dtype=np.float64),
+            minlength=len(texts) * self.dim,
+        )
+        matrix = flat.reshape(len(texts), self.dim).astype(np.float32)
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._vectorize(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vectorize([text])[0].tolist()
@@ -0,0 +1,125 @@
+"""In-memory secondary indexes over RAG document metadata."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Metadata fields with their own posting lists; single-field lists plus the
+# (scenario_code, status) pair used by recent_actions/build_context.
+_INDEXED_FIELDS = ("scenario_code", "status", "type")
+
+_Posting = List[Tuple[str, str]]
+_IndexKey = Tuple[str, ...]
+
+
+def _index_keys(metadata: Dict[str, object]) -> List[_IndexKey]:
+    keys: List[_IndexKey] = [("*",)]
+    values = {field: metadata.get(field) for field in _INDEXED_FIELDS}
+    for field, value in values.items():
+        if isinstance(value, str):
+            keys.append((field, value))
+    if isinstance(values["scenario_code"], str) and isinstance(values["status"], str):
+        keys.append(("scenario_code+status", values["scenario_code"], values["status"]))
+    return keys
+
+
+class MetadataIndex:
+    """Posting lists of ``(created_at, doc_key)`` kept sorted by creation time.
+
+    Lookups walk a list backwards, so "newest N matching documents" costs
+    O(N) instead of copying and sorting the whole corpus.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[_IndexKey, _Posting] = {}
+        self._registered: Dict[str, Tuple[str, List[_IndexKey]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._registered)
+
+    @staticmethod
+    def _describe(entry: Dict[str, object]) -> Tuple[str, List[_IndexKey]]:
+        created_at = entry.get("created_at")
+        metadata = entry.get("metadata")
+        return (
+            created_at if isinstance(created_at, str) else "",
+            _index_keys(metadata if isinstance(metadata, dict) else {}),
+        )
+
+    def rebuild(self, entries: Iterable[Dict[str, object]]) -> None:
+        self._postings = {}
+        self._registered = {}
+        for entry in entries:
+            doc_key = entry.get("doc_key")
+            if not isinstance(doc_key, str):
+                continue
+            created_at, keys = self._describe(entry)
+            self._registered[doc_key] = (created_at, keys)
+            for key in keys:
+                self._postings.setdefault(key, []).append((created_at, doc_key))
+        for posting in self._postings.values():
+            posting.sort()
+
+    def add(self, entry: Dict[str, object]) -> None:
+        doc_key = entry.get("doc_key")
+        if not isinstance(doc_key, str):
+            return
+        created_at, keys = self._describe(entry)
+        previous = self._registered.get(doc_key)
+        if previous == (created_at, keys):
+            return
+        if previous is not None:
+            self.remove(doc_key)
+        self._registered[doc_key] = (created_at, keys)
+        for key in keys:
+            insort(self._postings.setdefault(key, []), (created_at, doc_key))
+
+    update = add
+
+    def remove(self, doc_key: str) -> None:
+        previous = self._registered.pop(doc_key, None)
+        if previous is None:
+            return
+        created_at, keys = previous
+        item = (created_at, doc_key)
+        for key in keys:
+            posting = self._postings.get(key)
+            if not posting:
+                continue
+            position = bisect_left(posting, item)
+            if position < len(posting) and posting[position] == item:
+                del posting[position]
+            if not posting:
+                del self._postings[key]
+
+    def _posting_for(self, criteria: Dict[str, object]) -> Tuple[_Posting, Dict[str, object]]:
+        """Pick the narrowest posting list and return the criteria it does not cover."""
+
+        scenario_code = criteria.get("scenario_code")
+        status = criteria.get("status")
+        if isinstance(scenario_code, str) and isinstance(status, str):
+            key: _IndexKey = ("scenario_code+status", scenario_code, status)
+            covered = {"scenario_code", "status"}
+        else:
+            candidates = [
+                ((field, value), {field})
+                for field, value in criteria.items()
+                if field in _INDEXED_FIELDS and isinstance(value, str)
+            ]
+            if candidates:
+                key, covered = min(candidates, key=lambda item: len(self._postings.get(item[0], ())))
+            else:
+                key, covered = ("*",), set()
+        remaining = {field: value for field, value in criteria.items() if field not in covered}
+        return self._postings.get(key, []), remaining
+
+    def lookup(self, criteria: Optional[Dict[str, object]] = None) -> Tuple[Iterator[str], Dict[str, object]]:
+        """Return doc_keys newest first plus the criteria still to be checked.
+
+        Criteria on indexed fields are satisfied by the chosen posting list;
+        the caller compares the returned remainder against each document.
+        """
+
+        posting, remaining = self._posting_for(criteria or {})
+        return (doc_key for _, doc_key in reversed(posting)), remaining
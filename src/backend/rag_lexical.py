@@ -0,0 +1,158 @@
+"""Lexical (BM25) retrieval for mixed Korean/English RAG documents."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_HANGUL_OR_CJK = re.compile(r"[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into BM25 terms.
+
+    Latin/digit words are kept whole (lowercased). Runs containing Hangul or
+    CJK characters become overlapping character bigrams, so Korean particles
+    and compound nouns still match ("로드밸런서" vs "로드 밸런서").
+    """
+
+    if not text:
+        return []
+    terms: List[str] = []
+    for word in _WORD.findall(unicodedata.normalize("NFC", text).lower()):
+        if not _HANGUL_OR_CJK.search(word):
+            terms.append(word)
+            continue
+        if len(word) == 1:
+            terms.append(word)
+            continue
+        terms.extend(word[index : index + 2] for index in range(len(word) - 1))
+    return terms
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], *, k: int = 60) -> List[str]:
+    """Merge ranked doc_key lists with RRF (score = sum of 1 / (k + rank))."""
+
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_key in enumerate(ranking, start=1):
+            scores[doc_key] = scores.get(doc_key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda doc_key: scores[doc_key], reverse=True)
+
+
+class BM25Index:
+    """Incrementally maintained inverted index scored with Okapi BM25."""
+
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._doc_keys: Dict[int, str] = {}
+        self._next_id = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, doc_key: object) -> bool:
+        return doc_key in self._doc_ids
+
+    def add(self, doc_key: str, text: str) -> None:
+        if doc_key in self._doc_ids:
+            self.remove(doc_key)
+        doc_id = self._next_id
+        self._next_id += 1
+        self._doc_ids[doc_key] = doc_id
+        self._doc_keys[doc_id] = doc_key
+
+        counts = Counter(tokenize(text))
+        length = sum(counts.values())
+        self._lengths[doc_id] = length
+        self._doc_terms[doc_id] = tuple(counts)
+        self._total_length += length
+        for term, frequency in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        for doc_key, text in items:
+            self.add(doc_key, text)
+
+    def remove(self, doc_key: str) -> None:
+        doc_id = self._doc_ids.pop(doc_key, None)
+        if doc_id is None:
+            return
+        del self._doc_keys[doc_id]
+        self._total_length -= self._lengths.pop(doc_id, 0)
+        for term in self._doc_terms.pop(doc_id, ()):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(doc_key, score)`` pairs, best first."""
+
+        if not self._doc_ids or limit <= 0:
+            return []
+        total_docs = len(self._doc_ids)
+        average_length = self._total_length / total_docs or 1.0
+
+        terms = sorted(
+            (posting for posting in (self._postings.get(term) for term in set(tokenize(query))) if posting),
+            key=len,
+        )
+        if not terms:
+            return []
+        # Very common terms carry little IDF; only let them re-score documents
+        # already matched by rarer terms instead of walking their postings.
+        # A query made only of such terms has no lexical signal, so callers
+        # fall back to their recency ordering.
+        cutoff = max(1000, total_docs // 10)
+        driving = [posting for posting in terms if len(posting) <= cutoff]
+        if not driving:
+            return []
+        boosting = terms[len(driving):]
+
+        scores: Dict[int, float] = {}
+        for posting in driving:
+            self._accumulate(scores, posting, posting.items(), total_docs, average_length)
+        for posting in boosting:
+            matched = [(doc_id, posting[doc_id]) for doc_id in scores if doc_id in posting]
+            self._accumulate(scores, posting, matched, total_docs, average_length)
+
+        ranked = (
+            (score, self._doc_keys[doc_id])
+            for doc_id, score in scores.items()
+            if accept is None or accept(self._doc_keys[doc_id])
+        )
+        return [(doc_key, score) for score, doc_key in heapq.nlargest(limit, ranked)]
+
+    def _accumulate(
+        self,
+        scores: Dict[int, float],
+        posting: Dict[int, int],
+        hits: Iterable[Tuple[int, int]],
+        total_docs: int,
+        average_length: float,
+    ) -> None:
+        idf = math.log(1.0 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+        k1, b = self._k1, self._b
+        for doc_id, frequency in hits:
+            norm = k1 * (1.0 - b + b * self._lengths[doc_id] / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1.0) / (frequency + norm)
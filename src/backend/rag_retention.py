@@ -0,0 +1,122 @@
+"""Retention rules that bound how long RAG documents are kept."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.incident_console.config import (
+    get_rag_retention_interval,
+    get_rag_retention_max_age_days,
+    get_rag_retention_max_per_scenario,
+)
+
+_OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Which documents may be evicted from the corpus.
+
+    ``max_age_days`` maps a document type to the number of days since its
+    last activity (creation, last merged duplicate or recovery) after which
+    it is evicted. ``max_per_scenario`` keeps only the most recent documents
+    of each scenario_code. Types in ``keep_types`` and, with
+    ``keep_recovered``, actions whose recovery was confirmed are never
+    evicted and do not count towards the per-scenario cap.
+    """
+
+    max_age_days: Dict[str, float] = field(default_factory=dict)
+    max_per_scenario: Optional[int] = None
+    keep_types: Tuple[str, ...] = ("scenario", "uploaded")
+    keep_recovered: bool = True
+    interval_seconds: float = 3600.0
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        return cls(
+            max_age_days=get_rag_retention_max_age_days(),
+            max_per_scenario=get_rag_retention_max_per_scenario(),
+            interval_seconds=get_rag_retention_interval(),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_age_days) or bool(self.max_per_scenario)
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "max_age_days": dict(self.max_age_days),
+            "max_per_scenario": self.max_per_scenario,
+            "keep_types": list(self.keep_types),
+            "keep_recovered": self.keep_recovered,
+            "interval_seconds": self.interval_seconds,
+        }
+
+    def protects(self, entry: Dict[str, object]) -> bool:
+        metadata = entry.get("metadata")
+        metadata = metadata if isinstance(metadata, dict) else {}
+        if (entry.get("type") or metadata.get("type")) in self.keep_types:
+            return True
+        return self.keep_recovered and metadata.get("recovery_status") == "recovered"
+
+
+def _parse_timestamp(value: object) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def last_activity(entry: Dict[str, object]) -> Optional[datetime]:
+    """Most recent of the entry's creation, merged-duplicate and recovery times."""
+
+    metadata = entry.get("metadata")
+    metadata = metadata if isinstance(metadata, dict) else {}
+    stamps = [
+        _parse_timestamp(value)
+        for value in (entry.get("created_at"), metadata.get("last_seen"), metadata.get("recovered_at"))
+    ]
+    stamps = [stamp for stamp in stamps if stamp is not None]
+    return max(stamps) if stamps else None
+
+
+def plan_evictions(
+    entries: Iterable[Dict[str, object]],
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+) -> Dict[str, str]:
+    """Return ``{doc_key: reason}`` for the top-level documents ``policy`` evicts.
+
+    Passages are not listed; they follow their parent document.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    evictions: Dict[str, str] = {}
+    by_scenario: Dict[str, List[Tuple[datetime, str]]] = {}
+    for entry in entries:
+        metadata = entry.get("metadata")
+        metadata = metadata if isinstance(metadata, dict) else {}
+        doc_key = entry.get("doc_key")
+        if not isinstance(doc_key, str) or metadata.get("parent_key") or policy.protects(entry):
+            continue
+        seen = last_activity(entry)
+        max_age = policy.max_age_days.get(str(entry.get("type") or metadata.get("type") or ""))
+        if max_age is not None and seen is not None and now - seen > timedelta(days=max_age):
+            evictions[doc_key] = "max_age"
+            continue
+        scenario_code = entry.get("scenario_code") or metadata.get("scenario_code")
+        if policy.max_per_scenario and isinstance(scenario_code, str) and scenario_code:
+            by_scenario.setdefault(scenario_code, []).append((seen or _OLDEST, doc_key))
+
+    cap = policy.max_per_scenario or 0
+    for documents in by_scenario.values():
+        if len(documents) > cap:
+            documents.sort(reverse=True)
+            for _, doc_key in documents[cap:]:
+                evictions[doc_key] = "max_per_scenario"
+    return evictions
@@ -0,0 +1,367 @@
+"""Persistence for the RAG service: document journal/snapshots and index generations."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("incident.rag")
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class DocumentJournal:
+    """Persist document mutations as JSONL records and compact them into snapshots.
+
+    Every mutation is appended to ``<snapshot>.journal.jsonl`` with a
+    monotonically increasing ``seq`` so a write costs the size of one entry.
+    Compaction writes the full corpus to a temporary file and atomically
+    swaps it in, keeping the previous snapshot as ``.prev`` together with the
+    journal records it still needs. A torn snapshot therefore falls back to
+    ``.prev`` plus the journal tail, and a torn final journal line is dropped.
+
+    The snapshot header also carries a ``migrations`` map (name -> version)
+    recording one-time corpus rewrites already applied, so loaders can skip
+    them on later starts.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        *,
+        compact_threshold: int = 1000,
+        fsync: bool = False,
+    ) -> None:
+        self._snapshot_path = snapshot_path
+        self._previous_path = snapshot_path.with_name(snapshot_path.name + ".prev")
+        self._journal_path = snapshot_path.with_name(snapshot_path.stem + ".journal.jsonl")
+        self._compact_threshold = max(1, compact_threshold)
+        self._fsync = fsync
+
+        self._lock = Lock()
+        self._compact_lock = Lock()
+        self._handle = None
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._pending_records = 0
+        self._migrations: Dict[str, int] = {}
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def migrations(self) -> Dict[str, int]:
+        """Migrations recorded in the loaded snapshot (or marked since)."""
+
+        return dict(self._migrations)
+
+    def mark_migrated(self, name: str, version: int) -> None:
+        """Record ``name`` at ``version``; persisted by the next :meth:`compact`."""
+
+        self._migrations[name] = version
+
+    @property
+    def journal_path(self) -> Path:
+        return self._journal_path
+
+    # ------------------------------------------------------------------ #
+    # Loading
+    # ------------------------------------------------------------------ #
+
+    def load(self) -> Dict[str, Dict[str, object]]:
+        """Return the corpus rebuilt from the latest valid snapshot and journal."""
+
+        documents: Dict[str, Dict[str, object]] = {}
+        snapshot = self._read_snapshot(self._snapshot_path)
+        if snapshot is None and self._previous_path.exists():
+            logger.warning("RAG snapshot %s unreadable; falling back to %s.", self._snapshot_path, self._previous_path)
+            snapshot = self._read_snapshot(self._previous_path)
+
+        if snapshot is not None:
+            self._snapshot_seq, entries, self._migrations = snapshot
+            for entry in entries:
+                key = entry.get("doc_key") if isinstance(entry, dict) else None
+                if isinstance(key, str):
+                    documents[key] = entry
+        self._seq = self._snapshot_seq
+
+        replayed = 0
+        for record in self._read_journal():
+            seq = record.get("seq")
+            if not isinstance(seq, int):
+                continue
+            self._seq = max(self._seq, seq)
+            if seq <= self._snapshot_seq:
+                continue
+            self._apply(documents, record)
+            replayed += 1
+
+        self._pending_records = replayed
+        if replayed:
+            logger.info("Replayed %d RAG journal record(s) on top of snapshot.", replayed)
+        return documents
+
+    @staticmethod
+    def _read_snapshot(path: Path) -> Optional[Tuple[int, List[Dict[str, object]], Dict[str, int]]]:
+        if not path.exists():
+            return None
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:  # pragma: no cover - torn/corrupted snapshot guard
+            logger.exception("Failed to read RAG snapshot %s", path)
+            return None
+
+        # Legacy corpora are a bare list of entries without a sequence number.
+        if isinstance(raw, list):
+            return 0, raw, {}
+        if isinstance(raw, dict) and isinstance(raw.get("documents"), list):
+            seq = raw.get("seq")
+            migrations = raw.get("migrations")
+            if not isinstance(migrations, dict):
+                migrations = {}
+            return (
+                seq if isinstance(seq, int) else 0,
+                raw["documents"],
+                {name: value for name, value in migrations.items() if isinstance(value, int)},
+            )
+        logger.error("Unexpected RAG snapshot layout in %s", path)
+        return None
+
+    def _read_journal(self) -> Iterable[Dict[str, object]]:
+        if not self._journal_path.exists():
+            return []
+
+        records: List[Dict[str, object]] = []
+        valid_bytes = 0
+        with self._journal_path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if isinstance(record, dict):
+                    records.append(record)
+                valid_bytes += len(line)
+
+        size = self._journal_path.stat().st_size
+        if valid_bytes < size:
+            # Drop a torn tail so the next append starts on a clean line.
+            logger.warning(
+                "Discarding %d trailing byte(s) from torn RAG journal %s",
+                size - valid_bytes,
+                self._journal_path,
+            )
+            with self._journal_path.open("r+b") as handle:
+                handle.truncate(valid_bytes)
+        return records
+
+    @staticmethod
+    def _apply(documents: Dict[str, Dict[str, object]], record: Dict[str, object]) -> None:
+        op = record.get("op")
+        if op == "put":
+            entry = record.get("doc")
+            if isinstance(entry, dict) and isinstance(entry.get("doc_key"), str):
+                documents[entry["doc_key"]] = entry
+        elif op == "delete":
+            key = record.get("doc_key")
+            if isinstance(key, str):
+                documents.pop(key, None)
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+
+    def put(self, entry: Dict[str, object]) -> int:
+        return self._append({"op": "put", "doc": entry})
+
+    def put_many(self, entries: Iterable[Dict[str, object]]) -> int:
+        """Journal several entries with a single write and flush."""
+
+        return self._append_many({"op": "put", "doc": entry} for entry in entries)
+
+    def delete(self, doc_key: str) -> int:
+        return self._append({"op": "delete", "doc_key": doc_key})
+
+    def delete_many(self, doc_keys: Iterable[str]) -> int:
+        """Journal several deletions with a single write and flush."""
+
+        return self._append_many({"op": "delete", "doc_key": doc_key} for doc_key in doc_keys)
+
+    def _append(self, record: Dict[str, object]) -> int:
+        return self._append_many([record])
+
+    def _append_many(self, records: Iterable[Dict[str, object]]) -> int:
+        with self._lock:
+            lines: List[str] = []
+            for record in records:
+                self._seq += 1
+                lines.append(
+                    json.dumps({"seq": self._seq, **record}, ensure_ascii=False, separators=(",", ":")) + "\n"
+                )
+            if not lines:
+                return self._seq
+            handle = self._open_handle()
+            handle.write("".join(lines).encode("utf-8"))
+            handle.flush()
+            if self._fsync:
+                os.fsync(handle.fileno())
+            self._pending_records += len(lines)
+            return self._seq
+
+    def _open_handle(self):
+        if self._handle is None:
+            self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self._journal_path.open("ab")
+        return self._handle
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    # ------------------------------------------------------------------ #
+    # Compaction
+    # ------------------------------------------------------------------ #
+
+    def needs_compaction(self) -> bool:
+        return self._pending_records >= self._compact_threshold
+
+    def compact(self, entries: List[Dict[str, object]], seq: int) -> None:
+        """Write ``entries`` (the corpus as of journal ``seq``) as the new snapshot.
+
+        Entries must not be mutated while this runs; the service replaces
+        entries instead of editing them so a shallow list copy is enough.
+        """
+
+        with self._compact_lock:
+            if seq < self._snapshot_seq:
+                return
+            previous_seq = self._snapshot_seq
+            payload = {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "seq": seq,
+                "migrations": dict(self._migrations),
+                "documents": entries,
+            }
+            tmp_path = self._snapshot_path.with_name(self._snapshot_path.name + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+                handle.flush()
+                os.fsync(handle.fileno())
+
+            if self._snapshot_path.exists():
+                os.replace(self._snapshot_path, self._previous_path)
+            os.replace(tmp_path, self._snapshot_path)
+            self._snapshot_seq = seq
+            # Keep every record newer than the previous snapshot so a torn
+            # current snapshot can still be recovered from ``.prev``.
+            self._trim_journal(previous_seq)
+
+    def _trim_journal(self, keep_after: int) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if not self._journal_path.exists():
+                self._pending_records = max(0, self._seq - self._snapshot_seq)
+                return
+
+            tmp_path = self._journal_path.with_name(self._journal_path.name + ".tmp")
+            with self._journal_path.open("rb") as source, tmp_path.open("wb") as target:
+                for line in source:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get("seq", 0) > keep_after:
+                        target.write(line)
+                target.flush()
+                os.fsync(target.fileno())
+            os.replace(tmp_path, self._journal_path)
+            self._pending_records = max(0, self._seq - self._snapshot_seq)
+
+
+class IndexGenerations:
+    """Versioned FAISS index directories behind an atomically swapped pointer.
+
+    Each rebuild writes ``index-<generation>/`` next to the corpus and then
+    replaces ``index.current`` (a one-line file naming that directory) with
+    ``os.replace``. Readers resolve the pointer once per load, so a crash
+    mid-build leaves the previous generation live. A bare ``index.faiss`` in
+    the base directory from older releases is treated as generation 0.
+    """
+
+    POINTER_NAME = "index.current"
+    PREFIX = "index-"
+
+    def __init__(self, base_dir: Path, *, keep: int = 2) -> None:
+        self._base_dir = base_dir
+        self._pointer_path = base_dir / self.POINTER_NAME
+        self._keep = max(1, keep)
+        self._allocate_lock = Lock()
+        self._allocated = 0
+
+    def current(self) -> Tuple[int, Path]:
+        """Return the live ``(generation, directory)``."""
+
+        try:
+            name = self._pointer_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            name = ""
+        generation = self._parse(name)
+        if generation is not None and (self._base_dir / name).is_dir():
+            return generation, self._base_dir / name
+        return 0, self._base_dir
+
+    def path_for(self, generation: int) -> Path:
+        return self._base_dir / f"{self.PREFIX}{generation:06d}"
+
+    def next_generation(self) -> int:
+        """Reserve a generation number no other caller has been (or will be) given.
+
+        A builder creates its directory only after embedding the corpus, so
+        the directories on disk alone would hand the same number to a
+        concurrent bundle import; the counter remembers reservations.
+        """
+
+        with self._allocate_lock:
+            existing = [self._parse(path.name) for path in self._base_dir.glob(f"{self.PREFIX}*")]
+            on_disk = max([self.current()[0], *(value for value in existing if value is not None)])
+            self._allocated = max(self._allocated, on_disk) + 1
+            return self._allocated
+
+    def publish(self, generation: int) -> None:
+        """Atomically point readers at ``generation`` and prune old directories."""
+
+        tmp_path = self._pointer_path.with_name(self.POINTER_NAME + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write(self.path_for(generation).name + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self._pointer_path)
+        self._prune(generation)
+
+    def discard(self, generation: int) -> None:
+        shutil.rmtree(self.path_for(generation), ignore_errors=True)
+
+    def _prune(self, live: int) -> None:
+        for path in self._base_dir.glob(f"{self.PREFIX}*"):
+            generation = self._parse(path.name)
+            if generation is not None and generation <= live - self._keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    @classmethod
+    def _parse(cls, name: str) -> Optional[int]:
+        if not name.startswith(cls.PREFIX):
+            return None
+        suffix = name[len(cls.PREFIX):]
+        return int(suffix) if suffix.isdigit() else None
@@ -0,0 +1,604 @@
+"""Vector index engines for the RAG service.
+
+Engines map doc_keys to embedding vectors and answer (optionally
+candidate-restricted) nearest-neighbour queries by L2 distance; documents
+and metadata stay in the service's corpus. ``numpy`` is an exact
+brute-force matrix for small corpora, ``faiss`` an exact flat FAISS index,
+and ``faiss-ivfpq`` a compressed, approximate IVF-PQ index for large
+archives.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:  # Optional dependencies are resolved at runtime
+    import numpy as np
+except ImportError:  # pragma: no cover - fallback when dependencies missing
+    np = None  # type: ignore[assignment]
+
+from src.backend.lazy import optional_import
+
+# Bound by _faiss_available() on first use so importing this module does
+# not pay for loading FAISS.
+faiss = None
+
+logger = logging.getLogger("incident.rag")
+
+ENGINES = ("numpy", "faiss", "faiss-ivfpq")
+META_NAME = "vectors.json"
+# Files written by langchain_community's FAISS.save_local in older releases.
+LEGACY_INDEX_NAME = "index.faiss"
+LEGACY_DOCSTORE_NAME = "index.pkl"
+
+
+def _faiss_available() -> bool:
+    global faiss
+    if faiss is None:
+        faiss = optional_import("faiss")
+    return faiss is not None
+
+
+def engine_available(engine: str) -> bool:
+    if engine == "numpy":
+        return np is not None
+    return engine in ENGINES and np is not None and _faiss_available()
+
+
+def create_vector_index(engine: str, dim: int) -> "VectorIndex":
+    """Return an empty index of ``engine`` for ``dim``-dimensional vectors."""
+
+    if not engine_available(engine):
+        raise RuntimeError(f"RAG vector engine {engine!r} is unavailable (numpy/faiss missing?).")
+    return _ENGINE_CLASSES[engine](dim)
+
+
+def vector_index_from_matrix(engine: str, doc_keys: Sequence[str], matrix: "np.ndarray") -> "VectorIndex":
+    """Return an ``engine`` index holding ``matrix`` (one row per doc_key)."""
+
+    if not engine_available(engine):
+        raise RuntimeError(f"RAG vector engine {engine!r} is unavailable (numpy/faiss missing?).")
+    return _ENGINE_CLASSES[engine].from_matrix(doc_keys, matrix)
+
+
+def load_vector_index(path: Path) -> Optional["VectorIndex"]:
+    """Load the index saved in ``path``; ``None`` when the directory holds none."""
+
+    meta_path = path / META_NAME
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    engine = meta.get("engine")
+    if not engine_available(engine):
+        raise RuntimeError(f"RAG vector engine {engine!r} is unavailable (numpy/faiss missing?).")
+    index = _ENGINE_CLASSES[engine]._load(path, meta)
+    if len(index) != len(meta.get("keys", ())):
+        raise ValueError(f"Vector index in {path} is torn ({len(index)} vectors, {len(meta['keys'])} keys).")
+    return index
+
+
+def load_legacy_vectors(path: Path) -> Optional[Tuple[List[str], "np.ndarray"]]:
+    """Read ``(doc_keys, vectors)`` from a langchain ``save_local`` directory.
+
+    The docstore pickle needs langchain_community importable; without it
+    (or without the files) ``None`` is returned and the caller rebuilds.
+    """
+
+    index_path = path / LEGACY_INDEX_NAME
+    docstore_path = path / LEGACY_DOCSTORE_NAME
+    if not _faiss_available() or not index_path.exists() or not docstore_path.exists():
+        return None
+    index = faiss.read_index(str(index_path))
+    with docstore_path.open("rb") as handle:
+        docstore, index_to_docstore_id = pickle.load(handle)
+    store = getattr(docstore, "_dict", {})
+
+    labels: List[int] = []
+    keys: List[str] = []
+    for label, docstore_id in index_to_docstore_id.items():
+        document = store.get(docstore_id)
+        metadata = getattr(document, "metadata", None)
+        doc_key = metadata.get("doc_key") if isinstance(metadata, dict) else None
+        if isinstance(doc_key, str):
+            labels.append(label)
+            keys.append(doc_key)
+    vectors = index.reconstruct_n(0, index.ntotal) if index.ntotal else np.empty((0, index.d), dtype=np.float32)
+    return keys, vectors[labels] if labels else vectors[:0]
+
+
+def _as_matrix(vectors: Sequence[Sequence[float]], dim: int) -> "np.ndarray":
+    matrix = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32).reshape(-1, dim))
+    return matrix
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+class VectorIndex:
+    """doc_key -> vector index queried by L2 distance.
+
+    Not thread-safe: the service serialises writers and lets concurrent
+    readers search only while no writer runs.
+    """
+
+    engine = ""
+    exact = True
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, doc_key: object) -> bool:
+        raise NotImplementedError
+
+    def keys(self) -> List[str]:
+        raise NotImplementedError
+
+    def add(self, doc_keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Insert vectors; keys must not be indexed already."""
+
+        raise NotImplementedError
+
+    def remove(self, doc_keys: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def compact(self) -> None:
+        """Release memory still held for removed vectors; a no-op where removal already does."""
+
+    @classmethod
+    def from_matrix(cls, doc_keys: Sequence[str], matrix: "np.ndarray") -> "VectorIndex":
+        index = cls(int(matrix.shape[1]))
+        if len(doc_keys):
+            index.add(doc_keys, matrix)
+        return index
+
+    def to_matrix(self) -> Tuple[List[str], "np.ndarray"]:
+        """Return ``(doc_keys, vectors)`` with row ``i`` holding ``doc_keys[i]``."""
+
+        raise NotImplementedError
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int,
+        candidates: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Nearest ``k`` ``(doc_key, distance)`` pairs, restricted to ``candidates`` when given."""
+
+        raise NotImplementedError
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by vectors and their ids."""
+
+        raise NotImplementedError
+
+    def save(self, path: Path) -> None:
+        """Write the index into ``path``; the metadata file goes last."""
+
+        path.mkdir(parents=True, exist_ok=True)
+        meta = {"engine": self.engine, "dim": self.dim, **self._save_payload(path)}
+        _write_atomic(path / META_NAME, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def _save_payload(self, path: Path) -> Dict[str, object]:
+        raise NotImplementedError
+
+    @classmethod
+    def _load(cls, path: Path, meta: Dict[str, object]) -> "VectorIndex":
+        raise NotImplementedError
+
+
+class NumpyVectorIndex(VectorIndex):
+    """Brute-force float32 matrix; exact and free of FAISS for small corpora."""
+
+    engine = "numpy"
+
+    def __init__(self, dim: int) -> None:
+        super().__init__(dim)
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, doc_key: object) -> bool:
+        return doc_key in self._rows
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def add(self, doc_keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        block = _as_matrix(vectors, self.dim)
+        size = len(self._keys)
+        needed = size + len(block)
+        if needed > len(self._matrix):
+            # Grow geometrically so one-at-a-time inserts stay amortised O(1).
+            capacity = max(needed, 2 * len(self._matrix), 64)
+            matrix = np.empty((capacity, self.dim), dtype=np.float32)
+            matrix[:size] = self._matrix[:size]
+            norms = np.empty(capacity, dtype=np.float32)
+            norms[:size] = self._norms[:size]
+            self._matrix, self._norms = matrix, norms
+        self._matrix[size:needed] = block
+        self._norms[size:needed] = np.einsum("ij,ij->i", block, block)
+        for offset, doc_key in enumerate(doc_keys):
+            self._rows[doc_key] = size + offset
+        self._keys.extend(doc_keys)
+
+    def remove(self, doc_keys: Iterable[str]) -> int:
+        removed = 0
+        for doc_key in doc_keys:
+            row = self._rows.pop(doc_key, None)
+            if row is None:
+                continue
+            # Move the last row into the hole so the live rows stay dense.
+            last = len(self._keys) - 1
+            if row != last:
+                moved = self._keys[last]
+                self._matrix[row] = self._matrix[last]
+                self._norms[row] = self._norms[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._keys.pop()
+            removed += 1
+        return removed
+
+    def compact(self) -> None:
+        size = len(self._keys)
+        if len(self._matrix) > size:
+            self._matrix = self._matrix[:size].copy()
+            self._norms = self._norms[:size].copy()
+
+    @classmethod
+    def from_matrix(cls, doc_keys: Sequence[str], matrix: "np.ndarray") -> "NumpyVectorIndex":
+        # Adopt a float32 matrix as is, so a memory-mapped block stays mapped
+        # instead of being copied; it is replaced on the first growth.
+        index = cls(int(matrix.shape[1]))
+        if matrix.dtype != np.float32 or not matrix.flags.c_contiguous or not matrix.flags.writeable:
+            matrix = np.array(matrix, dtype=np.float32)
+        index._matrix = matrix[: len(doc_keys)]
+        index._norms = np.einsum("ij,ij->i", index._matrix, index._matrix)
+        index._keys = list(doc_keys)
+        index._rows = {doc_key: row for row, doc_key in enumerate(index._keys)}
+        return index
+
+    def to_matrix(self) -> Tuple[List[str], "np.ndarray"]:
+        return list(self._keys), self._matrix[: len(self._keys)].copy()
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int,
+        candidates: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        size = len(self._keys)
+        if candidates is None:
+            rows = None
+            matrix, norms = self._matrix[:size], self._norms[:size]
+        else:
+            rows = np.fromiter(
+                (row for row in map(self._rows.get, candidates) if row is not None),
+                dtype=np.int64,
+            )
+            matrix, norms = self._matrix[rows], self._norms[rows]
+        k = min(k, len(norms))
+        if k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2
+        distances = norms - 2.0 * (matrix @ query) + float(query @ query)
+        top = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        top = top[np.argsort(distances[top], kind="stable")]
+        found = rows[top] if rows is not None else top
+        return [(self._keys[row], float(distances[position])) for row, position in zip(found, top)]
+
+    def memory_bytes(self) -> int:
+        return int(self._matrix.nbytes + self._norms.nbytes)
+
+    def _save_payload(self, path: Path) -> Dict[str, object]:
+        with (path / "vectors.npy.tmp").open("wb") as handle:
+            np.save(handle, self._matrix[: len(self._keys)])
+        os.replace(path / "vectors.npy.tmp", path / "vectors.npy")
+        return {"keys": self._keys}
+
+    @classmethod
+    def _load(cls, path: Path, meta: Dict[str, object]) -> "NumpyVectorIndex":
+        index = cls(int(meta["dim"]))
+        matrix = np.load(path / "vectors.npy")
+        keys = list(meta["keys"])
+        if len(matrix) == len(keys):
+            index.add(keys, matrix)
+        return index
+
+
+class FaissVectorIndex(VectorIndex):
+    """Exact FAISS flat index with sequential int64 ids mapped to doc_keys."""
+
+    engine = "faiss"
+
+    def __init__(self, dim: int, index: Optional[object] = None) -> None:
+        super().__init__(dim)
+        self._index = index if index is not None else faiss.IndexIDMap2(faiss.IndexFlatL2(dim))
+        self._ids: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, doc_key: object) -> bool:
+        return doc_key in self._ids
+
+    def keys(self) -> List[str]:
+        return list(self._ids)
+
+    def add(self, doc_keys: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        block = _as_matrix(vectors, self.dim)
+        ids = np.arange(self._next_id, self._next_id + len(block), dtype=np.int64)
+        self._add_block(block, ids)
+        for label, doc_key in zip(ids.tolist(), doc_keys):
+            self._ids[doc_key] = label
+            self._keys[label] = doc_key
+        self._next_id += len(block)
+
+    def _add_block(self, block: "np.ndarray", ids: "np.ndarray") -> None:
+        self._index.add_with_ids(block, ids)
+
+    def remove(self, doc_keys: Iterable[str]) -> int:
+        labels = [self._ids.pop(doc_key) for doc_key in doc_keys if doc_key in self._ids]
+        if labels:
+            self._index.remove_ids(faiss.IDSelectorBatch(np.asarray(labels, dtype=np.int64)))
+            for label in labels:
+                del self._keys[label]
+        return len(labels)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int,
+        candidates: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        params = None
+        available = len(self._ids)
+        if candidates is not None:
+            labels = np.fromiter(
+                (label for label in map(self._ids.get, candidates) if label is not None),
+                dtype=np.int64,
+            )
+            available = int(labels.size)
+            if available:
+                params = self._search_params(faiss.IDSelectorBatch(labels), available)
+        k = min(k, available)
+        if k <= 0:
+            return []
+        query = np.asarray([vector], dtype=np.float32)
+        distances, labels = self._index.search(query, k, params=params)
+        return [
+            (self._keys[label], float(distance))
+            for label, distance in zip(labels[0].tolist(), distances[0].tolist())
+            if label >= 0
+        ]
+
+    def _search_params(self, selector: object, candidates: int) -> object:
+        return faiss.SearchParameters(sel=selector)
+
+    def to_matrix(self) -> Tuple[List[str], "np.ndarray"]:
+        keys = list(self._ids)
+        if not keys:
+            return keys, np.empty((0, self.dim), dtype=np.float32)
+        labels = np.fromiter(self._ids.values(), dtype=np.int64, count=len(keys))
+        return keys, self._reconstruct(labels)
+
+    def _reconstruct(self, labels: "np.ndarray") -> "np.ndarray":
+        return self._index.reconstruct_batch(labels)
+
+    def memory_bytes(self) -> int:
+        # Flat vectors plus the id map and its reverse map.
+        return int(len(self._ids) * (self.dim * 4 + 16))
+
+    def _save_payload(self, path: Path) -> Dict[str, object]:
+        tmp_path = path / "vectors.faiss.tmp"
+        faiss.write_index(self._index, str(tmp_path))
+        os.replace(tmp_path, path / "vectors.faiss")
+        return {"keys": {doc_key: label for doc_key, label in self._ids.items()}, "next_id": self._next_id}
+
+    @classmethod
+    def _load(cls, path: Path, meta: Dict[str, object]) -> "FaissVectorIndex":
+        index = cls(int(meta["dim"]), faiss.read_index(str(path / "vectors.faiss")))
+        index._ids = {str(doc_key): int(label) for doc_key, label in meta["keys"].items()}
+        index._keys = {label: doc_key for doc_key, label in index._ids.items()}
+        index._next_id = int(meta.get("next_id") or len(index._ids))
+        if index._index.ntotal != len(index._ids):
+            # Vectors and key map disagree; report a torn index to the caller.
+            index._ids = {}
+        return index
+
+
+class FaissIVFPQVectorIndex(FaissVectorIndex):
+    """Inverted lists of product-quantised codes for large archives.
+
+    Codes take ``m`` bytes per vector instead of ``4 * dim``. PQ distances
+    alone rank poorly, so by default ``k * refine_factor`` candidates are
+    re-ranked against 8-bit scalar-quantised copies (``dim`` bytes per
+    vector, still a quarter of the flat index). Until ``train_size``
+    vectors exist the index stays flat and exact; it is then trained on
+    everything it holds. Background rebuilds retrain on the full corpus.
+
+    Once trained, the IVF index keeps the int64 ids itself rather than
+    sitting behind an ``IndexIDMap2``: removals leave gaps in the inverted
+    lists, which the id map cannot follow.
+    """
+
+    engine = "faiss-ivfpq"
+
+    def __init__(
+        self,
+        dim: int,
+        index: Optional[object] = None,
+        *,
+        nlist: Optional[int] = None,
+        m: Optional[int] = None,
+        nprobe: int = 16,
+        refine_factor: int = 8,
+        train_size: int = 10_000,
+    ) -> None:
+        super().__init__(dim, index)
+        self._nlist = nlist
+        self._m = m or self._default_subquantizers(dim)
+        self._nprobe = max(1, nprobe)
+        self._refine_factor = max(0, refine_factor)
+        self._train_size = max(256, train_size)
+        # Scalar-quantised vectors stored at position == id for re-ranking.
+        self._refine: Optional[object] = None
+
+    @property
+    def exact(self) -> bool:  # type: ignore[override]
+        return not self._trained
+
+    @property
+    def _trained(self) -> bool:
+        return isinstance(faiss.downcast_index(self._index), faiss.IndexIVF)
+
+    @staticmethod
+    def _default_subquantizers(dim: int) -> int:
+        # About 8 dimensions per one-byte code, and m must divide dim.
+        target = max(1, dim // 8)
+        return max(m for m in range(1, target + 1) if dim % m == 0)
+
+    def _add_block(self, block: "np.ndarray", ids: "np.ndarray") -> None:
+        super()._add_block(block, ids)
+        if self._refine is not None:
+            self._refine.add(block)
+        if not self._trained and self._index.ntotal >= self._train_size:
+            self._train()
+
+    def _train(self) -> None:
+        flat = faiss.downcast_index(self._index.index)
+        vectors = flat.reconstruct_n(0, flat.ntotal)
+        ids = faiss.vector_to_array(self._index.id_map).astype(np.int64)
+        nlist = self._nlist or min(65536, max(1, int(2 * math.sqrt(len(vectors)))))
+        nlist = min(nlist, max(1, len(vectors) // 39))
+        sample = vectors
+        if len(vectors) > 64 * nlist:
+            sample = vectors[np.random.default_rng(0).choice(len(vectors), 64 * nlist, replace=False)]
+
+        ivf = faiss.IndexIVFPQ(faiss.IndexFlatL2(self.dim), self.dim, nlist, self._m, 8)
+        ivf.train(sample)
+        ivf.add_with_ids(vectors, ids)
+        if self._refine_factor:
+            refine = faiss.IndexScalarQuantizer(self.dim, faiss.ScalarQuantizer.QT_8bit)
+            refine.train(sample)
+            # Removed ids leave zero rows so positions keep matching ids.
+            by_id = np.zeros((int(ids.max()) + 1, self.dim), dtype=np.float32)
+            by_id[ids] = vectors
+            refine.add(by_id)
+            self._refine = refine
+        self._index = ivf
+        logger.info("Trained IVF-PQ vector index: %d vectors, nlist=%d, m=%d.", len(vectors), nlist, self._m)
+
+    def _search_params(self, selector: object, candidates: int) -> object:
+        if not self._trained:
+            return super()._search_params(selector, candidates)
+        ivf = faiss.downcast_index(self._index)
+        # Selective filters leave few candidates per list; probe more lists
+        # so roughly the same number of candidates gets scored.
+        share = max(candidates / max(1, self._index.ntotal), 1e-9)
+        nprobe = min(ivf.nlist, max(self._nprobe, math.ceil(self._nprobe / share)))
+        return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        k: int,
+        candidates: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        if not self._trained:
+            return super().search(vector, k, candidates)
+        faiss.downcast_index(self._index).nprobe = self._nprobe
+        if self._refine is None:
+            return super().search(vector, k, candidates)
+
+        shortlist = super().search(vector, k * self._refine_factor, candidates)
+        if not shortlist:
+            return []
+        ids = np.asarray([self._ids[doc_key] for doc_key, _ in shortlist], dtype=np.int64)
+        decoded = self._refine.reconstruct_batch(ids)
+        query = np.asarray(vector, dtype=np.float32)
+        distances = ((decoded - query) ** 2).sum(axis=1)
+        order = np.argsort(distances, kind="stable")[:k]
+        return [(shortlist[position][0], float(distances[position])) for position in order]
+
+    def _reconstruct(self, labels: "np.ndarray") -> "np.ndarray":
+        # Trained vectors only survive quantised: prefer the 8-bit refine
+        # copies over PQ codes, which need a temporary id lookup to decode.
+        if not self._trained:
+            return super()._reconstruct(labels)
+        if self._refine is not None:
+            return self._refine.reconstruct_batch(labels)
+        ivf = faiss.downcast_index(self._index)
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        try:
+            return ivf.reconstruct_batch(labels)
+        finally:
+            ivf.set_direct_map_type(faiss.DirectMap.NoMap)
+
+    def memory_bytes(self) -> int:
+        if not self._trained:
+            return super().memory_bytes()
+        ivf = faiss.downcast_index(self._index)
+        centroids = ivf.nlist * self.dim * 4
+        codebooks = self.dim * 256 * 4
+        refine = self._refine.ntotal * self.dim if self._refine is not None else 0
+        return int(len(self._ids) * (ivf.code_size + 8 + 16) + centroids + codebooks + refine)
+
+    def _save_payload(self, path: Path) -> Dict[str, object]:
+        payload = super()._save_payload(path)
+        if self._refine is not None:
+            tmp_path = path / "vectors.refine.faiss.tmp"
+            faiss.write_index(self._refine, str(tmp_path))
+            os.replace(tmp_path, path / "vectors.refine.faiss")
+        return {
+            **payload,
+            "m": self._m,
+            "nprobe": self._nprobe,
+            "refine_factor": self._refine_factor if self._refine is not None else 0,
+            "train_size": self._train_size,
+        }
+
+    @classmethod
+    def _load(cls, path: Path, meta: Dict[str, object]) -> "FaissIVFPQVectorIndex":
+        index = super()._load(path, meta)
+        wrapped = getattr(faiss.downcast_index(index._index), "index", None)
+        if wrapped is not None and isinstance(faiss.downcast_index(wrapped), faiss.IndexIVF):
+            # Trained indexes saved behind an id map cannot remove vectors
+            # safely; report them torn so the service rebuilds.
+            index._ids = {}
+            return index
+        index._m = int(meta.get("m") or index._m)
+        index._nprobe = int(meta.get("nprobe") or index._nprobe)
+        index._train_size = int(meta.get("train_size") or index._train_size)
+        index._refine_factor = int(meta.get("refine_factor") or 0)
+        if index._refine_factor and index._trained:
+            index._refine = faiss.read_index(str(path / "vectors.refine.faiss"))
+            if index._refine.ntotal != index._next_id:
+                index._ids = {}
+        return index
+
+
+_ENGINE_CLASSES = {
+    "numpy": NumpyVectorIndex,
+    "faiss": FaissVectorIndex,
+    "faiss-ivfpq": FaissIVFPQVectorIndex,
+}
@@ -12,6 +12,7 @@ from email.message import EmailMessage
 from typing import Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+from src.backend.analysis_stream import analysis_streams
 from src.backend.state import (
     STATE,
     STATE_LOCK,
@@ -234,6 +235,7 @@ class AlertService:
                 },
                 "preferences": asdict(STATE.preferences),
                 "last_report": serialize_report(STATE.last_report),
+                "analysis_streams": analysis_streams.active(),
                 "pending_reports": [
                     serialize_report(report) for report in STATE.pending_reports
                 ],
@@ -462,6 +464,7 @@ def serialize_report(report: Optional[IncidentReport]) -> Optional[Dict[str, obj
         "follow_up": list(report.follow_up),
         "recipients_sent": list(report.recipients_sent),
         "recipients_missing": list(report.recipients_missing),
+        "analysis_status": report.analysis_status,
     }
 
 
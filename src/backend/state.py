@@ -64,6 +64,8 @@ class IncidentReport:
     follow_up: List[str]
     recipients_sent: List[str] = field(default_factory=list)
     recipients_missing: List[str] = field(default_factory=list)
+    # "pending" while a late AI analysis may still replace the fallback text.
+    analysis_status: str = "final"
 
 
 @dataclass
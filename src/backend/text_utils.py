@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from typing import Any, Dict
 
 _TEXT_FIXUPS: Dict[str, str] = {
@@ -12,29 +13,47 @@ _TEXT_FIXUPS: Dict[str, str] = {
     "- (??? ?? ??? ????.)": "- (추가 실행 계획 없음)",
 }
 
+# Bump whenever _TEXT_FIXUPS changes so corpora marked with an older
+# version are normalised again on load.
+TEXT_FIXUPS_VERSION = 1
+
+# One alternation, longest key first, replaces every fixup in a single pass.
+_FIXUP_PATTERN = re.compile("|".join(re.escape(key) for key in sorted(_TEXT_FIXUPS, key=len, reverse=True)))
+# Substring shared by every fixup; strings without it are returned untouched
+# without running the regex at all.
+_FIXUP_HINT = "??" if all("??" in key for key in _TEXT_FIXUPS) else ""
+
 
 def normalize_legacy_text(value: str) -> str:
     """Replace known mojibake fragments with their intended Korean text."""
 
-    if not isinstance(value, str) or not value:
+    if not isinstance(value, str) or not value or _FIXUP_HINT not in value:
         return value
-
-    fixed = value
-    for legacy, replacement in _TEXT_FIXUPS.items():
-        if legacy in fixed:
-            fixed = fixed.replace(legacy, replacement)
-    return fixed
+    return _FIXUP_PATTERN.sub(lambda match: _TEXT_FIXUPS[match.group(0)], value)
 
 
 def normalize_legacy_payload(obj: Any) -> Any:
-    """Recursively normalise strings inside dict/list payloads."""
+    """Recursively normalise strings inside dict/list payloads.
+
+    Containers without anything to fix are returned as-is (the same object),
+    so callers can detect changes with ``is`` and clean payloads cost no
+    allocations.
+    """
 
     if isinstance(obj, str):
         return normalize_legacy_text(obj)
-    if isinstance(obj, list):
-        return [normalize_legacy_payload(item) for item in obj]
-    if isinstance(obj, tuple):
-        return tuple(normalize_legacy_payload(item) for item in obj)
+    if isinstance(obj, (list, tuple)):
+        items = [normalize_legacy_payload(item) for item in obj]
+        if all(new is old for new, old in zip(items, obj)):
+            return obj
+        return items if isinstance(obj, list) else tuple(items)
     if isinstance(obj, dict):
-        return {key: normalize_legacy_payload(value) for key, value in obj.items()}
+        changed = None
+        for key, value in obj.items():
+            fixed = normalize_legacy_payload(value)
+            if fixed is not value:
+                if changed is None:
+                    changed = dict(obj)
+                changed[key] = fixed
+        return obj if changed is None else changed
     return obj
@@ -38,3 +38,127 @@ def set_openai_api_key(value: str | None) -> None:
     global _OPENAI_API_KEY_OVERRIDE
     sanitized = (value or "").strip()
     _OPENAI_API_KEY_OVERRIDE = sanitized or None
+
+
+def get_openai_base_url() -> str | None:
+    """Return OPENAI_BASE_URL (or OPENAI_API_BASE) when OpenAI calls go to a proxy or local stub."""
+
+    value = (os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or "").strip()
+    return value or None
+
+
+_RAG_EMBEDDING_BACKENDS = ("openai", "local", "auto")
+
+
+def get_rag_embeddings_backend() -> str:
+    """Return INCIDENT_RAG_EMBEDDINGS (openai | local | auto), defaulting to openai.
+
+    ``local`` always uses the offline hashing embedder; ``auto`` uses OpenAI
+    when a key is configured and the local embedder otherwise.
+    """
+
+    value = (os.getenv("INCIDENT_RAG_EMBEDDINGS") or "").strip().lower()
+    return value if value in _RAG_EMBEDDING_BACKENDS else "openai"
+
+
+_RAG_VECTOR_ENGINES = ("numpy", "faiss", "faiss-ivfpq")
+
+
+def get_rag_vector_engine() -> str:
+    """Return INCIDENT_RAG_VECTOR_ENGINE (numpy | faiss | faiss-ivfpq), defaulting to faiss.
+
+    ``numpy`` is an exact brute-force matrix without FAISS for small
+    deployments; ``faiss-ivfpq`` compresses vectors for large archives at
+    the cost of approximate results.
+    """
+
+    value = (os.getenv("INCIDENT_RAG_VECTOR_ENGINE") or "").strip().lower()
+    return value if value in _RAG_VECTOR_ENGINES else "faiss"
+
+
+def get_rag_retention_max_age_days() -> dict[str, float]:
+    """Parse INCIDENT_RAG_RETENTION_MAX_AGE_DAYS, e.g. ``action_execution=180,incident_report=365``.
+
+    Maps a RAG document type to the days after its last activity at which it
+    is evicted; unset or malformed pairs mean no age limit for that type.
+    """
+
+    limits: dict[str, float] = {}
+    for pair in (os.getenv("INCIDENT_RAG_RETENTION_MAX_AGE_DAYS") or "").split(","):
+        doc_type, _, days = pair.partition("=")
+        try:
+            value = float(days)
+        except ValueError:
+            continue
+        if doc_type.strip() and value > 0:
+            limits[doc_type.strip()] = value
+    return limits
+
+
+def get_rag_retention_max_per_scenario() -> int | None:
+    """Return INCIDENT_RAG_RETENTION_MAX_PER_SCENARIO (documents kept per scenario_code), unset by default."""
+
+    try:
+        value = int(os.getenv("INCIDENT_RAG_RETENTION_MAX_PER_SCENARIO") or 0)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def get_rag_retention_interval() -> float:
+    """Return INCIDENT_RAG_RETENTION_INTERVAL_SECONDS between background retention passes (default 3600)."""
+
+    try:
+        value = float(os.getenv("INCIDENT_RAG_RETENTION_INTERVAL_SECONDS") or 3600)
+    except ValueError:
+        return 3600.0
+    return max(60.0, value)
+
+
+def get_analysis_cache_ttl() -> float:
+    """Return INCIDENT_ANALYSIS_CACHE_TTL_SECONDS a cached AI analysis stays reusable (default 900, 0 disables)."""
+
+    try:
+        value = float(os.getenv("INCIDENT_ANALYSIS_CACHE_TTL_SECONDS") or 900)
+    except ValueError:
+        return 900.0
+    return max(0.0, value)
+
+
+def get_analysis_cache_size() -> int:
+    """Return INCIDENT_ANALYSIS_CACHE_MAX_ENTRIES, the number of cached AI analyses (default 128)."""
+
+    try:
+        value = int(os.getenv("INCIDENT_ANALYSIS_CACHE_MAX_ENTRIES") or 128)
+    except ValueError:
+        return 128
+    return max(0, value)
+
+
+def get_analysis_cache_bucket() -> float:
+    """Return INCIDENT_ANALYSIS_CACHE_BUCKET, the metric-overshoot bucket width (default 0.25).
+
+    Overshoot is measured relative to the threshold, so with 0.25 HTTP
+    rates of 0.055 and 0.06 against a 0.05 threshold (10% and 20% over)
+    share a bucket.
+    """
+
+    try:
+        value = float(os.getenv("INCIDENT_ANALYSIS_CACHE_BUCKET") or 0.25)
+    except ValueError:
+        return 0.25
+    return value if value > 0 else 0.25
+
+
+def get_analysis_deadline() -> float | None:
+    """Return INCIDENT_ANALYSIS_DEADLINE_SECONDS to wait for the AI before notifying (default 8, 0 waits indefinitely).
+
+    When it expires the deterministic report goes out first and the AI
+    analysis follows as an update once the model answers.
+    """
+
+    try:
+        value = float(os.getenv("INCIDENT_ANALYSIS_DEADLINE_SECONDS") or 8)
+    except ValueError:
+        return 8.0
+    return value if value > 0 else None